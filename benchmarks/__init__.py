@@ -0,0 +1,11 @@
+"""Benchmarks for py-dict-client. These are not shipped with the package.
+
+Run the client suite, which starts an in-process fake server, from the
+repository root:
+
+    $ python -m benchmarks --output results.json
+
+or one of the standalone benchmark modules, e.g.
+
+    $ python -m benchmarks.parsers
+"""
@@ -0,0 +1,72 @@
+"""Run the client benchmark suite against an in-process fake server.
+
+    $ python -m benchmarks --output results.json
+    $ python -m benchmarks --compare results.json
+"""
+import argparse
+import datetime
+import json
+import platform
+import sys
+
+from . import suite
+
+# Metrics for which a lower value is an improvement.
+LOWER_IS_BETTER = ("_ms", "_bytes", "_ratio")
+
+
+def compare(baseline, results):
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            old = baseline.get(name, {}).get(metric)
+            if not old:
+                continue
+            change = value / old - 1
+            if metric.endswith(LOWER_IS_BETTER):
+                change = -change
+            label = f"{name}.{metric}"
+            print(f"{label:<40} {old:>14.2f} {value:>14.2f} {change:>+8.1%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "names", nargs="*", help=f"benchmarks to run: {', '.join(suite.BENCHMARKS)}"
+    )
+    parser.add_argument("--ops", type=int, default=1000, help="operations per run")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="server latency in seconds"
+    )
+    parser.add_argument("--chunk-size", type=int, help="server write size in bytes")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="compare with results in this JSON file")
+    args = parser.parse_args(argv)
+    unknown = set(args.names) - set(suite.BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = suite.run(args.names, args.ops, args.latency, args.chunk_size)
+    report = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "ops": args.ops,
+            "latency": args.latency,
+            "chunk_size": args.chunk_size,
+        },
+        "results": results,
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f)["results"], results)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
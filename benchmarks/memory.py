@@ -0,0 +1,69 @@
+"""Memory held by many DEFINE responses, compared with the eager responses
+that kept both the decoded text and a list of dicts alive.
+"""
+import gc
+import tracemalloc
+
+from dictionary_client.response import DefineWordResponse
+
+from .parsers import define_reply, legacy_parse_content
+
+N_RESPONSES = 20_000
+LINES_PER_RESPONSE = 24
+
+
+class LegacyDefineWordResponse:
+    """DefineWordResponse as it was before responses were parsed lazily."""
+
+    def __init__(self, response_bytes):
+        self.response_text = response_bytes.decode()
+        self.status_code = int(self.response_text[:3])
+        self.content = legacy_parse_content(self.response_text)
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    objects = build()  # noqa: F841 (kept alive while measuring)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak
+
+
+def replies():
+    # Distinct byte strings, as if each had been read from the network.
+    return [bytearray(define_reply(LINES_PER_RESPONSE)) for _ in range(N_RESPONSES)]
+
+
+def legacy():
+    return [LegacyDefineWordResponse(bytes(reply)) for reply in replies()]
+
+
+def unparsed():
+    return [DefineWordResponse(bytes(reply)) for reply in replies()]
+
+
+def parsed():
+    responses = unparsed()
+    for response in responses:
+        response.content
+    return responses
+
+
+def released():
+    responses = unparsed()
+    for response in responses:
+        response.release()
+    return responses
+
+
+def main():
+    print(f"{N_RESPONSES} responses of {LINES_PER_RESPONSE} lines")
+    print(f"{'variant':>10} {'retained (MiB)':>15} {'peak (MiB)':>11}")
+    for build in (legacy, unparsed, parsed, released):
+        current, peak = measure(build)
+        print(f"{build.__name__:>10} {current / 2**20:>15.1f} {peak / 2**20:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Parsing benchmarks on large synthetic replies.
+
+The scaling table shows that DefineWordResponse.parse_content takes constant
+time per line as the reply grows, where the parser before it, which re-sliced
+the remaining lines after every definition, grew linearly.
+
+The throughput table compares the response parsers, which find lines by
+offset in the raw bytes and decode only the text they return, with the
+previous ones, which decoded and split the whole reply first.
+"""
+import re
+import time
+from collections import defaultdict
+
+from dictionary_client.response import (
+    DefineWordResponse,
+    DefinitionParser,
+    MatchResponse,
+    MultiLineResponse,
+    ServerPropertiesResponse,
+)
+
+SIZES = (10_000, 20_000, 40_000, 80_000)
+LINES_PER_DEFINITION = 10
+
+
+def define_reply(n_lines, lines_per_definition=LINES_PER_DEFINITION):
+    n_definitions = max(1, n_lines // (lines_per_definition + 2))
+    parts = [b"150 %d definitions retrieved\r\n" % n_definitions]
+    for i in range(n_definitions):
+        parts.append(b'151 "word%d" wn "WordNet (r) 3.1 (2011)"\r\n' % i)
+        for j in range(lines_per_definition):
+            parts.append(b"    %d: some definition text for sense %d\r\n" % (j, j))
+        parts.append(b".\r\n")
+    parts.append(b"250 ok [d/m/c = 1/0/12; 0.000r 0.000u 0.000s]\r\n")
+    return b"".join(parts)
+
+
+def legacy_parse_content(response_text):
+    """The parser as it was before it became a single pass."""
+    definition_lines = [
+        line
+        for line in response_text.split("\r\n")
+        if not line.startswith("150") and not line.startswith("250")
+    ]
+    definitions = []
+    while "." in definition_lines:
+        delim_index = definition_lines.index(".")
+        new_def = definition_lines[:delim_index]
+        definitions.append(
+            {"db": new_def[0].split()[2], "definition": "\n".join(new_def[1:])}
+        )
+        definition_lines = definition_lines[delim_index + 1 :]
+    return definitions
+
+
+def match_reply(n_lines):
+    lines = b"".join(b'wn "word%d"\r\n' % i for i in range(n_lines))
+    return b"152 %d matches found\r\n%s.\r\n250 ok\r\n" % (n_lines, lines)
+
+
+def show_db_reply(n_lines):
+    lines = b"".join(b'db%d "Database number %d"\r\n' % (i, i) for i in range(n_lines))
+    return b"110 %d databases present\r\n%s.\r\n250 ok\r\n" % (n_lines, lines)
+
+
+def show_info_reply(n_lines):
+    lines = b"".join(
+        b"Line %d of a long description of the database.\r\n" % i
+        for i in range(n_lines)
+    )
+    return b"112 information for wn\r\n%s.\r\n250 ok\r\n" % lines
+
+
+STATUS_RE = re.compile(r"^\d{3}")
+
+
+def legacy_content_lines(response_bytes):
+    lines = [
+        line
+        for line in response_bytes.decode().split("\r\n")
+        if STATUS_RE.match(line) is None
+    ]
+    return lines[: lines.index(".")]
+
+
+def legacy_define(response_bytes):
+    parser = DefinitionParser()
+    definitions = []
+    for line in response_bytes.decode().split("\r\n"):
+        definition = parser.feed(line)
+        if definition is not None:
+            definitions.append(definition)
+    return definitions
+
+
+def legacy_match(response_bytes):
+    matches = defaultdict(list)
+    for line in legacy_content_lines(response_bytes):
+        db_name, match = line.split(maxsplit=1)
+        matches[db_name].append(match.strip('"'))
+    return matches
+
+
+def legacy_show(response_bytes):
+    lines = legacy_content_lines(response_bytes)
+    lines_split = (line.split(maxsplit=1) for line in lines)
+    return {item: description.strip('"') for item, description in lines_split}
+
+
+def legacy_multiline(response_bytes):
+    return "\n".join(legacy_content_lines(response_bytes))
+
+
+# Each case is a reply, the current parser and the previous one.
+THROUGHPUT_CASES = {
+    "DEFINE": (define_reply(200_000), DefineWordResponse, legacy_define),
+    # A few long entries, as from several databases with encyclopedic text.
+    "DEFINE long": (define_reply(200_000, 5_000), DefineWordResponse, legacy_define),
+    "MATCH": (match_reply(200_000), MatchResponse, legacy_match),
+    "SHOW DB": (show_db_reply(200_000), ServerPropertiesResponse, legacy_show),
+    "SHOW INFO": (show_info_reply(200_000), MultiLineResponse, legacy_multiline),
+}
+
+
+def best_of(func, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    print(
+        f"{'lines':>8} {'current (s)':>12} {'ns/line':>8} "
+        f"{'legacy (s)':>12} {'ns/line':>8}"
+    )
+    for n_lines in SIZES:
+        reply = define_reply(n_lines)
+        text = reply.decode()
+        current = best_of(lambda: DefineWordResponse(reply).content)
+        legacy = best_of(lambda: legacy_parse_content(text))
+        print(
+            f"{n_lines:>8} {current:>12.4f} {current / n_lines * 1e9:>8.0f} "
+            f"{legacy:>12.4f} {legacy / n_lines * 1e9:>8.0f}"
+        )
+    print()
+    print(
+        f"{'reply':<12} {'MB':>6} {'current MB/s':>13} {'legacy MB/s':>12} "
+        f"{'gain':>6}"
+    )
+    for name, (reply, response_class, legacy_parse) in THROUGHPUT_CASES.items():
+        assert response_class(reply).content == legacy_parse(reply)
+        size = len(reply) / 1e6
+        current = best_of(lambda: response_class(reply).content)
+        legacy = best_of(lambda: legacy_parse(reply))
+        print(
+            f"{name:<12} {size:>6.1f} {size / current:>13.1f} "
+            f"{size / legacy:>12.1f} {legacy / current:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""An in-process fake DICT server with a synthetic dictionary."""
+import random
+import re
+import shlex
+import socket
+import socketserver
+import threading
+import time
+
+SYLLABLES = [
+    "ka",
+    "to",
+    "ri",
+    "ne",
+    "mu",
+    "sa",
+    "lo",
+    "pe",
+    "di",
+    "ga",
+    "vo",
+    "chi",
+    "an",
+    "el",
+    "or",
+    "un",
+    "ist",
+    "ing",
+    "er",
+    "ly",
+    "tion",
+    "ble",
+    "ous",
+]
+NOT_RECOGNIZED = b"500 Syntax error, command not recognized\r\n"
+ILLEGAL_PARAMS = b"501 Syntax error, illegal parameters\r\n"
+
+
+def synthetic_headwords(n_words, seed=2628):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < n_words:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))))
+    return sorted(words)
+
+
+def synthetic_definition(word, n_lines):
+    lines = [word]
+    for i in range(1, n_lines):
+        lines.append(f"    {i}: a synthetic sense of {word}, for benchmarking only")
+    return "\r\n".join(lines)
+
+
+class SyntheticDictionary:
+    """`n_words` generated headwords in database `db`, each defined by
+    `definition_lines` lines of text.
+    """
+
+    def __init__(self, n_words=10_000, definition_lines=10, db="synthetic"):
+        self.db = db
+        self.definition_lines = definition_lines
+        self.headwords = synthetic_headwords(n_words)
+        self._headword_set = set(self.headwords)
+
+    def define(self, word):
+        if word not in self._headword_set:
+            return None
+        return synthetic_definition(word, self.definition_lines)
+
+    def match(self, word, strategy):
+        if strategy in ("exact", "."):
+            return [word] if word in self._headword_set else []
+        if strategy == "prefix":
+            return [w for w in self.headwords if w.startswith(word)]
+        if strategy == "re":
+            pattern = re.compile(word, re.IGNORECASE)
+            return [w for w in self.headwords if pattern.search(w)]
+        raise ValueError(strategy)
+
+
+class FakeDictServer(socketserver.ThreadingTCPServer):
+    """Serves a SyntheticDictionary over the DICT protocol.
+
+    Each reply is delayed by `latency` seconds, and if `chunk_size` is set it
+    is written in chunks of that many bytes, `chunk_delay` seconds apart.
+
+        with FakeDictServer(SyntheticDictionary(), latency=0.001) as server:
+            client = DictionaryClient(port=server.port)
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, dictionary=None, latency=0.0, chunk_size=None, chunk_delay=0.0):
+        super().__init__(("127.0.0.1", 0), FakeDictHandler)
+        self.dictionary = dictionary or SyntheticDictionary()
+        self.latency = latency
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.thread = threading.Thread(
+            target=self.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+    def reply(self, command):
+        try:
+            args = shlex.split(command)
+        except ValueError:
+            return ILLEGAL_PARAMS
+        if len(args) > 1 and args[0].upper() == "SHOW":
+            name, params = f"show_{args[1].lower()}", args[2:]
+        elif args:
+            name, params = args[0].lower(), args[1:]
+        else:
+            return NOT_RECOGNIZED
+        handler = getattr(self, f"reply_{name}", None)
+        if handler is None:
+            return NOT_RECOGNIZED
+        try:
+            return handler(*params).encode()
+        except TypeError:
+            # Wrong number of parameters for the command.
+            return ILLEGAL_PARAMS
+
+    def reply_client(self, *args):
+        return "250 ok\r\n"
+
+    def reply_status(self):
+        return "210 status [d/m/c = 0/0/0; 0.000r 0.000u 0.000s]\r\n"
+
+    def reply_show_db(self):
+        db = self.dictionary.db
+        return (
+            f'110 1 databases present\r\n{db} "Synthetic dictionary"\r\n'
+            ".\r\n250 ok\r\n"
+        )
+
+    def reply_show_strat(self):
+        return (
+            "111 3 strategies present\r\n"
+            'exact "Match headwords exactly"\r\n'
+            'prefix "Match prefixes"\r\n'
+            're "POSIX 1003.2 (modern) regular expressions"\r\n'
+            ".\r\n250 ok\r\n"
+        )
+
+    def reply_show_info(self, db):
+        if db != self.dictionary.db:
+            return '550 Invalid database, use "SHOW DB" for list of databases\r\n'
+        words = len(self.dictionary.headwords)
+        return f"112 information for {db}\r\n{words} headwords\r\n.\r\n250 ok\r\n"
+
+    def reply_define(self, db, word):
+        if db not in ("*", "!", self.dictionary.db):
+            return '550 Invalid database, use "SHOW DB" for list of databases\r\n'
+        definition = self.dictionary.define(word)
+        if definition is None:
+            return "552 No match\r\n"
+        return (
+            "150 1 definitions retrieved\r\n"
+            f'151 "{word}" {self.dictionary.db} "Synthetic dictionary"\r\n'
+            f"{definition}\r\n.\r\n"
+            "250 ok [d/m/c = 1/0/1; 0.000r 0.000u 0.000s]\r\n"
+        )
+
+    def reply_match(self, db, strategy, word):
+        if db not in ("*", "!", self.dictionary.db):
+            return '550 Invalid database, use "SHOW DB" for list of databases\r\n'
+        try:
+            matches = self.dictionary.match(word, strategy)
+        except ValueError:
+            return '551 Invalid strategy, use "SHOW STRAT" for a list\r\n'
+        if not matches:
+            return "552 No match\r\n"
+        lines = "".join(f'{self.dictionary.db} "{match}"\r\n' for match in matches)
+        return (
+            f"152 {len(matches)} matches found\r\n{lines}.\r\n"
+            "250 ok [d/m/c = 0/1/10; 0.000r 0.000u 0.000s]\r\n"
+        )
+
+
+class FakeDictHandler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def send(self, data):
+        chunk_size = self.server.chunk_size
+        if not chunk_size:
+            self.wfile.write(data)
+            return
+        for start in range(0, len(data), chunk_size):
+            self.wfile.write(data[start : start + chunk_size])
+            if self.server.chunk_delay:
+                time.sleep(self.server.chunk_delay)
+
+    def handle(self):
+        self.send(b"220 fake.bench dictd <mime> <1.2.3@fake.bench>\r\n")
+        for raw_line in self.rfile:
+            command = raw_line.decode().rstrip("\r\n")
+            if command.upper() == "QUIT":
+                self.send(b"221 bye\r\n")
+                return
+            if self.server.latency:
+                time.sleep(self.server.latency)
+            self.send(self.server.reply(command))
@@ -0,0 +1,237 @@
+"""Client benchmarks run against the fake server."""
+import gc
+import itertools
+import random
+import statistics
+import time
+import tracemalloc
+
+from dictionary_client import DictionaryClient, HeadwordIndex
+from dictionary_client.response import (
+    DefineWordResponse,
+    MatchResponse,
+    MultiLineResponse,
+)
+
+from .parsers import define_reply, show_info_reply
+from .server import FakeDictServer, SyntheticDictionary
+
+BENCHMARKS = {}
+
+
+def benchmark(func):
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def timed_ops(op, args):
+    """Run `op` once per item of `args`, and summarise the latencies."""
+    latencies = []
+    start = time.perf_counter()
+    for arg in args:
+        op_start = time.perf_counter()
+        op(arg)
+        latencies.append(time.perf_counter() - op_start)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "ops_per_sec": len(args) / elapsed,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+    }
+
+
+def peak_memory(func):
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+class Context:
+    def __init__(self, n_ops, latency, chunk_size, seed=0):
+        self.n_ops = n_ops
+        self.latency = latency
+        self.chunk_size = chunk_size
+        self.rng = random.Random(seed)
+
+    def server(self, dictionary=None):
+        return FakeDictServer(
+            dictionary, latency=self.latency, chunk_size=self.chunk_size
+        )
+
+    def sample(self, words, k=None):
+        return [self.rng.choice(words) for _ in range(k or self.n_ops)]
+
+
+@benchmark
+def define(ctx):
+    dictionary = SyntheticDictionary()
+    with ctx.server(dictionary) as server:
+        client = DictionaryClient(port=server.port)
+        words = ctx.sample(dictionary.headwords)
+        result = timed_ops(lambda word: client.define(word, db="synthetic"), words)
+        client.disconnect()
+    return result
+
+
+@benchmark
+def match_prefix(ctx):
+    dictionary = SyntheticDictionary()
+    with ctx.server(dictionary) as server:
+        client = DictionaryClient(port=server.port)
+        prefixes = [word[:3] for word in ctx.sample(dictionary.headwords)]
+        result = timed_ops(
+            lambda prefix: client.match(prefix, db="synthetic", strategy="prefix"),
+            prefixes,
+        )
+        client.disconnect()
+    return result
+
+
+@benchmark
+def match_prefix_index(ctx):
+    """As match_prefix, answered from a HeadwordIndex populated from the
+    server.
+    """
+    dictionary = SyntheticDictionary()
+    with ctx.server(dictionary) as server:
+        client = DictionaryClient(port=server.port)
+        start = time.perf_counter()
+        client.headword_index = HeadwordIndex()
+        client.headword_index.populate(client, "synthetic")
+        populate_ms = (time.perf_counter() - start) * 1000
+        # Otherwise MATCH would go to the server, and be timed instead.
+        assert "synthetic" in client.headword_index
+        prefixes = [word[:3] for word in ctx.sample(dictionary.headwords)]
+        result = timed_ops(
+            lambda prefix: client.match(prefix, db="synthetic", strategy="prefix"),
+            prefixes,
+        )
+        client.disconnect()
+    return {**result, "populate_ms": populate_ms}
+
+
+def first_matches(ctx, match_first):
+    """Time taking the first 20 of a few thousand prefix matches with
+    `match_first(client, prefix)`, over a link delivering 16KB every 2ms.
+    """
+    dictionary = SyntheticDictionary(n_words=100_000)
+    server = FakeDictServer(
+        dictionary, latency=ctx.latency, chunk_size=16384, chunk_delay=0.002
+    )
+    with server:
+        client = DictionaryClient(port=server.port)
+        prefixes = [word[0] for word in ctx.sample(dictionary.headwords, 100)]
+        result = timed_ops(lambda prefix: match_first(client, prefix), prefixes)
+        client.disconnect()
+    return result
+
+
+@benchmark
+def match_first_20(ctx):
+    def match_first(client, prefix):
+        response = client.match(prefix, db="synthetic", strategy="prefix")
+        return list(itertools.islice(response.iter_matches(), 20))
+
+    return first_matches(ctx, match_first)
+
+
+@benchmark
+def match_iter_first_20(ctx):
+    """The rest of each response is skipped while reading the next."""
+
+    def match_first(client, prefix):
+        return list(
+            client.match_iter(prefix, db="synthetic", strategy="prefix", limit=20)
+        )
+
+    return first_matches(ctx, match_first)
+
+
+@benchmark
+def match_iter_first_20_reconnect(ctx):
+    def match_first(client, prefix):
+        matches = client.match_iter(
+            prefix, db="synthetic", strategy="prefix", limit=20, reconnect=True
+        )
+        return list(matches)
+
+    return first_matches(ctx, match_first)
+
+
+@benchmark
+def define_many(ctx):
+    dictionary = SyntheticDictionary()
+    with ctx.server(dictionary) as server:
+        client = DictionaryClient(port=server.port)
+        words = ctx.sample(dictionary.headwords)
+        start = time.perf_counter()
+        client.define_many(words, db="synthetic")
+        elapsed = time.perf_counter() - start
+        client.disconnect()
+    return {"ops_per_sec": len(words) / elapsed}
+
+
+@benchmark
+def define_large_entry(ctx):
+    """One multi-megabyte definition: receive throughput and peak memory."""
+    dictionary = SyntheticDictionary(n_words=100, definition_lines=50_000)
+    with ctx.server(dictionary) as server:
+        client = DictionaryClient(port=server.port)
+        word = dictionary.headwords[0]
+        responses = []
+        start = time.perf_counter()
+        peak = peak_memory(lambda: responses.append(client.define(word).content))
+        elapsed = time.perf_counter() - start
+        n_bytes = len(responses[0][0].definition)
+        client.disconnect()
+    return {
+        "bytes_per_sec": n_bytes / elapsed,
+        "peak_memory_bytes": peak,
+        "peak_memory_ratio": peak / n_bytes,
+    }
+
+
+@benchmark
+def parse_define(ctx):
+    reply = define_reply(50_000)
+    start = time.perf_counter()
+    for _ in range(5):
+        DefineWordResponse(reply).content
+    elapsed = time.perf_counter() - start
+    return {"bytes_per_sec": 5 * len(reply) / elapsed}
+
+
+@benchmark
+def parse_match(ctx):
+    lines = "".join(f'synthetic "word{i}"\r\n' for i in range(50_000))
+    reply = f"152 50000 matches found\r\n{lines}.\r\n250 ok\r\n".encode()
+    start = time.perf_counter()
+    for _ in range(5):
+        MatchResponse(reply).content
+    elapsed = time.perf_counter() - start
+    return {"bytes_per_sec": 5 * len(reply) / elapsed}
+
+
+@benchmark
+def parse_show_info(ctx):
+    reply = show_info_reply(50_000)
+    start = time.perf_counter()
+    for _ in range(5):
+        MultiLineResponse(reply).content
+    elapsed = time.perf_counter() - start
+    return {"bytes_per_sec": 5 * len(reply) / elapsed}
+
+
+def run(names=None, n_ops=1000, latency=0.0, chunk_size=None):
+    ctx = Context(n_ops, latency, chunk_size)
+    return {name: BENCHMARKS[name](ctx) for name in names or BENCHMARKS}
@@ -0,0 +1,81 @@
+"""Micro-benchmarks of Word formatting over multilingual headword lists."""
+import timeit
+
+from dictionary_client.word import format_word
+from tests.test_word import regex_format_word
+
+HEADWORDS = {
+    "english": [
+        "table",
+        "chauffeur",
+        "ice cream",
+        "o'clock",
+        "well-being",
+        "SCSI-2",
+        "rock 'n' roll",
+        "Wide SCSI",
+        "e.g.",
+        "A1",
+        "don't",
+        "self-esteem",
+    ],
+    "french": [
+        "oiseau",
+        "château",
+        "pomme de terre",
+        "aujourd'hui",
+        "être",
+        "garçon",
+        "crème brûlée",
+        "c'est-à-dire",
+        "œuvre",
+        "naïf",
+        "déjà vu",
+        "l'été",
+    ],
+    "persian": [
+        "کلمه",
+        "کلمه ها",
+        "کتاب",
+        "دانشگاه",
+        "خانه",
+        "سلام",
+        "آب",
+        "زبان فارسی",
+    ],
+    "japanese": [
+        "ワード",
+        "辞書",
+        "日本語",
+        "ありがとう",
+        "ワ ー ド",
+        "東京",
+        "猫",
+        "コンピュータ",
+    ],
+}
+ROUNDS = 200
+
+
+def per_word_ns(func, words):
+    seconds = min(
+        timeit.repeat(lambda: [func(word) for word in words], number=ROUNDS, repeat=5)
+    )
+    return seconds / (ROUNDS * len(words)) * 1e9
+
+
+def main():
+    uncached = format_word.__wrapped__
+    print(f"{'headwords':>10} {'regex (ns)':>11} {'fast (ns)':>10} {'memo (ns)':>10}")
+    for name, words in HEADWORDS.items():
+        for word in words:
+            assert uncached(word) == regex_format_word(word), word
+        print(
+            f"{name:>10} {per_word_ns(regex_format_word, words):>11.0f} "
+            f"{per_word_ns(uncached, words):>10.0f} "
+            f"{per_word_ns(format_word, words):>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,10 @@
+from .async_client import AsyncDictionaryClient
+from .cache import CacheBackend, LRUCacheBackend, ResultCache, warm_cache
+from .cluster import ClusterDictionaryClient
 from .dictionary_client import DictionaryClient
+from .disk_cache import DiskCacheBackend, server_fingerprint
+from .headwords import HeadwordIndex
+from .local import LocalDatabase, LocalDictionary
+from .metadata import ServerMetadataCache
+from .pool import DictionaryClientPool
+from .singleflight import AsyncSingleFlight, SingleFlight
@@ -0,0 +1,242 @@
+import asyncio
+
+from .cache import ResultCache
+from .commands import (
+    client_ident_command,
+    define_word_command,
+    disconnect_command,
+    help_command,
+    match_command,
+    show_databases_command,
+    show_info_command,
+    show_server_command,
+    show_strategies_command,
+    status_command,
+)
+from .dictionary_client import (
+    DEFAULT_PORT,
+    ReadOnlyDescriptor,
+    default_client_id,
+    default_client_name,
+)
+from .metadata import shared_metadata
+from .reader import LINE_DELIMITER, next_state
+from .response import (
+    DatabaseInfoResponse,
+    DefineWordResponse,
+    HandshakeResponse,
+    MatchResponse,
+    MultiLineResponse,
+    PreliminaryResponse,
+    ServerPropertiesResponse,
+)
+from .singleflight import AsyncSingleFlight
+from .status_codes import DictStatusCode
+from .word import Word
+
+
+class AsyncServerProperty(ReadOnlyDescriptor):
+    """Lazily fetched server property, to be awaited:
+
+    strategies = await client.strategies
+    """
+
+    def __init__(self, command_func):
+        self.command_func = command_func
+
+    def __get__(self, obj, obj_type=None):
+        if obj is None:
+            return self
+        return obj._get_server_property(self.public_name, self.command_func())
+
+
+class AsyncDictionaryClient:
+    """An asyncio implementation of DictionaryClient.
+
+    Commands on a single client are serialised, as the protocol requires, but
+    any number of clients can share an event loop. Use the client as an
+    asynchronous context manager, or await `connect` before sending commands:
+
+        async with AsyncDictionaryClient() as client:
+            response = await client.define("table")
+
+    With `coalesce=True`, concurrent calls to `define` or `match` with the
+    same arguments send one command and share its response; pass an
+    AsyncSingleFlight instead to coalesce calls across several clients of the
+    same server.
+    """
+
+    strategies = AsyncServerProperty(show_strategies_command)
+    databases = AsyncServerProperty(show_databases_command)
+
+    def __init__(
+        self,
+        host="localhost",
+        port=DEFAULT_PORT,
+        timeout=5,
+        cache=None,
+        client_id=None,
+        send_client_ident=True,
+        metadata_cache=None,
+        coalesce=False,
+    ):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.cache = cache
+        if metadata_cache is None:
+            metadata_cache = shared_metadata
+        self.metadata_cache = metadata_cache
+        if coalesce is True:
+            coalesce = AsyncSingleFlight()
+        self.single_flight = coalesce or None
+        self.client_name = default_client_name()
+        if client_id is None:
+            client_id = default_client_id()
+        self.client_id_info = client_id
+        self.send_client_ident = send_client_ident
+        self.reader = None
+        self.writer = None
+        self.server_info = None
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.disconnect()
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        response = HandshakeResponse(await self._recv_all())
+        if response.status_code != DictStatusCode.CONNECTION_ACCEPTED:
+            raise Exception(response.status_code)
+        self.server_info = response.content
+        if self.send_client_ident:
+            response = await self._get_response(
+                client_ident_command(self.client_id_info), PreliminaryResponse
+            )
+            if response.status_code != DictStatusCode.OK:
+                raise Exception(response.status_code)
+        return self
+
+    async def _read_response(self):
+        lines = []
+        in_text = False
+        while True:
+            try:
+                line = await self.reader.readuntil(LINE_DELIMITER)
+            except asyncio.IncompleteReadError as e:
+                raise ConnectionError("Server closed the connection.") from e
+            lines.append(line)
+            in_text, complete = next_state(
+                line, 0, len(line) - len(LINE_DELIMITER), in_text
+            )
+            if complete:
+                return b"".join(lines)
+
+    async def _recv_all(self):
+        try:
+            return await asyncio.wait_for(self._read_response(), self.timeout)
+        except asyncio.TimeoutError as e:
+            raise TimeoutError("Client timed out expecting server response.") from e
+
+    async def _send_and_receive(self, command):
+        async with self._lock:
+            if self.writer is None:
+                raise ConnectionError("Client is not connected.")
+            try:
+                self.writer.write(command)
+                await self.writer.drain()
+                return await self._recv_all()
+            except BaseException:
+                # The reply, or part of it, may still be on its way, and would
+                # be read as the reply to the next command.
+                self._close()
+                raise
+
+    def _close(self):
+        self.writer.close()
+        self.reader = self.writer = None
+
+    async def _get_response(self, command, response_class):
+        return response_class(await self._send_and_receive(command))
+
+    async def _fetch_response(self, key, command, response_class):
+        response = await self._get_response(command, response_class)
+        if self.cache is not None:
+            self.cache.set(key, response)
+        return response
+
+    async def _get_cached_response(self, key, command, response_class):
+        if self.cache is not None:
+            response = self.cache.get(key)
+            if response is not None:
+                return response
+        if self.single_flight is None:
+            return await self._fetch_response(key, command, response_class)
+        return await self.single_flight.do(
+            (self.host, self.port) + key,
+            self._fetch_response,
+            key,
+            command,
+            response_class,
+        )
+
+    async def _get_server_property(self, name, command):
+        value = self.metadata_cache.get(self.host, self.port, name)
+        if value is None:
+            response = await self._get_response(command, ServerPropertiesResponse)
+            value = self.metadata_cache.set(self.host, self.port, name, response)
+        return value
+
+    async def get_server_status(self):
+        return await self._get_response(status_command(), PreliminaryResponse)
+
+    async def get_server_information(self):
+        return await self._get_response(show_server_command(), MultiLineResponse)
+
+    async def get_db_info(self, db):
+        if db not in await self.databases:
+            raise ValueError(f'Invalid database name: "{db}" not present.')
+        return await self._get_response(show_info_command(db), DatabaseInfoResponse)
+
+    async def get_help_text(self):
+        return await self._get_response(help_command(), MultiLineResponse)
+
+    async def define(self, word_raw, db="*"):
+        if db != "*" and db not in await self.databases:
+            raise ValueError(f'Invalid database name: "{db}" not present.')
+        word = Word(word_raw)
+        return await self._get_cached_response(
+            ResultCache.make_key("DEFINE", word, db),
+            define_word_command(word, db),
+            DefineWordResponse,
+        )
+
+    async def match(self, word_raw, db="*", strategy="."):
+        if db != "*" and db not in await self.databases:
+            raise ValueError(f'Invalid database name: "{db}" not present.')
+        if strategy != "." and strategy not in await self.strategies:
+            raise ValueError(f'Unknown strategy: "{strategy}".')
+        word = Word(word_raw)
+        return await self._get_cached_response(
+            ResultCache.make_key("MATCH", word, db, strategy),
+            match_command(word, db=db, strategy=strategy),
+            MatchResponse,
+        )
+
+    async def disconnect(self):
+        if self.writer is None:
+            return
+        bytes_received = await self._send_and_receive(disconnect_command())
+        writer = self.writer
+        self._close()
+        if int(bytes_received[:3]) != DictStatusCode.CLOSING_CONNECTION:
+            raise ConnectionError(
+                "Client got unexpected response to QUIT command: "
+                f'"{bytes_received.decode()}"'
+            )
+        await writer.wait_closed()
@@ -0,0 +1,162 @@
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from itertools import islice
+
+from .status_codes import DictStatusCode
+
+CACHEABLE_STATUS_CODES = {
+    DictStatusCode.DEFINITIONS_FOLLOW,
+    DictStatusCode.MATCHES_FOUND,
+    DictStatusCode.NO_MATCH,
+}
+WARM_CHUNK_SIZE = 1024
+
+
+class CacheBackend(metaclass=ABCMeta):
+    """Storage for a ResultCache.
+
+    Keys are tuples of strings and values are (expiry time, response) pairs.
+    Implementations must be thread-safe. A backend shared between processes
+    must serialise values itself; responses can be pickled.
+    """
+
+    evictions = 0
+
+    @abstractmethod
+    def get(self, key):
+        """Return the value stored for `key`, or None."""
+
+    @abstractmethod
+    def set(self, key, value):
+        pass
+
+    @abstractmethod
+    def delete(self, key):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+
+class LRUCacheBackend(CacheBackend):
+    """In-memory backend, evicting the least recently used entry once it
+    holds `max_size` entries.
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return None
+            return self._entries[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def warm_cache(client, words, db="*"):
+    """Fill `client.cache` with the definitions of `words`, pipelining the
+    DEFINE commands for those not already cached.
+    """
+    if client.cache is None:
+        raise ValueError("Client has no cache to warm.")
+    words = iter(words)
+    while True:
+        # Warm in chunks so that a long word list is not held in memory.
+        chunk = list(islice(words, WARM_CHUNK_SIZE))
+        if not chunk:
+            return
+        client.define_many(chunk, db=db)
+
+
+class ResultCache:
+    """Cache of DEFINE and MATCH responses, keyed on the command, formatted
+    word, database and strategy.
+
+    Responses are kept for `ttl` seconds, except for 552 (no match) responses
+    which are kept for `negative_ttl` seconds. A ttl of None means entries do
+    not expire, and a negative_ttl of 0 disables negative caching. Only
+    responses with one of `cacheable_status_codes` are cached, so error
+    responses never are.
+    """
+
+    cacheable_status_codes = CACHEABLE_STATUS_CODES
+
+    def __init__(self, max_size=1024, ttl=3600, negative_ttl=60, backend=None):
+        self.backend = backend if backend is not None else LRUCacheBackend(max_size)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(command, word, db, strategy=None):
+        return (command, word.formatted, db, strategy)
+
+    @property
+    def evictions(self):
+        return self.backend.evictions
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        """Return the cached response for `key`, or None."""
+        entry = self.backend.get(key)
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at is None or expires_at > time.time():
+                self._count(hit=True)
+                return response
+            self.backend.delete(key)
+        self._count(hit=False)
+        return None
+
+    def set(self, key, response):
+        if response.status_code not in self.cacheable_status_codes:
+            return
+        if response.status_code == DictStatusCode.NO_MATCH:
+            ttl = self.negative_ttl
+        else:
+            ttl = self.ttl
+        if ttl == 0:
+            return
+        expires_at = None if ttl is None else time.time() + ttl
+        self.backend.set(key, (expires_at, response))
+
+    def clear(self):
+        self.backend.clear()
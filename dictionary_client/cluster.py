@@ -0,0 +1,278 @@
+import threading
+import time
+
+from .dictionary_client import DEFAULT_PORT
+from .pool import UNAVAILABLE_STATUS_CODES, DictionaryClientPool, PoolTimeoutError
+from .status_codes import DictStatusCode
+
+BALANCERS = ("least_outstanding", "latency")
+
+
+class Node:
+    """A server in a cluster, with the state used for balancing."""
+
+    def __init__(self, host, port, pool):
+        self.host = host
+        self.port = port
+        self.pool = pool
+        self.outstanding = 0
+        # Exponentially weighted moving average of request latency.
+        self.latency = None
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.probe_timer = None
+
+    def __repr__(self):
+        return f"Node({self.host!r}, {self.port!r})"
+
+    def is_available(self, now):
+        return self.ejected_until <= now
+
+
+def parse_endpoint(endpoint):
+    if isinstance(endpoint, tuple):
+        return endpoint
+    host, _, port = endpoint.rpartition(":")
+    if not host:
+        return endpoint, DEFAULT_PORT
+    return host, int(port)
+
+
+class ClusterDictionaryClient:
+    """Spreads commands over several equivalent DICT servers.
+
+    `endpoints` are (host, port) pairs or "host[:port]" strings. Each server
+    gets its own DictionaryClientPool, and commands go to the available node
+    with the fewest outstanding requests ("least_outstanding"), or with the
+    lowest latency weighted by its outstanding requests ("latency").
+
+    All of the commands exposed here are idempotent, so a command that fails
+    with a connection error or timeout, or gets a 420/421 reply, is retried
+    on another node, up to `max_attempts` nodes in total. A failing node is
+    ejected for `eject_time` seconds, doubling with each consecutive failure
+    up to `max_eject_time`. When that time is up it is probed with STATUS in
+    a background thread, and reinstated or ejected again; a command sent to
+    it before then also serves as a probe. Use `probe` to check all ejected
+    nodes at once.
+
+    Errors raised by the client before a command is sent, such as a
+    ValueError for an invalid word, are raised to the caller without
+    affecting the node.
+    """
+
+    def __init__(
+        self,
+        endpoints,
+        balancer="least_outstanding",
+        max_attempts=3,
+        eject_time=30,
+        max_eject_time=300,
+        checkout_timeout=None,
+        pool_class=DictionaryClientPool,
+        **pool_kwargs,
+    ):
+        if balancer not in BALANCERS:
+            raise ValueError(f'Unknown balancer: "{balancer}".')
+        self.balancer = balancer
+        self.max_attempts = max_attempts
+        self.eject_time = eject_time
+        self.max_eject_time = max_eject_time
+        self.checkout_timeout = checkout_timeout
+        self.nodes = []
+        for endpoint in endpoints:
+            host, port = parse_endpoint(endpoint)
+            self.nodes.append(Node(host, port, pool_class(host, port, **pool_kwargs)))
+        if not self.nodes:
+            raise ValueError("At least one endpoint is required.")
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _node_cost(self, node):
+        if self.balancer == "least_outstanding":
+            return (node.outstanding, node.latency or 0.0)
+        return ((node.latency or 0.0) * (node.outstanding + 1), node.outstanding)
+
+    def _acquire_node(self, exclude):
+        """Choose a node not in `exclude`, and count a request against it.
+
+        Ejected nodes are only chosen if no other node is left to try.
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [node for node in self.nodes if node not in exclude]
+            if not candidates:
+                return None
+            available = [node for node in candidates if node.is_available(now)]
+            if available:
+                node = min(available, key=self._node_cost)
+            else:
+                node = min(candidates, key=lambda node: node.ejected_until)
+            node.outstanding += 1
+            return node
+
+    def _release_node(self, node, elapsed=None, failed=True):
+        """Finish a request on `node`. A request that failed, which ejects the
+        node, has no `elapsed` time.
+        """
+        with self._lock:
+            node.outstanding -= 1
+            if elapsed is None:
+                if not failed:
+                    return
+                node.failures += 1
+                backoff = min(
+                    self.eject_time * 2 ** (node.failures - 1), self.max_eject_time
+                )
+                node.ejected_until = time.monotonic() + backoff
+                self._schedule_probe(node, backoff)
+            else:
+                node.failures = 0
+                node.ejected_until = 0.0
+                if node.probe_timer is not None:
+                    node.probe_timer.cancel()
+                    node.probe_timer = None
+                if node.latency is None:
+                    node.latency = elapsed
+                else:
+                    node.latency = 0.8 * node.latency + 0.2 * elapsed
+
+    def _schedule_probe(self, node, delay):
+        """Probe `node` after `delay` seconds. Must be called with the lock
+        held.
+        """
+        if node.probe_timer is not None:
+            node.probe_timer.cancel()
+        if self.closed:
+            return
+        node.probe_timer = threading.Timer(delay, self._probe_node, (node,))
+        node.probe_timer.daemon = True
+        node.probe_timer.start()
+
+    def _probe_node(self, node):
+        with self._lock:
+            if self.closed:
+                return
+            node.outstanding += 1
+        start = time.perf_counter()
+        try:
+            with node.pool.connection(self.checkout_timeout) as client:
+                status_code = client.get_server_status().status_code
+        except (OSError, ValueError, RuntimeError):
+            # RuntimeError if the pool was closed meanwhile.
+            status_code = None
+        if status_code == DictStatusCode.STATUS_FOLLOWS:
+            self._release_node(node, time.perf_counter() - start)
+        else:
+            self._release_node(node)
+
+    def _execute(self, func):
+        """Call func(client) with a client from the best node, retrying on
+        other nodes as described above.
+        """
+        tried = set()
+        error = response = None
+        for _ in range(self.max_attempts):
+            node = self._acquire_node(tried)
+            if node is None:
+                break
+            tried.add(node)
+            start = time.perf_counter()
+            try:
+                client = node.pool.checkout(self.checkout_timeout)
+            except PoolTimeoutError as e:
+                # The node is busy rather than unhealthy.
+                self._release_node(node, failed=False)
+                error = e
+                continue
+            except OSError as e:
+                self._release_node(node)
+                error = e
+                continue
+            try:
+                response = func(client)
+            except OSError as e:
+                node.pool.checkin(client, discard=True)
+                self._release_node(node)
+                error = e
+                continue
+            except ValueError:
+                # Usually an invalid argument, found before the command was
+                # sent; otherwise the reply could not be parsed, and any of it
+                # left unread means the connection can not be reused.
+                node.pool.checkin(client, discard=client.has_pending_reply())
+                self._release_node(node, failed=False)
+                raise
+            except BaseException:
+                node.pool.checkin(client, discard=True)
+                self._release_node(node, failed=False)
+                raise
+            if getattr(response, "status_code", None) in UNAVAILABLE_STATUS_CODES:
+                node.pool.checkin(client, discard=True)
+                self._release_node(node)
+                continue
+            node.pool.checkin(client)
+            self._release_node(node, time.perf_counter() - start)
+            return response
+        if response is not None:
+            return response
+        if error is not None:
+            raise error
+        raise ConnectionError("No dictionary server could be reached.")
+
+    def probe(self):
+        """Send STATUS to each ejected node, and reinstate those that reply."""
+        now = time.monotonic()
+        for node in self.nodes:
+            if not node.is_available(now):
+                self._probe_node(node)
+
+    @property
+    def databases(self):
+        return self._execute(lambda client: client.databases)
+
+    @property
+    def strategies(self):
+        return self._execute(lambda client: client.strategies)
+
+    def get_server_status(self):
+        return self._execute(lambda client: client.get_server_status())
+
+    def get_server_information(self):
+        return self._execute(lambda client: client.get_server_information())
+
+    def get_db_info(self, db):
+        return self._execute(lambda client: client.get_db_info(db))
+
+    def get_help_text(self):
+        return self._execute(lambda client: client.get_help_text())
+
+    def define(self, word_raw, db="*"):
+        return self._execute(lambda client: client.define(word_raw, db=db))
+
+    def define_many(self, words_raw, db="*"):
+        return self._execute(lambda client: client.define_many(words_raw, db=db))
+
+    def match(self, word_raw, db="*", strategy="."):
+        return self._execute(
+            lambda client: client.match(word_raw, db=db, strategy=strategy)
+        )
+
+    def match_many(self, words_raw, db="*", strategy="."):
+        return self._execute(
+            lambda client: client.match_many(words_raw, db=db, strategy=strategy)
+        )
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+            for node in self.nodes:
+                if node.probe_timer is not None:
+                    node.probe_timer.cancel()
+        for node in self.nodes:
+            node.pool.close()
@@ -0,0 +1,270 @@
+"""Export whole databases from a DICT server as JSON lines.
+
+    $ python -m dictionary_client.crawl --db wn --output wn.jsonl.gz
+
+The headwords are partitioned by prefix, and each partition is matched and
+defined on a connection of its own by one of several workers, in threads or
+processes. The headwords beginning with none of the prefixes are matched
+with a regular expression. Completed prefixes are recorded in a checkpoint
+file, so an interrupted crawl resumes where it stopped, and retries any
+prefix that failed, when run again with the same output file.
+"""
+import argparse
+import gzip
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+from .dictionary_client import DEFAULT_PORT, PIPELINE_BATCH_SIZE, DictionaryClient
+from .prefixes import DEFAULT_ALPHABET, make_prefixes, remainder_pattern
+from .status_codes import DictStatusCode
+from .word import Word
+
+
+class RateLimiter:
+    """Spaces out commands so that no more than `rate` are sent per second."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self.next_time = time.monotonic()
+
+    def acquire(self, count=1):
+        now = time.monotonic()
+        if self.next_time > now:
+            time.sleep(self.next_time - now)
+        self.next_time = max(self.next_time, now) + count * self.interval
+
+
+def crawl_prefix(client, db, prefix, strategy="prefix", limiter=None, failures=None):
+    """Match the words beginning with `prefix` in `db`, define each of them
+    in the database it was found in, and return the definitions as dicts.
+
+    Words which cannot be sent in a DEFINE command are skipped, and appended
+    to `failures`, if given, as (word, error message) pairs.
+    """
+    if limiter is not None:
+        limiter.acquire()
+    matches = client.match(prefix, db=db, strategy=strategy)
+    if matches.status_code != DictStatusCode.MATCHES_FOUND:
+        return []
+    words_by_db = defaultdict(dict)
+    for match in matches.iter_matches():
+        words_by_db[match.db][match.word] = None
+    records = []
+    for match_db, words in words_by_db.items():
+        words = [word for word in words if _is_valid(word, failures)]
+        for start in range(0, len(words), PIPELINE_BATCH_SIZE):
+            batch = words[start : start + PIPELINE_BATCH_SIZE]
+            if limiter is not None:
+                limiter.acquire(len(batch))
+            for response in client.define_many(batch, db=match_db):
+                records.extend(
+                    definition.as_dict() for definition in response.content or ()
+                )
+    return records
+
+
+def _is_valid(word, failures):
+    try:
+        Word(word)
+    except ValueError as e:
+        if failures is not None:
+            failures.append((word, str(e)))
+        return False
+    return True
+
+
+_worker = threading.local()
+
+
+def _init_worker(host, port, rate, client_kwargs):
+    _worker.args = host, port, client_kwargs
+    _worker.limiter = None if rate is None else RateLimiter(rate)
+
+
+def _crawl_task(db, prefix, strategy):
+    """Crawl `prefix`, returning it with its records, or None if it failed,
+    and the failures.
+    """
+    host, port, client_kwargs = _worker.args
+    client = None
+    failures = []
+    try:
+        client = DictionaryClient(host, port, **client_kwargs)
+        records = crawl_prefix(client, db, prefix, strategy, _worker.limiter, failures)
+    except Exception as e:
+        failures.append((prefix, str(e) or repr(e)))
+        records = None
+    finally:
+        # Without QUIT, as the connection may be part way through a response.
+        if client is not None:
+            client.sock.close()
+    return prefix, records, failures
+
+
+def _open_output(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "at", encoding="utf-8")
+    return open(path, "a", encoding="utf-8")
+
+
+def read_checkpoint(path):
+    """Return the set of prefixes recorded as complete in `path`."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return {line.rstrip("\n") for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+def crawl(
+    db,
+    output,
+    host="localhost",
+    port=DEFAULT_PORT,
+    prefixes=None,
+    strategy="prefix",
+    workers=4,
+    processes=False,
+    rate=None,
+    checkpoint=None,
+    progress=None,
+    alphabet=DEFAULT_ALPHABET,
+    prefix_length=1,
+    failures=None,
+    **client_kwargs,
+):
+    """Write the definitions of every word in `db` to `output` as JSON lines
+    (gzipped if the name ends with ".gz"), and return the number written.
+
+    The words are matched by each prefix of `prefix_length` characters from
+    `alphabet`, and the rest, which begin with other characters, by a MATCH
+    with the server's "re" strategy. A server which ignores punctuation in
+    prefix matches may match some words both ways, so they are written
+    twice. If `prefixes` are given instead, only the words beginning with
+    one of them are exported.
+
+    `workers` connections are used, in threads or, if `processes` is true, in
+    separate processes. `rate` limits the commands sent per second across all
+    of them. Each prefix is appended to `checkpoint` (by default the output
+    file name with ".checkpoint" added) once its definitions are written, and
+    prefixes found there are skipped; a prefix interrupted part way through
+    may be written twice. `progress`, if given, is called with each prefix
+    and the number of definitions found for it.
+
+    A prefix that fails, e.g. with a connection error or because the server
+    has no "re" strategy, is not checkpointed, so that the next run retries
+    it, and a word that cannot be sent in a DEFINE command is skipped; the
+    crawl carries on without them. Each is appended to `failures`, if given,
+    as a (prefix or word, error message) pair.
+    """
+    if prefixes is None:
+        tasks = [
+            (prefix, strategy) for prefix in make_prefixes(alphabet, prefix_length)
+        ]
+        tasks.append((remainder_pattern(alphabet, prefix_length), "re"))
+    else:
+        tasks = [(prefix, strategy) for prefix in prefixes]
+    if checkpoint is None:
+        checkpoint = f"{output}.checkpoint"
+    done = read_checkpoint(checkpoint)
+    pending = [task for task in tasks if task[0] not in done]
+    worker_rate = None if rate is None else rate / workers
+    executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    executor = executor_class(
+        workers,
+        initializer=_init_worker,
+        initargs=(host, port, worker_rate, client_kwargs),
+    )
+    written = 0
+    with executor, _open_output(output) as out, open(
+        checkpoint, "a", encoding="utf-8"
+    ) as checkpoint_file:
+        futures = {
+            executor.submit(_crawl_task, db, prefix, task_strategy)
+            for prefix, task_strategy in pending
+        }
+        try:
+            while futures:
+                completed, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    prefix, records, task_failures = future.result()
+                    if failures is not None:
+                        failures.extend(task_failures)
+                    if records is None:
+                        continue
+                    for record in records:
+                        out.write(json.dumps(record, ensure_ascii=False))
+                        out.write("\n")
+                    out.flush()
+                    checkpoint_file.write(f"{prefix}\n")
+                    checkpoint_file.flush()
+                    written += len(records)
+                    if progress is not None:
+                        progress(prefix, len(records))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m dictionary_client.crawl")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", required=True, help="database to export")
+    parser.add_argument(
+        "--output", required=True, help="JSON lines file, gzipped if it ends .gz"
+    )
+    parser.add_argument("--checkpoint", help="defaults to OUTPUT.checkpoint")
+    parser.add_argument(
+        "--alphabet", default=DEFAULT_ALPHABET, help="characters to build prefixes"
+    )
+    parser.add_argument(
+        "--prefix-length", type=int, default=1, help="characters per prefix"
+    )
+    parser.add_argument("--strategy", default="prefix", help="MATCH strategy")
+    parser.add_argument("--workers", type=int, default=4, help="connections")
+    parser.add_argument(
+        "--processes", action="store_true", help="run workers in processes"
+    )
+    parser.add_argument("--rate", type=float, help="maximum commands per second")
+    args = parser.parse_args(argv)
+
+    def report(prefix, count):
+        print(f"{prefix}: {count} definitions", file=sys.stderr)
+
+    failures = []
+    written = crawl(
+        args.db,
+        args.output,
+        host=args.host,
+        port=args.port,
+        alphabet=args.alphabet,
+        prefix_length=args.prefix_length,
+        strategy=args.strategy,
+        workers=args.workers,
+        processes=args.processes,
+        rate=args.rate,
+        checkpoint=args.checkpoint,
+        progress=report,
+        failures=failures,
+    )
+    print(f"Wrote {written} definitions to {args.output}", file=sys.stderr)
+    for item, error in failures:
+        print(f"Failed: {item}: {error}", file=sys.stderr)
+    if failures:
+        sys.exit(f"{len(failures)} failures; run again to retry failed prefixes")
+
+
+if __name__ == "__main__":
+    main()
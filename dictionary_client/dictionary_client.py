@@ -1,8 +1,13 @@
 import getpass
-import select
+import itertools
 import socket
+import time
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 
+from .cache import ResultCache
 from .commands import (
     client_ident_command,
     define_word_command,
@@ -15,10 +20,15 @@ from .commands import (
     show_strategies_command,
     status_command,
 )
+from .instrumentation import command_name
+from .metadata import shared_metadata
+from .reader import TEXT_TERMINATOR, ResponseReader
 from .response import (
     DatabaseInfoResponse,
     DefineWordResponse,
+    DefinitionParser,
     HandshakeResponse,
+    Match,
     MatchResponse,
     MultiLineResponse,
     PreliminaryResponse,
@@ -27,8 +37,28 @@ from .response import (
 from .status_codes import DictStatusCode
 from .word import Word
 
-BUF_SIZE = 4096
 DEFAULT_PORT = 2628
+PIPELINE_BATCH_SIZE = 64
+
+
+@lru_cache(maxsize=None)
+def default_client_name():
+    """Return "user@host" for this process, looked up once."""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        # getpass falls back to the password database, which may not have an
+        # entry for the current uid in a container.
+        user = "unknown"
+    return f"{user}@{socket.gethostname()}"
+
+
+@lru_cache(maxsize=None)
+def default_client_id():
+    """Return the text sent with the CLIENT command by default: the client
+    name and the time it was first needed by this process.
+    """
+    return f"{default_client_name()} {datetime.now().isoformat()}"
 
 
 class ReadOnlyDescriptor:
@@ -48,22 +78,23 @@ class ReadOnlyDescriptor:
         self.raise_read_only(obj)
 
 
-class Strategies(ReadOnlyDescriptor):
-    def __get__(self, obj, obj_type=None):
-        if not getattr(obj, self.private_name, None):
-            obj.sock.sendall(show_strategies_command())
-            response = ServerPropertiesResponse(obj._recv_all())
-            setattr(obj, self.private_name, response.content)
-        return getattr(obj, self.private_name)
+class ServerProperty(ReadOnlyDescriptor):
+    """Lazily fetched server metadata, shared by all clients of the same
+    server through their `metadata_cache`.
+    """
 
+    def __init__(self, command_func):
+        self.command_func = command_func
 
-class Databases(ReadOnlyDescriptor):
     def __get__(self, obj, obj_type=None):
-        if not getattr(obj, self.private_name, None):
-            obj.sock.sendall(show_databases_command())
-            response = ServerPropertiesResponse(obj._recv_all())
-            setattr(obj, self.private_name, response.content)
-        return getattr(obj, self.private_name)
+        if obj is None:
+            return self
+        cache = obj.metadata_cache
+        value = cache.get(obj.host, obj.port, self.public_name)
+        if value is None:
+            response = obj._get_response(self.command_func(), ServerPropertiesResponse)
+            value = cache.set(obj.host, obj.port, self.public_name, response)
+        return value
 
 
 class DictionaryClient:
@@ -71,57 +102,263 @@ class DictionaryClient:
     the DICT Server Protocol (https://tools.ietf.org/html/rfc2229).
     """
 
-    strategies = Strategies()
-    databases = Databases()
+    strategies = ServerProperty(show_strategies_command)
+    databases = ServerProperty(show_databases_command)
+
+    def __init__(
+        self,
+        host="localhost",
+        port=DEFAULT_PORT,
+        sock_class=socket.socket,
+        cache=None,
+        instrumentation=None,
+        connect_timeout=None,
+        read_timeout=5,
+        client_id=None,
+        send_client_ident=True,
+        lazy=False,
+        metadata_cache=None,
+        local=None,
+        headword_index=None,
+    ):
+        """`connect_timeout` limits the time taken to establish the
+        connection, and `read_timeout` the time we wait for each chunk of a
+        reply (or for the socket to accept more of a command). Either may be
+        None to wait indefinitely. See `timeouts` to change them for a few
+        calls, or to set a deadline for several calls together.
+
+        `client_id` is the text sent to identify the client with the CLIENT
+        command, which is skipped if `send_client_ident` is false. With
+        `lazy=True`, the connection is not made until the first command that
+        needs it.
+
+        The server's databases and strategies are cached in `metadata_cache`,
+        which by default is shared by all clients in the process.
 
-    def __init__(self, host="localhost", port=DEFAULT_PORT, sock_class=socket.socket):
-        self.client_name = f"{getpass.getuser()}@{socket.gethostname()}"
-        self.client_id_info = f"{self.client_name} {datetime.now().isoformat()}"
+        `local` is a LocalDictionary which answers DEFINE, MATCH and SHOW INFO
+        for its own databases, in place of the server. `headword_index` is a
+        HeadwordIndex which answers MATCH for its databases with the
+        strategies it supports.
+        """
+        self.host = host
+        self.port = port
+        self.cache = cache
+        if metadata_cache is None:
+            metadata_cache = shared_metadata
+        self.metadata_cache = metadata_cache
+        self.local = local
+        self.headword_index = headword_index
+        self.instrumentation = instrumentation
+        self.connect_timeout = connect_timeout
+        self.client_name = default_client_name()
+        if client_id is None:
+            client_id = default_client_id()
+        self.client_id_info = client_id
+        self.send_client_ident = send_client_ident
+        self._sock_class = sock_class
         self.sock = sock_class(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_info = self._connect(host, port)
+        self._reader = ResponseReader(
+            self.sock, timeout=read_timeout, instrumentation=instrumentation
+        )
+        self.connected = False
+        self._server_info = None
+        if not lazy:
+            self._connect()
+
+    @property
+    def server_info(self):
+        if not self.connected:
+            self._connect()
+        return self._server_info
+
+    def refresh_metadata(self):
+        """Forget the cached databases and strategies of this client's server,
+        so they are fetched again when next needed.
+        """
+        self.metadata_cache.invalidate(self.host, self.port)
+
+    def has_pending_reply(self):
+        """Return whether part of a reply has been received but not read, as
+        after a reply that could not be parsed. Such a client's next command
+        would read it as its own reply.
+        """
+        return bool(self._reader.buffer)
+
+    @property
+    def read_timeout(self):
+        return self._reader.timeout
+
+    @read_timeout.setter
+    def read_timeout(self, value):
+        self._reader.timeout = value
+
+    @contextmanager
+    def timeouts(self, deadline=None, read_timeout=None):
+        """Within the block, fail any command with TimeoutError once
+        `deadline` seconds have passed, and use `read_timeout` instead of the
+        client's read timeout. A deadline nested inside another can only
+        shorten it.
+
+        A command interrupted by a timeout leaves the connection in an unknown
+        state, so the client should be discarded afterwards.
+        """
+        reader = self._reader
+        saved = reader.deadline, reader.timeout
+        if deadline is not None:
+            deadline += time.monotonic()
+            if reader.deadline is None or deadline < reader.deadline:
+                reader.deadline = deadline
+        if read_timeout is not None:
+            reader.timeout = read_timeout
+        try:
+            yield self
+        finally:
+            reader.deadline, reader.timeout = saved
 
     def _recv_all(self):
-        rlist, _, _ = select.select([self.sock], [], [], 5)
-        if self.sock not in rlist:
-            raise TimeoutError("Client timed out expecting server response.")
-        bytes_received = self.sock.recv(BUF_SIZE)
-        status_code = self._get_status(bytes_received)
-        if DictStatusCode.response_complete(status_code):
-            return bytes_received
-        while not self._response_complete(bytes_received):
-            rlist, _, _ = select.select([self.sock], [], [], 5)
-            if self.sock not in rlist:
-                raise TimeoutError(
-                    "Client timed out following preliminary response with status "
-                    f"{status_code}."
-                )
-            bytes_received += self.sock.recv(BUF_SIZE)
-        return bytes_received
+        return self._reader.read_response()
 
-    def _connect(self, host, port):
-        self.sock.connect((host, port))
+    def _connect(self):
+        if self.instrumentation is not None:
+            connect_start = time.perf_counter()
+        self.sock.settimeout(self._reader.limit_timeout(self.connect_timeout))
+        self.sock.connect((self.host, self.port))
+        self.sock.setblocking(False)
         response = HandshakeResponse(self._recv_all())
         if response.status_code != DictStatusCode.CONNECTION_ACCEPTED:
             raise Exception(response.status_code)
-        self._send_client_ident()
-        return response.content
+        if self.instrumentation is not None:
+            elapsed = time.perf_counter() - connect_start
+            self.instrumentation.on_connect(self.host, self.port, elapsed)
+        self.connected = True
+        self._server_info = response.content
+        if self.send_client_ident:
+            self._send_client_ident()
+
+    def _send(self, data):
+        if not self.connected:
+            self._connect()
+        self._reader.sendall(data)
+
+    def _reconnect_later(self):
+        """Drop the connection without waiting for the server, so that the
+        next command opens a new one.
+        """
+        old_sock = self.sock
+        self.sock = self._sock_class(socket.AF_INET, socket.SOCK_STREAM)
+        self._reader.reset(self.sock)
+        old_sock.close()
+        self.connected = False
 
     def _send_client_ident(self):
-        self.sock.sendall(client_ident_command(self.client_id_info))
-        response = PreliminaryResponse(self._recv_all())
+        response = self._get_response(
+            client_ident_command(self.client_id_info), PreliminaryResponse
+        )
         if response.status_code != DictStatusCode.OK:
             raise Exception(response.status_code)
 
     def _get_status(self, response_bytes):
         return int(response_bytes[:3])
 
-    def _response_complete(self, response_bytes):
-        return b"250" in response_bytes and response_bytes[-2:] == b"\r\n"
-
     def _get_response(self, command, response_class):
-        self.sock.sendall(command)
+        if self.instrumentation is not None:
+            return self._get_instrumented_response(command, response_class)
+        self._send(command)
         return response_class(self._recv_all())
 
+    def _get_instrumented_response(self, command, response_class):
+        name = command_name(command)
+        self.instrumentation.on_command_start(name)
+        self._reader.wait_time = 0.0
+        start = time.perf_counter()
+        self._send(command)
+        sent = time.perf_counter()
+        response_bytes = self._recv_all()
+        received = time.perf_counter()
+        response = response_class(response_bytes)
+        # Parse eagerly, so that parsing is included in the timings.
+        response.content
+        parsed = time.perf_counter()
+        timings = {
+            "send": sent - start,
+            "wait": self._reader.wait_time,
+            "receive": received - sent - self._reader.wait_time,
+            "parse": parsed - received,
+            "total": parsed - start,
+        }
+        self.instrumentation.on_response_parsed(name, response, timings)
+        return response
+
+    def _read_pipelined_response(self, command, response_class, sent_at):
+        response = response_class(self._recv_all())
+        if self.instrumentation is not None:
+            timings = {"total": time.perf_counter() - sent_at}
+            self.instrumentation.on_response_parsed(
+                command_name(command), response, timings
+            )
+        return response
+
+    def _get_responses(self, commands, response_class):
+        """Send several commands without waiting for each reply, and return
+        their responses in order.
+
+        Commands are written in batches, with at most two batches awaiting
+        replies, so that a server blocked on writing replies we have not yet
+        read can still buffer the commands we send.
+        """
+        responses = []
+        in_flight = deque()
+        for start in range(0, len(commands), PIPELINE_BATCH_SIZE):
+            batch = commands[start : start + PIPELINE_BATCH_SIZE]
+            if self.instrumentation is not None:
+                for command in batch:
+                    self.instrumentation.on_command_start(command_name(command))
+            self._send(b"".join(batch))
+            in_flight.append((batch, time.perf_counter()))
+            if len(in_flight) > 1:
+                batch, sent_at = in_flight.popleft()
+                for command in batch:
+                    responses.append(
+                        self._read_pipelined_response(command, response_class, sent_at)
+                    )
+        for batch, sent_at in in_flight:
+            for command in batch:
+                responses.append(
+                    self._read_pipelined_response(command, response_class, sent_at)
+                )
+        return responses
+
+    def _get_cached_response(self, key, command, response_class):
+        if self.cache is None:
+            return self._get_response(command, response_class)
+        response = self.cache.get(key)
+        if response is None:
+            response = self._get_response(command, response_class)
+            self.cache.set(key, response)
+        return response
+
+    def _get_cached_responses(self, keys, commands, response_class):
+        if self.cache is None:
+            return self._get_responses(commands, response_class)
+        responses = [self.cache.get(key) for key in keys]
+        missing = [i for i, response in enumerate(responses) if response is None]
+        received = self._get_responses([commands[i] for i in missing], response_class)
+        for i, response in zip(missing, received):
+            self.cache.set(keys[i], response)
+            responses[i] = response
+        return responses
+
+    def _is_local(self, db):
+        return self.local is not None and db in self.local
+
+    def _is_indexed(self, db, strategy):
+        index = self.headword_index
+        if index is None or strategy not in index.strategies:
+            return False
+        if db == "*":
+            return all(name in index for name in self.databases)
+        return db in index
+
     def get_server_status(self):
         return self._get_response(status_command(), PreliminaryResponse)
 
@@ -129,6 +366,8 @@ class DictionaryClient:
         return self._get_response(show_server_command(), MultiLineResponse)
 
     def get_db_info(self, db):
+        if self._is_local(db):
+            return self.local.get_db_info(db)
         if db not in self.databases:
             raise ValueError(f'Invalid database name: "{db}" not present.')
         return self._get_response(show_info_command(db), DatabaseInfoResponse)
@@ -137,23 +376,343 @@ class DictionaryClient:
         return self._get_response(help_command(), MultiLineResponse)
 
     def define(self, word_raw, db="*"):
+        if self._is_local(db):
+            return self.local.define(word_raw, db)
+        if db != "*" and db not in self.databases:
+            raise ValueError(f'Invalid database name: "{db}" not present.')
+        word = Word(word_raw)
+        return self._get_cached_response(
+            ResultCache.make_key("DEFINE", word, db),
+            define_word_command(word, db),
+            DefineWordResponse,
+        )
+
+    def define_many(self, words_raw, db="*"):
+        """Define each of `words_raw`, pipelining the commands on this
+        connection. Returns a list of responses in the same order as the
+        words; a word with no definitions gets a response with status 552.
+        """
+        if self._is_local(db):
+            return [self.local.define(word_raw, db) for word_raw in words_raw]
         if db != "*" and db not in self.databases:
             raise ValueError(f'Invalid database name: "{db}" not present.')
+        words = [Word(word_raw) for word_raw in words_raw]
+        return self._get_cached_responses(
+            [ResultCache.make_key("DEFINE", word, db) for word in words],
+            [define_word_command(word, db) for word in words],
+            DefineWordResponse,
+        )
+
+    def define_multi(self, word_raw, dbs, first_hit=False):
+        """Define `word_raw` in each of `dbs`, pipelining the commands on this
+        connection, and return a dict of responses by database in the order
+        of `dbs`.
+
+        With `first_hit=True`, stop at the first database (in the order of
+        `dbs`) with a definition of the word: the result only includes the
+        databases up to that one, and the replies for the others are
+        discarded later rather than waited for now.
+        """
+        for db in dbs:
+            if not self._is_local(db) and db not in self.databases:
+                raise ValueError(f'Invalid database name: "{db}" not present.')
         word = Word(word_raw)
-        return self._get_response(define_word_command(word, db), DefineWordResponse)
+        keys = [ResultCache.make_key("DEFINE", word, db) for db in dbs]
+        # Responses known without asking the server.
+        responses = [None] * len(dbs)
+        for i, db in enumerate(dbs):
+            if self._is_local(db):
+                responses[i] = self.local.define(word_raw, db)
+            elif self.cache is not None:
+                responses[i] = self.cache.get(keys[i])
+        missing = [i for i, response in enumerate(responses) if response is None]
+        if not first_hit:
+            received = self._get_responses(
+                [define_word_command(word, dbs[i]) for i in missing],
+                DefineWordResponse,
+            )
+            for i, response in zip(missing, received):
+                if self.cache is not None:
+                    self.cache.set(keys[i], response)
+                responses[i] = response
+            return dict(zip(dbs, responses))
+        # There is no need to ask for databases after a known hit.
+        for i, response in enumerate(responses):
+            if (
+                response is not None
+                and response.status_code == DictStatusCode.DEFINITIONS_FOLLOW
+            ):
+                missing = [j for j in missing if j < i]
+                break
+        commands = {i: define_word_command(word, dbs[i]) for i in missing}
+        if commands:
+            if self.instrumentation is not None:
+                for command in commands.values():
+                    self.instrumentation.on_command_start(command_name(command))
+            self._send(b"".join(commands.values()))
+            sent_at = time.perf_counter()
+        unread = len(missing)
+        results = {}
+        for i, db in enumerate(dbs):
+            response = responses[i]
+            if response is None:
+                response = self._read_pipelined_response(
+                    commands[i], DefineWordResponse, sent_at
+                )
+                unread -= 1
+                if self.cache is not None:
+                    self.cache.set(keys[i], response)
+            results[db] = response
+            if response.status_code == DictStatusCode.DEFINITIONS_FOLLOW:
+                self._reader.skip_later(unread)
+                break
+        return results
+
+    def define_iter(self, word_raw, db="*"):
+        """Like `define`, but yield each definition as soon as it has been
+        received rather than waiting for the complete response.
+
+        The iterator must be exhausted or closed before the next command is
+        sent on this client. Closing it early discards the rest of the
+        response when the next command is sent.
+        """
+        if self._is_local(db):
+            return iter(self.local.define(word_raw, db).content or ())
+        if db != "*" and db not in self.databases:
+            raise ValueError(f'Invalid database name: "{db}" not present.')
+        word = Word(word_raw)
+        return self._iter_definitions(define_word_command(word, db))
+
+    def _report_streamed(self, command, started, status_lines):
+        """Report a response that was yielded as it was received, as a
+        PreliminaryResponse of its status lines.
+        """
+        response = PreliminaryResponse(
+            b"".join(line + b"\r\n" for line in status_lines)
+        )
+        timings = {"total": time.perf_counter() - started}
+        self.instrumentation.on_response_parsed(
+            command_name(command), response, timings
+        )
+
+    def _iter_definitions(self, command):
+        if self.instrumentation is not None:
+            self.instrumentation.on_command_start(command_name(command))
+            started = time.perf_counter()
+        # Send the command from the generator, so that an iterator closed
+        # before it was started leaves no response behind.
+        self._send(command)
+        status_line = self._reader.read_line()
+        status_lines = [status_line]
+        try:
+            status_code = self._get_status(status_line)
+            if status_code == DictStatusCode.NO_MATCH:
+                return
+            if status_code != DictStatusCode.DEFINITIONS_FOLLOW:
+                raise ValueError(
+                    "Client got unexpected response to DEFINE: "
+                    f'"{status_line.decode()}"'
+                )
+            parser = DefinitionParser()
+            while True:
+                line = self._reader.read_line()
+                if not parser.in_text and DictStatusCode.response_complete(
+                    self._get_status(line)
+                ):
+                    status_lines.append(line)
+                    return
+                definition = parser.feed(line.decode())
+                if definition is not None:
+                    try:
+                        yield definition
+                    except GeneratorExit:
+                        self._reader.skip_later()
+                        raise
+        finally:
+            if self.instrumentation is not None:
+                self._report_streamed(command, started, status_lines)
 
     def match(self, word_raw, db="*", strategy="."):
+        if self._is_local(db):
+            return self.local.match(word_raw, db, strategy)
+        if self._is_indexed(db, strategy):
+            return self.headword_index.match(word_raw, db, strategy)
         if db != "*" and db not in self.databases:
             raise ValueError(f'Invalid database name: "{db}" not present.')
         if strategy != "." and strategy not in self.strategies:
             raise ValueError(f'Unknown strategy: "{strategy}".')
         word = Word(word_raw)
-        return self._get_response(
-            match_command(word, db=db, strategy=strategy), MatchResponse
+        return self._get_cached_response(
+            ResultCache.make_key("MATCH", word, db, strategy),
+            match_command(word, db=db, strategy=strategy),
+            MatchResponse,
         )
 
+    def match_iter(self, word_raw, db="*", strategy=".", limit=None, reconnect=False):
+        """Like `match`, but yield each Match as soon as it has been received,
+        and stop after `limit` matches if `limit` is given.
+
+        As with `define_iter`, the iterator must be exhausted or closed before
+        the next command is sent. If it stops before the end of the response,
+        because of `limit` or because it was closed, the rest of the response
+        is discarded when the next command is sent, without being parsed. With
+        `reconnect=True` the connection is closed instead, and the next
+        command opens a new one, which saves receiving the rest of a very
+        large response at the cost of a new connection.
+        """
+        if self._is_local(db):
+            response = self.local.match(word_raw, db, strategy)
+            return itertools.islice(response.iter_matches(), limit)
+        if self._is_indexed(db, strategy):
+            response = self.headword_index.match(word_raw, db, strategy)
+            return itertools.islice(response.iter_matches(), limit)
+        if db != "*" and db not in self.databases:
+            raise ValueError(f'Invalid database name: "{db}" not present.')
+        if strategy != "." and strategy not in self.strategies:
+            raise ValueError(f'Unknown strategy: "{strategy}".')
+        word = Word(word_raw)
+        if self.cache is not None:
+            key = ResultCache.make_key("MATCH", word, db, strategy)
+            response = self.cache.get(key)
+            if response is not None:
+                return itertools.islice(response.iter_matches(), limit)
+        return self._iter_matches(
+            match_command(word, db=db, strategy=strategy), limit, reconnect
+        )
+
+    def _iter_matches(self, command, limit, reconnect):
+        if self.instrumentation is not None:
+            self.instrumentation.on_command_start(command_name(command))
+            started = time.perf_counter()
+        # Sent from the generator, as in _iter_definitions.
+        self._send(command)
+        status_line = self._reader.read_line()
+        status_lines = [status_line]
+        try:
+            status_code = self._get_status(status_line)
+            if status_code == DictStatusCode.NO_MATCH:
+                return
+            if status_code != DictStatusCode.MATCHES_FOUND:
+                raise ValueError(
+                    "Client got unexpected response to MATCH: "
+                    f'"{status_line.decode()}"'
+                )
+            count = 0
+            while limit is None or count < limit:
+                line = self._reader.read_line()
+                if line == TEXT_TERMINATOR:
+                    # The status line ending the response.
+                    status_lines.append(self._reader.read_line())
+                    return
+                if line.startswith(b".."):
+                    line = line[1:]
+                db, _, word = line.decode().partition(" ")
+                count += 1
+                try:
+                    yield Match(db, word.strip('"'))
+                except GeneratorExit:
+                    self._abandon_matches(reconnect)
+                    raise
+            self._abandon_matches(reconnect)
+        finally:
+            if self.instrumentation is not None:
+                self._report_streamed(command, started, status_lines)
+
+    def _abandon_matches(self, reconnect):
+        if reconnect:
+            self._reconnect_later()
+        else:
+            self._reader.skip_later(in_text=True)
+
+    def match_many(self, words_raw, db="*", strategy="."):
+        """Match each of `words_raw`, pipelining the commands as in
+        `define_many`.
+        """
+        if self._is_local(db):
+            return [self.local.match(word_raw, db, strategy) for word_raw in words_raw]
+        if self._is_indexed(db, strategy):
+            return [
+                self.headword_index.match(word_raw, db, strategy)
+                for word_raw in words_raw
+            ]
+        if db != "*" and db not in self.databases:
+            raise ValueError(f'Invalid database name: "{db}" not present.')
+        if strategy != "." and strategy not in self.strategies:
+            raise ValueError(f'Unknown strategy: "{strategy}".')
+        words = [Word(word_raw) for word_raw in words_raw]
+        return self._get_cached_responses(
+            [ResultCache.make_key("MATCH", word, db, strategy) for word in words],
+            [match_command(word, db=db, strategy=strategy) for word in words],
+            MatchResponse,
+        )
+
+    def lookup(self, word_raw, db="*", strategy=".", limit=None):
+        """Match `word_raw` and define each distinct word matched, yielding
+        pairs of the word and its DefineWordResponse in the order the server
+        listed the matches.
+
+        The words matched are defined in `db`, so with the default of "*" a
+        word found in any database is defined in all of them. The DEFINE
+        commands are pipelined, so a lookup takes two round trips however many
+        words are matched. `limit` caps the number of words defined.
+
+        As with `define_iter`, the iterator must be exhausted or closed before
+        the next command is sent on this client.
+        """
+        matches = self.match(word_raw, db=db, strategy=strategy)
+        if matches.status_code != DictStatusCode.MATCHES_FOUND:
+            return iter(())
+        words = []
+        for word_raw in dict.fromkeys(match.word for match in matches.iter_matches()):
+            try:
+                words.append(Word(word_raw))
+            except ValueError:
+                # A headword that can not be sent back in a command, which
+                # crawl skips too.
+                continue
+        if limit is not None:
+            words = words[:limit]
+        if self._is_local(db):
+            return ((word.raw, self.local.define(word.raw, db)) for word in words)
+        return self._iter_lookup(words, db)
+
+    def _iter_lookup(self, words, db):
+        for start in range(0, len(words), PIPELINE_BATCH_SIZE):
+            batch = words[start : start + PIPELINE_BATCH_SIZE]
+            keys = [ResultCache.make_key("DEFINE", word, db) for word in batch]
+            responses = [None] * len(batch)
+            if self.cache is not None:
+                responses = [self.cache.get(key) for key in keys]
+            commands = [
+                define_word_command(word, db)
+                for word, response in zip(batch, responses)
+                if response is None
+            ]
+            if commands:
+                if self.instrumentation is not None:
+                    for command in commands:
+                        self.instrumentation.on_command_start(command_name(command))
+                self._send(b"".join(commands))
+                sent_at = time.perf_counter()
+            unread = deque(commands)
+            for word, key, response in zip(batch, keys, responses):
+                if response is None:
+                    response = self._read_pipelined_response(
+                        unread.popleft(), DefineWordResponse, sent_at
+                    )
+                    if self.cache is not None:
+                        self.cache.set(key, response)
+                try:
+                    yield word.raw, response
+                except GeneratorExit:
+                    self._reader.skip_later(len(unread))
+                    raise
+
     def disconnect(self):
-        self.sock.sendall(disconnect_command())
+        if not self.connected:
+            self.sock.close()
+            return
+        self._send(disconnect_command())
         bytes_recieved = self._recv_all()
         if self._get_status(bytes_recieved) != DictStatusCode.CLOSING_CONNECTION:
             raise ConnectionError(
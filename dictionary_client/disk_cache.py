@@ -0,0 +1,268 @@
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import threading
+from contextlib import contextmanager
+
+from .cache import CacheBackend
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows, where the file is only locked between threads.
+    fcntl = None
+
+MAGIC = b"PYDICTC1"
+FINGERPRINT_SIZE = hashlib.sha256().digest_size
+HEADER_SIZE = len(MAGIC) + FINGERPRINT_SIZE
+RECORD_HEADER = struct.Struct(">II")
+TOMBSTONE = 0xFFFFFFFF
+
+
+def server_fingerprint(client, dbs=()):
+    """Digest of the server's database list and the SHOW INFO text of each of
+    `dbs`, for use as a DiskCacheBackend fingerprint. It changes when the
+    server's dictionaries are upgraded.
+    """
+    digest = hashlib.sha256()
+    for name, description in sorted((client.databases or {}).items()):
+        digest.update(f"{name}\0{description}\0".encode())
+    for db in dbs:
+        digest.update(f"{db}\0{client.get_db_info(db).content}\0".encode())
+    return digest.digest()
+
+
+class DiskCacheBackend(CacheBackend):
+    """Persistent cache backend storing entries in an append-only file.
+
+    The file is a header holding `fingerprint`, followed by records of
+    (key length, value length, pickled key, pickled value). Deletions are
+    recorded with tombstone records, and `compact` rewrites the file with only
+    live entries. This happens automatically once there are more than
+    `compact_threshold` dead records, and more dead records than live ones;
+    pass `compact_threshold=None` to only compact when asked to. The index of
+    record offsets is rebuilt when the file is opened, and values are
+    unpickled straight out of a memory map of the file.
+
+    If the fingerprint stored in the file differs from `fingerprint`, e.g.
+    one computed with `server_fingerprint`, the file is emptied. Several
+    processes can share a file: appends and compaction hold an exclusive
+    `flock` on it, where available, and a process reopens the file when
+    another has compacted it. Corrupt or partially written records are
+    truncated from the end of the file when it is opened.
+
+    As entries are unpickled, anyone able to write to `path` can run code in
+    the processes using it. Do not keep it where untrusted users can write.
+    """
+
+    def __init__(self, path, fingerprint=b"", compact_threshold=1000):
+        self.path = path
+        self.fingerprint = fingerprint.ljust(FINGERPRINT_SIZE, b"\0")
+        if len(self.fingerprint) != FINGERPRINT_SIZE:
+            raise ValueError(f"Fingerprint must be at most {FINGERPRINT_SIZE} bytes.")
+        self.compact_threshold = compact_threshold
+        self._index = {}
+        self._dead = 0
+        self._lock = threading.Lock()
+        self._mmap = None
+        self._file = None
+        with self._lock:
+            self._open()
+            with self._file_lock():
+                self._load()
+
+    def __len__(self):
+        return len(self._index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _open(self):
+        self._unmap()
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.path, "a+b")
+
+    def _replaced(self):
+        """Whether another process has replaced the file, by compacting it."""
+        try:
+            current = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            return True
+        return current != os.fstat(self._file.fileno()).st_ino
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold an exclusive lock on the file, reopening and reloading it
+        first if another process has replaced it. Must be called with the
+        thread lock held.
+        """
+        if fcntl is None:
+            yield
+            return
+        reopened = False
+        while True:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            if not self._replaced():
+                break
+            self._open()
+            reopened = True
+        try:
+            if reopened:
+                self._load()
+            yield
+        finally:
+            # After compact this is the new file, which unlocks the old one.
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _unmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _remap(self):
+        self._unmap()
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _truncate(self, size):
+        # Never truncate a file while it is mapped.
+        self._unmap()
+        self._file.truncate(size)
+
+    def _reset(self):
+        self._truncate(0)
+        self._file.write(MAGIC + self.fingerprint)
+        self._file.flush()
+        self._index.clear()
+        self._dead = 0
+        self._remap()
+
+    def _load(self):
+        self._index.clear()
+        self._dead = 0
+        size = os.fstat(self._file.fileno()).st_size
+        if size < HEADER_SIZE:
+            self._reset()
+            return
+        self._remap()
+        if self._mmap[:HEADER_SIZE] != MAGIC + self.fingerprint:
+            self._reset()
+            return
+        offset = HEADER_SIZE
+        while offset + RECORD_HEADER.size <= size:
+            key_length, value_length = RECORD_HEADER.unpack_from(self._mmap, offset)
+            key_end = offset + RECORD_HEADER.size + key_length
+            value_end = key_end + (0 if value_length == TOMBSTONE else value_length)
+            if value_end > size:
+                break
+            try:
+                key = pickle.loads(self._mmap[key_end - key_length : key_end])
+            except Exception:
+                break
+            if value_length == TOMBSTONE:
+                self._index.pop(key, None)
+                self._dead += 2
+            else:
+                if key in self._index:
+                    self._dead += 1
+                self._index[key] = (key_end, value_length)
+            offset = value_end
+        if offset != size:
+            # Drop a corrupt or partially written record, e.g. left by a
+            # crash, and anything after it.
+            self._truncate(offset)
+            self._remap()
+
+    def _append(self, key, value_bytes):
+        key_bytes = pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+        value_length = TOMBSTONE if value_bytes is None else len(value_bytes)
+        offset = self._file.seek(0, os.SEEK_END)
+        record = RECORD_HEADER.pack(len(key_bytes), value_length) + key_bytes
+        self._file.write(record if value_bytes is None else record + value_bytes)
+        self._file.flush()
+        return offset + RECORD_HEADER.size + len(key_bytes)
+
+    def _needs_compaction(self):
+        return (
+            self.compact_threshold is not None
+            and self._dead > self.compact_threshold
+            and self._dead > len(self._index)
+        )
+
+    def get(self, key):
+        with self._lock:
+            try:
+                offset, length = self._index[key]
+            except KeyError:
+                return None
+            if offset + length > len(self._mmap):
+                self._remap()
+            with memoryview(self._mmap) as view:
+                with view[offset : offset + length] as value:
+                    try:
+                        return pickle.loads(value)
+                    except Exception:
+                        # A corrupt value is treated as a miss.
+                        del self._index[key]
+                        return None
+
+    def set(self, key, value):
+        value_bytes = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._file_lock():
+            offset = self._append(key, value_bytes)
+            if key in self._index:
+                self._dead += 1
+            self._index[key] = (offset, len(value_bytes))
+            if self._needs_compaction():
+                self._compact()
+
+    def delete(self, key):
+        with self._lock, self._file_lock():
+            if self._index.pop(key, None) is not None:
+                self._append(key, None)
+                self._dead += 2
+                if self._needs_compaction():
+                    self._compact()
+
+    def clear(self):
+        with self._lock, self._file_lock():
+            self._reset()
+
+    def _compact(self):
+        tmp_path = f"{self.path}.tmp"
+        self._remap()
+        entries = [
+            (key, self._mmap[offset : offset + length])
+            for key, (offset, length) in self._index.items()
+        ]
+        with open(tmp_path, "w+b") as f:
+            f.write(MAGIC + self.fingerprint)
+            for key, value_bytes in entries:
+                key_bytes = pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+                f.write(RECORD_HEADER.pack(len(key_bytes), len(value_bytes)))
+                f.write(key_bytes)
+                self._index[key] = (f.tell(), len(value_bytes))
+                f.write(value_bytes)
+        os.replace(tmp_path, self.path)
+        self._dead = 0
+        # Keep the old file, and the lock on it, open until the new one is.
+        old_file = self._file
+        self._unmap()
+        self._file = open(self.path, "a+b")
+        self._remap()
+        old_file.close()
+
+    def compact(self):
+        """Rewrite the file without deleted or overwritten records."""
+        with self._lock, self._file_lock():
+            self._compact()
+
+    def close(self):
+        with self._lock:
+            self._unmap()
+            self._file.close()
@@ -0,0 +1,262 @@
+import bisect
+import gzip
+import json
+from collections import defaultdict
+
+from .local import fold
+from .prefixes import make_prefixes, remainder_pattern
+from .response import MatchResponse
+from .status_codes import DictStatusCode
+
+INDEX_STRATEGIES = {
+    "exact": "Match headwords exactly",
+    "prefix": "Match prefixes",
+    "suffix": "Match suffixes",
+    "substring": "Match substring occurring anywhere in a headword",
+    "lev": "Match headwords within Levenshtein distance one",
+    "soundex": "Match using SOUNDEX algorithm",
+}
+# Sorts after any character in a headword.
+MAX_CHAR = "\U0010ffff"
+SOUNDEX_CODES = {
+    letter: digit
+    for digit, letters in (
+        ("1", "bfpv"),
+        ("2", "cgjkqsxz"),
+        ("3", "dt"),
+        ("4", "l"),
+        ("5", "mn"),
+        ("6", "r"),
+    )
+    for letter in letters
+}
+
+
+def soundex(word):
+    """Return the four character Soundex code of `word`, or "" if it has no
+    letters.
+    """
+    letters = [char for char in word.lower() if char.isalpha()]
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    last = SOUNDEX_CODES.get(letters[0])
+    for letter in letters[1:]:
+        digit = SOUNDEX_CODES.get(letter)
+        if digit is not None and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        # Letters with the same code separated by h or w are coded once.
+        if letter not in "hw":
+            last = digit
+    return code.ljust(4, "0")
+
+
+class DatabaseHeadwords:
+    """The headwords of one database, sorted by the key dictd compares them
+    by, with the structures each strategy needs built on first use.
+    """
+
+    def __init__(self, words):
+        pairs = sorted({(fold(word), word) for word in words})
+        self.keys = [key for key, _ in pairs]
+        self.words = [word for _, word in pairs]
+        self._suffixes = None
+        self._joined = None
+        self._starts = None
+        self._soundex = None
+
+    def _range(self, keys, prefix):
+        lo = bisect.bisect_left(keys, prefix)
+        return lo, bisect.bisect_left(keys, prefix + MAX_CHAR, lo)
+
+    def exact(self, key):
+        lo = bisect.bisect_left(self.keys, key)
+        return range(lo, bisect.bisect_right(self.keys, key, lo))
+
+    def prefix(self, key):
+        return range(*self._range(self.keys, key))
+
+    def suffix(self, key):
+        # The reversed keys, sorted, and the index of the key each came from.
+        if self._suffixes is None:
+            pairs = sorted((key[::-1], i) for i, key in enumerate(self.keys))
+            self._suffixes = [pair[0] for pair in pairs], [pair[1] for pair in pairs]
+        reversed_keys, indexes = self._suffixes
+        lo, hi = self._range(reversed_keys, key[::-1])
+        return sorted(indexes[lo:hi])
+
+    def substring(self, key):
+        # Search all the keys at once, one per line, and map each hit back
+        # to the key it falls in.
+        if self._joined is None:
+            self._joined = "\n".join(self.keys)
+            self._starts = []
+            start = 0
+            for headword_key in self.keys:
+                self._starts.append(start)
+                start += len(headword_key) + 1
+        if not key:
+            return range(len(self.keys))
+        if "\n" in key:
+            return []
+        found = []
+        pos = self._joined.find(key)
+        while pos != -1:
+            i = bisect.bisect_right(self._starts, pos) - 1
+            found.append(i)
+            pos = self._joined.find(key, self._starts[i] + len(self.keys[i]))
+        return found
+
+    def lev(self, key, max_distance=1):
+        """Find the keys within `max_distance` edits of `key`.
+
+        The sorted keys are walked as a trie, a node being the range of keys
+        sharing a prefix, while a row of the Levenshtein table is carried
+        down each path; a branch is abandoned once every entry of its row
+        exceeds `max_distance`.
+        """
+        found = []
+        stack = [("", 0, len(self.keys), list(range(len(key) + 1)))]
+        while stack:
+            prefix, lo, hi, row = stack.pop()
+            depth = len(prefix)
+            i = lo
+            while i < hi:
+                child_key = self.keys[i]
+                if len(child_key) == depth:
+                    if row[-1] <= max_distance:
+                        found.append(i)
+                    i += 1
+                    continue
+                char = child_key[depth]
+                child_prefix = prefix + char
+                end = bisect.bisect_left(self.keys, child_prefix + MAX_CHAR, i, hi)
+                child_row = [row[0] + 1]
+                for column, query_char in enumerate(key, 1):
+                    child_row.append(
+                        min(
+                            child_row[column - 1] + 1,
+                            row[column] + 1,
+                            row[column - 1] + (query_char != char),
+                        )
+                    )
+                if min(child_row) <= max_distance:
+                    stack.append((child_prefix, i, end, child_row))
+                i = end
+        return sorted(found)
+
+    def soundex(self, word):
+        if self._soundex is None:
+            self._soundex = defaultdict(list)
+            for i, headword in enumerate(self.words):
+                self._soundex[soundex(headword)].append(i)
+        return self._soundex.get(soundex(word), [])
+
+    def match(self, word, strategy):
+        if strategy == "soundex":
+            indexes = self.soundex(word)
+        else:
+            indexes = getattr(self, strategy)(fold(word))
+        return list(dict.fromkeys(self.words[i] for i in indexes))
+
+
+class HeadwordIndex:
+    """An in-memory index of the headwords of some databases, which answers
+    MATCH for them without a server.
+
+    Populate it from a LocalDictionary, the output of a crawl, or a server,
+    and pass it to DictionaryClient as `headword_index` to answer MATCH
+    with any of `INDEX_STRATEGIES` for its databases locally.
+
+    A database is only "in" the index once all of its headwords are known to
+    have been added. The client sends MATCH for the others to the server, as
+    an incomplete index would report words it is missing as not found.
+    """
+
+    strategies = INDEX_STRATEGIES
+
+    def __init__(self, databases=None):
+        self._databases = {}
+        self._complete = set()
+        for db, words in (databases or {}).items():
+            self.add(db, words)
+
+    def add(self, db, words, complete=True):
+        """Index `words` as the headwords of `db`, replacing any before.
+        Pass `complete=False` if they may not be all of its headwords.
+        """
+        self._databases[db] = DatabaseHeadwords(words)
+        if complete:
+            self._complete.add(db)
+        else:
+            self._complete.discard(db)
+
+    @property
+    def databases(self):
+        return list(self._databases)
+
+    def __contains__(self, db):
+        return db in self._complete
+
+    @classmethod
+    def from_local(cls, local):
+        """Index the databases of a LocalDictionary."""
+        return cls({name: local[name].headwords() for name in local.databases})
+
+    @classmethod
+    def from_crawl(cls, path, complete=True):
+        """Index the databases in the JSON lines output of a crawl. Pass
+        `complete=False` if the crawl may have missed headwords, e.g. if it
+        reported failures.
+        """
+        opener = gzip.open if path.endswith(".gz") else open
+        words = defaultdict(list)
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                words[record["db"]].append(record["word"])
+        index = cls()
+        for db, db_words in words.items():
+            index.add(db, db_words, complete)
+        return index
+
+    def populate(self, client, db, prefixes=None):
+        """Index the headwords of `db` on the server `client` is connected
+        to, found by pipelining a prefix MATCH for each of `prefixes`.
+
+        By default the prefixes are the lower case letters and digits,
+        followed by a regular expression MATCH for the words beginning with
+        anything else, so that the index is complete. If the server has no
+        "re" strategy, or other `prefixes` are given, the headwords are
+        indexed but the database is not marked complete.
+        """
+        complete = prefixes is None and "re" in (client.strategies or {})
+        if prefixes is None:
+            prefixes = make_prefixes()
+        words = {}
+        for response in client.match_many(prefixes, db=db, strategy="prefix"):
+            words.update(dict.fromkeys(match.word for match in response.iter_matches()))
+        if complete:
+            response = client.match(remainder_pattern(), db=db, strategy="re")
+            words.update(dict.fromkeys(match.word for match in response.iter_matches()))
+        self.add(db, words, complete)
+
+    def match(self, word, db="*", strategy="exact"):
+        if strategy not in INDEX_STRATEGIES:
+            raise ValueError(f'Unknown strategy: "{strategy}".')
+        if db == "*":
+            selected = self._databases.items()
+        elif db in self._databases:
+            selected = [(db, self._databases[db])]
+        else:
+            raise ValueError(f'Invalid database name: "{db}" not present.')
+        matches = defaultdict(list)
+        for name, headwords in selected:
+            words = headwords.match(word, strategy)
+            if words:
+                matches[name] = words
+        if not matches:
+            return MatchResponse.from_content(DictStatusCode.NO_MATCH, None)
+        return MatchResponse.from_content(DictStatusCode.MATCHES_FOUND, matches)
@@ -0,0 +1,131 @@
+import bisect
+import threading
+from collections import defaultdict
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+def command_name(command):
+    """The name of an encoded command, e.g. "DEFINE" or "SHOW DB"."""
+    words = command.split(maxsplit=2)
+    if words[0] == b"SHOW" and len(words) > 1:
+        return f"SHOW {words[1].decode()}"
+    return words[0].decode()
+
+
+class Instrumentation:
+    """Hooks called by a DictionaryClient created with `instrumentation=`.
+
+    Subclasses override the hooks they need; the defaults do nothing. A client
+    without instrumentation does not call any hooks or read any clocks.
+
+    `timings` passed to `on_response_parsed` maps phases to seconds:
+    "send", "wait" (blocked waiting for data), "receive", "parse" and "total".
+    Pipelined commands only report "total", measured from when their batch
+    was sent. So do the responses of `define_iter` and `match_iter`, measured
+    until the iterator finishes, and passed as a PreliminaryResponse of their
+    status lines.
+    """
+
+    def on_connect(self, host, port, elapsed):
+        pass
+
+    def on_command_start(self, command):
+        pass
+
+    def on_bytes_received(self, n_bytes):
+        pass
+
+    def on_response_parsed(self, command, response, timings):
+        pass
+
+
+class Histogram:
+    """A cumulative histogram, as used by Prometheus."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        total = 0
+        for upper_bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield upper_bound, total
+
+
+def format_labels(labels):
+    return ",".join(f'{key}="{value}"' for key, value in labels)
+
+
+class MetricsInstrumentation(Instrumentation):
+    """Collects per-command timing histograms, response status counts, bytes
+    received and the timing statistics that dictd reports on its final status
+    lines, and renders them in the OpenMetrics text format, which Prometheus
+    can scrape.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix="dict_client"):
+        self.buckets = buckets
+        self.prefix = prefix
+        self.histograms = defaultdict(lambda: Histogram(self.buckets))
+        self.responses = defaultdict(int)
+        self.server_counts = defaultdict(int)
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+
+    def on_connect(self, host, port, elapsed):
+        with self._lock:
+            self.histograms[("CONNECT", "total")].observe(elapsed)
+
+    def on_bytes_received(self, n_bytes):
+        with self._lock:
+            self.bytes_received += n_bytes
+
+    def on_response_parsed(self, command, response, timings):
+        stats = response.server_stats
+        with self._lock:
+            for phase, seconds in timings.items():
+                self.histograms[(command, phase)].observe(seconds)
+            self.responses[(command, response.status_code)] += 1
+            if stats is not None:
+                self.histograms[(command, "server")].observe(stats.real)
+                self.server_counts["defines"] += stats.defines
+                self.server_counts["matches"] += stats.matches
+                self.server_counts["comparisons"] += stats.comparisons
+
+    def openmetrics(self):
+        """Render the collected metrics in the OpenMetrics text format."""
+        name = f"{self.prefix}_command_seconds"
+        lines = [f"# TYPE {name} histogram", f"# UNIT {name} seconds"]
+        with self._lock:
+            for (command, phase), histogram in sorted(self.histograms.items()):
+                labels = (("command", command), ("phase", phase))
+                for upper_bound, count in histogram.cumulative_counts():
+                    le = "+Inf" if upper_bound == float("inf") else upper_bound
+                    bucket_labels = format_labels(labels + (("le", le),))
+                    lines.append(f"{name}_bucket{{{bucket_labels}}} {count}")
+                labels = format_labels(labels)
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+            name = f"{self.prefix}_responses"
+            lines.append(f"# TYPE {name} counter")
+            for (command, status), count in sorted(self.responses.items()):
+                labels = format_labels((("command", command), ("status", status)))
+                lines.append(f"{name}_total{{{labels}}} {count}")
+            name = f"{self.prefix}_received_bytes"
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}_total {self.bytes_received}")
+            name = f"{self.prefix}_server_operations"
+            lines.append(f"# TYPE {name} counter")
+            for operation, count in sorted(self.server_counts.items()):
+                lines.append(f'{name}_total{{operation="{operation}"}} {count}')
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
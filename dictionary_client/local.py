@@ -0,0 +1,329 @@
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict, defaultdict
+
+from .response import (
+    DatabaseInfoResponse,
+    DefineWordResponse,
+    Definition,
+    MatchResponse,
+)
+from .status_codes import DictStatusCode
+
+B64_DIGITS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+B64_VALUES = {digit: value for value, digit in enumerate(B64_DIGITS)}
+
+# Entries describing the database itself, which dictd hides from lookups.
+HIDDEN_PREFIXES = ("00-database-", "00database")
+
+GZIP_MAGIC = b"\x1f\x8b"
+FEXTRA, FNAME, FCOMMENT, FHCRC = 4, 8, 16, 2
+CHUNK_CACHE_SIZE = 64
+
+LOCAL_STRATEGIES = {
+    "exact": "Match headwords exactly",
+    "prefix": "Match prefixes",
+}
+DEFAULT_STRATEGY = "exact"
+
+
+def decode_number(text):
+    """Decode an offset or length from a dictd index, which are written in
+    base 64, most significant digit first.
+    """
+    value = 0
+    for digit in text:
+        value = value * 64 + B64_VALUES[digit]
+    return value
+
+
+def fold(word):
+    """Return the key dictd sorts and compares headwords by: lower case, and
+    only letters, digits and spaces.
+    """
+    word = word.lower()
+    if word.isalnum():
+        return word
+    return "".join(char for char in word if char.isalnum() or char.isspace())
+
+
+class DictzipFile:
+    """Random access to the uncompressed contents of a dictzip file.
+
+    A dictzip file is a gzip file whose deflate stream is flushed every
+    `chunk_length` bytes of input, with the compressed size of each chunk
+    stored in an "RA" extra field of the gzip header, so any chunk can be
+    inflated on its own. Recently inflated chunks are kept in an LRU cache.
+    """
+
+    def __init__(self, path, chunk_cache_size=CHUNK_CACHE_SIZE):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.chunk_cache_size = chunk_cache_size
+        self._chunks = OrderedDict()
+        self._lock = threading.Lock()
+        self._parse_header()
+
+    def _parse_header(self):
+        data = self._map
+        if data[:2] != GZIP_MAGIC:
+            raise ValueError("Not a gzip file.")
+        flags = data[3]
+        if not flags & FEXTRA:
+            raise ValueError("Not a dictzip file: the gzip header has no extra field.")
+        (extra_length,) = struct.unpack_from("<H", data, 10)
+        pos = 12
+        extra_end = pos + extra_length
+        chunk_sizes = None
+        while pos < extra_end:
+            subfield_id = data[pos : pos + 2]
+            (subfield_length,) = struct.unpack_from("<H", data, pos + 2)
+            if subfield_id == b"RA":
+                _, self.chunk_length, count = struct.unpack_from("<HHH", data, pos + 4)
+                chunk_sizes = struct.unpack_from(f"<{count}H", data, pos + 10)
+            pos += 4 + subfield_length
+        if chunk_sizes is None:
+            raise ValueError("Not a dictzip file: the gzip header has no RA field.")
+        for flag in (FNAME, FCOMMENT):
+            if flags & flag:
+                pos = data.find(b"\0", pos) + 1
+        if flags & FHCRC:
+            pos += 2
+        self._chunk_offsets = [pos]
+        for size in chunk_sizes:
+            self._chunk_offsets.append(self._chunk_offsets[-1] + size)
+
+    def _chunk(self, index):
+        with self._lock:
+            chunk = self._chunks.get(index)
+            if chunk is not None:
+                self._chunks.move_to_end(index)
+                return chunk
+        start, end = self._chunk_offsets[index], self._chunk_offsets[index + 1]
+        chunk = zlib.decompressobj(-zlib.MAX_WBITS).decompress(self._map[start:end])
+        with self._lock:
+            self._chunks[index] = chunk
+            if len(self._chunks) > self.chunk_cache_size:
+                self._chunks.popitem(last=False)
+        return chunk
+
+    def read(self, offset, length):
+        first = offset // self.chunk_length
+        last = (offset + length - 1) // self.chunk_length
+        data = b"".join(self._chunk(index) for index in range(first, last + 1))
+        start = offset - first * self.chunk_length
+        return data[start : start + length]
+
+    def close(self):
+        self._map.close()
+
+
+class PlainDictFile:
+    """Random access to an uncompressed .dict file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read(self, offset, length):
+        return self._map[offset : offset + length]
+
+    def close(self):
+        self._map.close()
+
+
+class LocalDatabase:
+    """A dictd database read directly from its files: `path` is the name of
+    the .index file without its extension, and the entries are read from the
+    .dict.dz or .dict file next to it.
+
+    The index is memory-mapped and searched by bisection, comparing
+    headwords the way dictd sorts them.
+    """
+
+    def __init__(self, path, name=None, chunk_cache_size=CHUNK_CACHE_SIZE):
+        self.name = name or os.path.basename(path)
+        with open(f"{path}.index", "rb") as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if os.path.exists(f"{path}.dict.dz"):
+            self._data = DictzipFile(f"{path}.dict.dz", chunk_cache_size)
+        else:
+            self._data = PlainDictFile(f"{path}.dict")
+        self.allchars = self._has_entry("00-database-allchars")
+        self.encoding = "utf-8" if self._has_entry("00-database-utf8") else "latin-1"
+        self.description = self._database_text("00-database-short") or self.name
+        self.info = self._database_text("00-database-info")
+
+    def _has_entry(self, headword):
+        line = f"{headword}\t".encode()
+        return self._index[: len(line)] == line or self._index.find(b"\n" + line) != -1
+
+    def _database_text(self, headword):
+        entries = self.lookup(headword, hidden=True)
+        if not entries:
+            return None
+        lines = self.read(*entries[0][1:]).strip().splitlines()
+        # The text usually repeats the headword on its first line.
+        if len(lines) > 1 and self.key(lines[0]) == self.key(headword):
+            lines = lines[1:]
+        return "\n".join(line.strip() for line in lines)
+
+    def key(self, word):
+        if self.allchars:
+            return word.lower()
+        return fold(word)
+
+    def _line(self, start):
+        end = self._index.find(b"\n", start)
+        if end == -1:
+            end = len(self._index)
+        return self._index[start:end].decode(self.encoding), end + 1
+
+    def _bisect(self, key):
+        """Return the offset of the first index line whose headword's key is
+        not less than `key`.
+        """
+        lo, hi = 0, len(self._index)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self._index.rfind(b"\n", 0, mid) + 1
+            line, end = self._line(start)
+            if self.key(line.partition("\t")[0]) < key:
+                lo = end
+            else:
+                hi = start
+        return lo
+
+    def _scan(self, key, matches, hidden=False):
+        """Yield (headword, offset, length) for the index lines from the
+        first with a key of at least `key`, while `matches(line_key)` holds.
+        """
+        pos = self._bisect(key)
+        while pos < len(self._index):
+            line, pos = self._line(pos)
+            headword, offset, length = line.rstrip("\r").split("\t")[:3]
+            if not matches(self.key(headword)):
+                return
+            if hidden or not headword.startswith(HIDDEN_PREFIXES):
+                yield headword, decode_number(offset), decode_number(length)
+
+    def lookup(self, word, hidden=False):
+        """Return (headword, offset, length) for each entry for `word`."""
+        key = self.key(word)
+        return list(self._scan(key, key.__eq__, hidden))
+
+    def match(self, word, strategy=DEFAULT_STRATEGY):
+        """Return the distinct headwords matching `word` with `strategy`."""
+        key = self.key(word)
+        if strategy == "exact":
+            entries = self._scan(key, key.__eq__)
+        elif strategy == "prefix":
+            entries = self._scan(key, lambda line_key: line_key.startswith(key))
+        else:
+            raise ValueError(f'Unknown strategy: "{strategy}".')
+        return list(dict.fromkeys(headword for headword, _, _ in entries))
+
+    def headwords(self):
+        """Yield every headword in the index, except the hidden ones."""
+        pos = 0
+        while pos < len(self._index):
+            line, pos = self._line(pos)
+            headword = line.partition("\t")[0]
+            if headword and not headword.startswith(HIDDEN_PREFIXES):
+                yield headword
+
+    def read(self, offset, length):
+        return self._data.read(offset, length).decode(self.encoding, "replace")
+
+    def define(self, word):
+        """Return a Definition for each entry for `word`."""
+        definitions = []
+        for headword, offset, length in self.lookup(word):
+            text = self.read(offset, length)
+            if text.endswith("\n"):
+                text = text[:-1]
+            definitions.append(Definition(headword, self.name, self.description, text))
+        return definitions
+
+    def close(self):
+        self._index.close()
+        self._data.close()
+
+
+class LocalDictionary:
+    """Serves DEFINE and MATCH for dictd databases stored on local disk,
+    returning the same responses as DictionaryClient, without a server.
+
+    `databases` maps each database name to the path of its files without
+    extensions (or to a LocalDatabase). Pass a LocalDictionary to
+    DictionaryClient as `local` to answer commands for its databases
+    in-process and send the others to the server.
+    """
+
+    def __init__(self, databases, chunk_cache_size=CHUNK_CACHE_SIZE):
+        self._databases = {
+            name: (
+                database
+                if isinstance(database, LocalDatabase)
+                else LocalDatabase(database, name, chunk_cache_size)
+            )
+            for name, database in databases.items()
+        }
+
+    @property
+    def databases(self):
+        return {name: db.description for name, db in self._databases.items()}
+
+    @property
+    def strategies(self):
+        return dict(LOCAL_STRATEGIES)
+
+    def __contains__(self, db):
+        return db in self._databases
+
+    def __getitem__(self, db):
+        return self._databases[db]
+
+    def _selected(self, db):
+        if db == "*":
+            return self._databases.values()
+        if db not in self._databases:
+            raise ValueError(f'Invalid database name: "{db}" not present.')
+        return [self._databases[db]]
+
+    def define(self, word, db="*"):
+        definitions = []
+        for database in self._selected(db):
+            definitions.extend(database.define(word))
+        if not definitions:
+            return DefineWordResponse.from_content(DictStatusCode.NO_MATCH, None)
+        return DefineWordResponse.from_content(
+            DictStatusCode.DEFINITIONS_FOLLOW, definitions
+        )
+
+    def match(self, word, db="*", strategy="."):
+        if strategy == ".":
+            strategy = DEFAULT_STRATEGY
+        if strategy not in LOCAL_STRATEGIES:
+            raise ValueError(f'Unknown strategy: "{strategy}".')
+        matches = defaultdict(list)
+        for database in self._selected(db):
+            words = database.match(word, strategy)
+            if words:
+                matches[database.name].extend(words)
+        if not matches:
+            return MatchResponse.from_content(DictStatusCode.NO_MATCH, None)
+        return MatchResponse.from_content(DictStatusCode.MATCHES_FOUND, matches)
+
+    def get_db_info(self, db):
+        (database,) = self._selected(db)
+        return DatabaseInfoResponse.from_content(
+            DictStatusCode.DB_INFO_FOLLOWS, database.info or database.description
+        )
+
+    def close(self):
+        for database in self._databases.values():
+            database.close()
@@ -0,0 +1,69 @@
+import threading
+import time
+from types import MappingProxyType
+
+from .status_codes import DictStatusCode
+
+DEFAULT_METADATA_TTL = 300
+CACHEABLE_STATUS_CODES = {
+    DictStatusCode.DATABASES_PRESENT,
+    DictStatusCode.STRATEGIES_AVAILABLE,
+    DictStatusCode.NO_DATABASES,
+    DictStatusCode.NO_STRATEGIES,
+}
+
+
+class ServerMetadataCache:
+    """Caches the databases and strategies of each server, keyed by host and
+    port, so that every client of a server shares one SHOW DB and one SHOW
+    STRAT per `ttl` seconds (or forever, if `ttl` is None).
+
+    Values are read-only mappings, since they are shared. A server that has no
+    databases or strategies (status 554 or 555) gets an empty mapping, which
+    is cached like any other answer. Any other failure, such as 530 or 420,
+    raises ValueError and is not cached.
+    """
+
+    def __init__(self, ttl=DEFAULT_METADATA_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, host, port, name):
+        """Return the cached mapping, or None if it is missing or expired."""
+        entry = self._entries.get((host, port, name))
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            return None
+        return value
+
+    def set(self, host, port, name, response):
+        """Cache the content of a SHOW DB or SHOW STRAT response, and return
+        the mapping stored for it.
+        """
+        if response.status_code not in CACHEABLE_STATUS_CODES:
+            status_line = response.response_bytes.split(b"\r\n", 1)[0].decode()
+            raise ValueError(
+                f'Client got unexpected response for {name}: "{status_line}"'
+            )
+        value = MappingProxyType(dict(response.content or {}))
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[(host, port, name)] = (value, expires_at)
+        return value
+
+    def invalidate(self, host, port):
+        """Forget everything cached for the server at `host` and `port`."""
+        with self._lock:
+            for key in [key for key in self._entries if key[:2] == (host, port)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# The cache used by clients that are not given one of their own.
+shared_metadata = ServerMetadataCache()
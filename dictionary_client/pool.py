@@ -0,0 +1,275 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from .cache import ResultCache
+from .dictionary_client import DEFAULT_PORT, DictionaryClient
+from .singleflight import SingleFlight
+from .status_codes import DictStatusCode
+from .word import Word
+
+# Replies after which the server closes the connection.
+UNAVAILABLE_STATUS_CODES = {
+    DictStatusCode.SERVER_TEMP_UNAVAILABLE,
+    DictStatusCode.SERVER_SHUTDOWN,
+}
+
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no pooled client became available in time."""
+
+
+class DictionaryClientPool:
+    """A thread-safe pool of connected DictionaryClients.
+
+    Clients are created on demand up to `max_size`, and at least `min_size`
+    are kept open. A client that has been idle for longer than
+    `health_check_interval` seconds is checked with a STATUS command before it
+    is handed out again, and is transparently replaced if the check fails
+    (e.g. with 421 when the server is shutting down). Clients used more
+    recently are handed out unchecked. Idle clients beyond `min_size` are
+    closed after `idle_timeout` seconds.
+
+    A client whose command through `define` or `match` gets a 420 or 421
+    reply is discarded, and the command is sent once more on a new
+    connection.
+
+    With `coalesce=True`, concurrent calls to `define` or `match` with the
+    same arguments send one command and share its response; pass a
+    SingleFlight instead to coalesce calls across several pools.
+
+        pool = DictionaryClientPool("dict.org", max_size=4)
+        with pool.connection() as client:
+            client.define("table")
+    """
+
+    def __init__(
+        self,
+        host="localhost",
+        port=DEFAULT_PORT,
+        min_size=0,
+        max_size=8,
+        idle_timeout=300,
+        health_check_interval=5,
+        client_class=DictionaryClient,
+        coalesce=False,
+        **client_kwargs,
+    ):
+        if max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size.")
+        self.host = host
+        self.port = port
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.client_class = client_class
+        self.client_kwargs = client_kwargs
+        if coalesce is True:
+            coalesce = SingleFlight()
+        self.single_flight = coalesce or None
+        self.closed = False
+        self._idle = deque()
+        self._size = 0
+        self._condition = threading.Condition()
+        self._executor = None
+        for _ in range(min_size):
+            self._idle.append((self._create_client(), time.monotonic()))
+            self._size += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def size(self):
+        return self._size
+
+    def _create_client(self):
+        return self.client_class(self.host, self.port, **self.client_kwargs)
+
+    def _close_client(self, client):
+        try:
+            client.disconnect()
+        except (OSError, ValueError):
+            client.sock.close()
+
+    def _is_healthy(self, client):
+        try:
+            response = client.get_server_status()
+        except (OSError, ValueError):
+            return False
+        return response.status_code == DictStatusCode.STATUS_FOLLOWS
+
+    def _take_expired(self):
+        """Remove and return idle clients that have outlived `idle_timeout`.
+        Must be called with the lock held.
+        """
+        expired = []
+        now = time.monotonic()
+        # The oldest clients are at the left of the deque.
+        while (
+            self._idle
+            and self._size > self.min_size
+            and now - self._idle[0][1] > self.idle_timeout
+        ):
+            expired.append(self._idle.popleft()[0])
+            self._size -= 1
+        return expired
+
+    def reap(self):
+        """Close clients that have been idle for longer than `idle_timeout`."""
+        with self._condition:
+            expired = self._take_expired()
+        for client in expired:
+            self._close_client(client)
+
+    def checkout(self, timeout=None):
+        """Take a client from the pool, waiting up to `timeout` seconds for
+        one to become available if the pool is at `max_size`.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        client = idle_since = None
+        with self._condition:
+            while True:
+                if self.closed:
+                    raise RuntimeError("Cannot check out a client from a closed pool.")
+                expired = self._take_expired()
+                if self._idle:
+                    client, idle_since = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise PoolTimeoutError("Timed out waiting for a pooled client.")
+                self._condition.wait(remaining)
+        for expired_client in expired:
+            self._close_client(expired_client)
+        if client is not None:
+            idle_for = time.monotonic() - idle_since
+            if idle_for <= self.health_check_interval or self._is_healthy(client):
+                return client
+            client.sock.close()
+        try:
+            return self._create_client()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def checkin(self, client, discard=False):
+        """Return a client to the pool. Pass `discard=True` if the client's
+        connection may be in an unknown state, e.g. after an exception.
+        """
+        with self._condition:
+            if discard or self.closed:
+                self._size -= 1
+            else:
+                self._idle.append((client, time.monotonic()))
+            self._condition.notify()
+        if discard:
+            client.sock.close()
+        elif self.closed:
+            self._close_client(client)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        client = self.checkout(timeout)
+        try:
+            yield client
+        except BaseException:
+            self.checkin(client, discard=True)
+            raise
+        self.checkin(client)
+
+    def _send_command(self, name, *args):
+        for _ in range(2):
+            client = self.checkout()
+            try:
+                response = getattr(client, name)(*args)
+            except ValueError:
+                # Usually an invalid argument, found before the command was
+                # sent; otherwise the reply could not be parsed, and any of it
+                # left unread means the connection can not be reused.
+                self.checkin(client, discard=client.has_pending_reply())
+                raise
+            except BaseException:
+                self.checkin(client, discard=True)
+                raise
+            # The server closes the connection after a 420 or 421 reply.
+            unavailable = response.status_code in UNAVAILABLE_STATUS_CODES
+            self.checkin(client, discard=unavailable)
+            if not unavailable:
+                break
+        return response
+
+    def _define(self, word_raw, db):
+        return self._send_command("define", word_raw, db)
+
+    def _match(self, word_raw, db, strategy):
+        return self._send_command("match", word_raw, db, strategy)
+
+    def define(self, word_raw, db="*"):
+        """Define `word_raw` on a pooled connection."""
+        if self.single_flight is None:
+            return self._define(word_raw, db)
+        key = (self.host, self.port) + ResultCache.make_key(
+            "DEFINE", Word(word_raw), db
+        )
+        return self.single_flight.do(key, self._define, word_raw, db)
+
+    def match(self, word_raw, db="*", strategy="."):
+        """Match `word_raw` on a pooled connection."""
+        if self.single_flight is None:
+            return self._match(word_raw, db, strategy)
+        key = (self.host, self.port) + ResultCache.make_key(
+            "MATCH", Word(word_raw), db, strategy
+        )
+        return self.single_flight.do(key, self._match, word_raw, db, strategy)
+
+    def define_multi(self, word_raw, dbs, first_hit=False):
+        """Define `word_raw` in each of `dbs` concurrently, each on its own
+        pooled connection, and return a dict of responses by database in the
+        order of `dbs`.
+
+        With `first_hit=True`, return as soon as the first database (in the
+        order of `dbs`) with a definition of the word has answered, along with
+        the databases before it. Lookups that have not started are cancelled.
+        """
+        with self._condition:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.max_size, thread_name_prefix="DictionaryClientPool"
+                )
+        futures = [self._executor.submit(self.define, word_raw, db) for db in dbs]
+        results = {}
+        for i, (db, future) in enumerate(zip(dbs, futures)):
+            response = results[db] = future.result()
+            if first_hit and response.status_code == DictStatusCode.DEFINITIONS_FOLLOW:
+                for pending in futures[i + 1 :]:
+                    pending.cancel()
+                break
+        return results
+
+    def close(self):
+        """Close idle clients. Clients still checked out are closed when they
+        are checked in.
+        """
+        with self._condition:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self.closed = True
+            idle = [client for client, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for client in idle:
+            self._close_client(client)
@@ -0,0 +1,32 @@
+"""Partitioning a database's headwords by prefix, for crawling and indexing
+them with MATCH.
+"""
+import itertools
+import string
+
+DEFAULT_ALPHABET = string.ascii_lowercase + string.digits
+
+
+def make_prefixes(alphabet=DEFAULT_ALPHABET, length=1):
+    """Return every prefix of `length` characters from `alphabet`."""
+    return ["".join(chars) for chars in itertools.product(alphabet, repeat=length)]
+
+
+def remainder_pattern(alphabet=DEFAULT_ALPHABET, length=1):
+    """Return a POSIX extended regular expression, for the "re" MATCH
+    strategy, matching the words that `make_prefixes(alphabet, length)` does
+    not cover: those shorter than `length`, or with a character outside
+    `alphabet` in their first `length` characters. Upper case letters count
+    as in `alphabet`, as dictd matches prefixes case insensitively.
+    """
+    chars = set(alphabet) | set(alphabet.upper())
+    # In a bracket expression "]" must come first, and "-" last.
+    special = [char for char in "]-" if char in chars]
+    chars = "".join(sorted(chars - set(special)))
+    if special[:1] == ["]"]:
+        chars = "]" + chars
+    if "-" in special:
+        chars += "-"
+    if length == 1:
+        return f"^[^{chars}]"
+    return f"^.{{0,{length - 1}}}($|[^{chars}])"
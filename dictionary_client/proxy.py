@@ -0,0 +1,374 @@
+"""A caching DICT proxy, to sit in front of a dictd server.
+
+    $ python -m dictionary_client.proxy --upstream-host dict.internal --port 2628
+
+Clients speak RFC 2229 to the proxy as they would to dictd. DEFINE, MATCH,
+SHOW and HELP replies are cached, with LRU eviction and TTLs, and misses are
+forwarded over a small pool of persistent upstream connections, with
+concurrent identical misses sharing one upstream command. STATUS is always
+forwarded. Commands that change the state of a session (OPTION, AUTH and
+SASLAUTH) are not supported, since upstream connections are shared.
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import socket
+import sys
+
+from .async_client import AsyncDictionaryClient
+from .cache import CACHEABLE_STATUS_CODES, ResultCache
+from .commands import (
+    define_word_command,
+    help_command,
+    match_command,
+    show_databases_command,
+    show_info_command,
+    show_server_command,
+    show_strategies_command,
+    status_command,
+)
+from .dictionary_client import DEFAULT_PORT
+from .response import (
+    DatabaseInfoResponse,
+    DefineWordResponse,
+    MatchResponse,
+    MultiLineResponse,
+    ServerPropertiesResponse,
+)
+from .singleflight import AsyncSingleFlight
+from .status_codes import DictStatusCode
+from .word import ATOM, Word
+
+DEFAULT_CONNECTIONS = 4
+MAX_LINE_LENGTH = 1024
+
+OK = b"250 ok\r\n"
+BYE = b"221 bye\r\n"
+NOT_RECOGNIZED = b"500 Syntax error, command not recognized\r\n"
+ILLEGAL_PARAMS = b"501 Syntax error, illegal parameters\r\n"
+NOT_IMPLEMENTED = b"502 Command not implemented\r\n"
+UNAVAILABLE = b"420 Server temporarily unavailable\r\n"
+# Commands which change the state of a session.
+SESSION_COMMANDS = {"OPTION", "AUTH", "SASLAUTH", "SASLRESP"}
+
+
+def split_command(line):
+    """Split a command line into its arguments, removing the quotes and
+    backslash escapes described in RFC 2229 section 2.2.
+    """
+    args = []
+    arg = None
+    quote = None
+    chars = iter(line)
+    for char in chars:
+        if char == "\\":
+            arg = (arg or "") + next(chars, "")
+        elif quote is not None:
+            if char == quote:
+                quote = None
+            else:
+                arg += char
+        elif char in "\"'":
+            quote = char
+            arg = arg or ""
+        elif char in " \t":
+            if arg is not None:
+                args.append(arg)
+                arg = None
+        else:
+            arg = (arg or "") + char
+    if quote is not None:
+        raise ValueError("Unterminated quoted string.")
+    if arg is not None:
+        args.append(arg)
+    return args
+
+
+class ProxyCache(ResultCache):
+    """A ResultCache which also keeps the replies to SHOW and HELP."""
+
+    cacheable_status_codes = CACHEABLE_STATUS_CODES | {
+        DictStatusCode.DATABASES_PRESENT,
+        DictStatusCode.STRATEGIES_AVAILABLE,
+        DictStatusCode.DB_INFO_FOLLOWS,
+        DictStatusCode.HELP_TEXT_FOLLOWS,
+        DictStatusCode.SERVER_INFO_FOLLOWS,
+        DictStatusCode.NO_DATABASES,
+        DictStatusCode.NO_STRATEGIES,
+    }
+
+
+class UpstreamPool:
+    """A fixed number of persistent connections to the upstream server, each
+    opened when it is first needed.
+    """
+
+    def __init__(self, host, port, size=DEFAULT_CONNECTIONS, timeout=5):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.commands = 0
+        self._clients = asyncio.Queue()
+        for _ in range(size):
+            self._clients.put_nowait(self._create_client())
+
+    def _create_client(self):
+        return AsyncDictionaryClient(self.host, self.port, self.timeout)
+
+    async def send(self, command):
+        """Send `command` on one of the connections and return the raw
+        response. A failed connection is replaced, and the command is tried
+        once more on a new connection, as dictd closes idle ones.
+        """
+        client = await self._clients.get()
+        try:
+            for attempt in range(2):
+                try:
+                    if client.writer is None:
+                        await client.connect()
+                    self.commands += 1
+                    return await client._send_and_receive(command)
+                except Exception as e:
+                    if client.writer is not None:
+                        client.writer.close()
+                    client = self._create_client()
+                    if attempt:
+                        raise ConnectionError(
+                            f"Upstream server {self.host}:{self.port} failed: {e!r}"
+                        ) from e
+        finally:
+            self._clients.put_nowait(client)
+
+    async def close(self):
+        while not self._clients.empty():
+            client = self._clients.get_nowait()
+            if client.writer is not None:
+                client.writer.close()
+
+
+class DictProxy:
+    """Serves DICT clients from a cache in front of the upstream server at
+    `upstream_host` and `upstream_port`.
+
+        proxy = DictProxy("dict.internal")
+        server = await proxy.start("localhost", 2628)
+    """
+
+    def __init__(
+        self,
+        upstream_host,
+        upstream_port=DEFAULT_PORT,
+        connections=DEFAULT_CONNECTIONS,
+        cache=None,
+        timeout=5,
+    ):
+        self.upstream = UpstreamPool(upstream_host, upstream_port, connections, timeout)
+        self.cache = cache if cache is not None else ProxyCache()
+        self.single_flight = AsyncSingleFlight()
+        self.sessions = 0
+        self._message_ids = itertools.count()
+        self._hostname = socket.gethostname()
+
+    def stats(self):
+        """Return the cache hits, misses and evictions, the hit rate, and the
+        number of commands sent upstream.
+        """
+        stats = self.cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["upstream_commands"] = self.upstream.commands
+        stats["sessions"] = self.sessions
+        return stats
+
+    async def start(self, host="localhost", port=DEFAULT_PORT):
+        return await asyncio.start_server(
+            self.handle_session, host, port, limit=MAX_LINE_LENGTH * 4
+        )
+
+    async def close(self):
+        await self.upstream.close()
+
+    def banner(self):
+        message_id = f"<{os.getpid()}.{next(self._message_ids)}@{self._hostname}>"
+        return f"220 {self._hostname} dictionary_client.proxy <> {message_id}\r\n"
+
+    async def handle_session(self, reader, writer):
+        self.sessions += 1
+        try:
+            writer.write(self.banner().encode())
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(NOT_RECOGNIZED)
+                    break
+                if not line:
+                    break
+                reply = await self.reply(line)
+                writer.write(reply)
+                await writer.drain()
+                if reply is BYE:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def reply(self, line):
+        """Return the reply to the command `line`, as bytes."""
+        try:
+            args = split_command(line.decode("utf-8").rstrip("\r\n"))
+        except ValueError:
+            return ILLEGAL_PARAMS
+        if not args:
+            return NOT_RECOGNIZED
+        name = args[0].upper()
+        try:
+            if name == "DEFINE" and len(args) == 3:
+                return await self._define(*args[1:])
+            if name == "MATCH" and len(args) == 4:
+                return await self._match(*args[1:])
+            if name == "SHOW" and len(args) > 1:
+                return await self._show(args[1].upper(), args[2:])
+            if name == "HELP":
+                return await self._cached(("HELP",), help_command(), MultiLineResponse)
+            if name == "STATUS":
+                return await self.upstream.send(status_command())
+        except (ConnectionError, ValueError):
+            # ValueError if the upstream reply could not be parsed.
+            return UNAVAILABLE
+        if name == "CLIENT":
+            return OK
+        if name == "QUIT":
+            return BYE
+        if name in SESSION_COMMANDS:
+            return NOT_IMPLEMENTED
+        if name in ("DEFINE", "MATCH", "SHOW"):
+            return ILLEGAL_PARAMS
+        return NOT_RECOGNIZED
+
+    async def _define(self, db, word_raw):
+        if not ATOM.match(db):
+            return ILLEGAL_PARAMS
+        try:
+            word = Word(word_raw)
+        except ValueError:
+            return ILLEGAL_PARAMS
+        return await self._cached(
+            ResultCache.make_key("DEFINE", word, db),
+            define_word_command(word, db),
+            DefineWordResponse,
+        )
+
+    async def _match(self, db, strategy, word_raw):
+        if not (ATOM.match(db) and ATOM.match(strategy)):
+            return ILLEGAL_PARAMS
+        try:
+            word = Word(word_raw)
+        except ValueError:
+            return ILLEGAL_PARAMS
+        return await self._cached(
+            ResultCache.make_key("MATCH", word, db, strategy),
+            match_command(word, db=db, strategy=strategy),
+            MatchResponse,
+        )
+
+    async def _show(self, what, args):
+        if what in ("DB", "DATABASES") and not args:
+            return await self._cached(
+                ("SHOW", "DB"), show_databases_command(), ServerPropertiesResponse
+            )
+        if what in ("STRAT", "STRATEGIES") and not args:
+            return await self._cached(
+                ("SHOW", "STRAT"), show_strategies_command(), ServerPropertiesResponse
+            )
+        if what == "INFO" and len(args) == 1 and ATOM.match(args[0]):
+            return await self._cached(
+                ("SHOW", "INFO", args[0]),
+                show_info_command(args[0]),
+                DatabaseInfoResponse,
+            )
+        if what == "SERVER" and not args:
+            return await self._cached(
+                ("SHOW", "SERVER"), show_server_command(), MultiLineResponse
+            )
+        return ILLEGAL_PARAMS
+
+    async def _fetch(self, key, command, response_class):
+        response = response_class(await self.upstream.send(command))
+        self.cache.set(key, response)
+        return response
+
+    async def _cached(self, key, command, response_class):
+        response = self.cache.get(key)
+        if response is None:
+            response = await self.single_flight.do(
+                key, self._fetch, key, command, response_class
+            )
+        return response.response_bytes
+
+
+async def serve(proxy, host, port, stats_interval=None):
+    server = await proxy.start(host, port)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Proxying {addresses} to {proxy.upstream.host}", file=sys.stderr)
+    try:
+        async with server:
+            if stats_interval is None:
+                await server.serve_forever()
+            else:
+                while True:
+                    await asyncio.sleep(stats_interval)
+                    print(format_stats(proxy.stats()), file=sys.stderr)
+    finally:
+        await proxy.close()
+
+
+def format_stats(stats):
+    return (
+        f"hit rate {stats['hit_rate']:.1%}: {stats['hits']} hits, "
+        f"{stats['misses']} misses, {stats['evictions']} evictions, "
+        f"{stats['upstream_commands']} upstream commands, "
+        f"{stats['sessions']} sessions"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m dictionary_client.proxy")
+    parser.add_argument("--host", default="localhost", help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--upstream-host", required=True)
+    parser.add_argument("--upstream-port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=DEFAULT_CONNECTIONS,
+        help="persistent upstream connections",
+    )
+    parser.add_argument("--cache-size", type=int, default=10_000, help="entries")
+    parser.add_argument("--ttl", type=float, default=3600, help="seconds")
+    parser.add_argument(
+        "--negative-ttl", type=float, default=60, help="seconds to cache 552 replies"
+    )
+    parser.add_argument("--timeout", type=float, default=5, help="upstream timeout")
+    parser.add_argument(
+        "--stats-interval", type=float, help="seconds between hit rate reports"
+    )
+    args = parser.parse_args(argv)
+    proxy = DictProxy(
+        args.upstream_host,
+        args.upstream_port,
+        connections=args.connections,
+        cache=ProxyCache(args.cache_size, args.ttl, args.negative_ttl),
+        timeout=args.timeout,
+    )
+    try:
+        asyncio.run(serve(proxy, args.host, args.port, args.stats_interval))
+    except KeyboardInterrupt:
+        pass
+    print(format_stats(proxy.stats()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
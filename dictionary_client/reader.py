@@ -0,0 +1,225 @@
+import selectors
+import time
+
+from .status_codes import DictStatusCode
+
+BUF_SIZE = 65536
+# poll() has no FD_SETSIZE limit and, unlike epoll, does not hold a file
+# descriptor of its own for each client.
+Selector = getattr(selectors, "PollSelector", selectors.SelectSelector)
+LINE_DELIMITER = b"\r\n"
+TEXT_TERMINATOR = b"."
+
+
+def status_line_code(buffer, start):
+    """Return the status code of the line beginning at `start`."""
+    code = buffer[start : start + 3]
+    if not code.isdigit():
+        raise ValueError(
+            f"Expected status response but received: {bytes(buffer[start:])!r}"
+        )
+    return int(code)
+
+
+def next_state(buffer, start, end, in_text):
+    """Advance the response state machine over the line buffer[start:end].
+
+    Returns a pair (in_text, complete). While `in_text` is true we are inside a
+    text block following a 1xx status, which is terminated by a line holding a
+    single ".". Outside of text blocks every line is a status line, and the
+    response is complete at the first status line of 200 or above.
+    """
+    if in_text:
+        if end - start == 1 and buffer[start] == TEXT_TERMINATOR[0]:
+            return False, False
+        return True, False
+    code = status_line_code(buffer, start)
+    if DictStatusCode.response_complete(code):
+        return False, True
+    # 150 announces the number of definitions and is directly followed by a
+    # 151 status line; every other 1xx status is followed by text.
+    return code != DictStatusCode.DEFINITIONS_FOLLOW, False
+
+
+class ResponseReader:
+    """Buffered reader for responses on a DICT server connection.
+
+    Received bytes are appended to a single bytearray, and we remember how far
+    the buffer has been scanned, so reading a response of n bytes costs O(n)
+    regardless of how it was chunked by the network. A completed response is
+    copied out of the buffer exactly once; any bytes received beyond its end
+    are kept for the next read.
+
+    The socket is switched to non-blocking mode, and we only wait for it to
+    become ready when a read or write would block, so a chunk of data that has
+    already arrived costs a single `recv_into` call. `timeout` limits how long
+    we wait for each chunk, and `deadline`, if set, is the time (on the
+    `time.monotonic` clock) by which the whole exchange must be done.
+    """
+
+    def __init__(self, sock, timeout=5, buf_size=BUF_SIZE, instrumentation=None):
+        self.sock = sock
+        self.timeout = timeout
+        self.deadline = None
+        self.buf_size = buf_size
+        self.buffer = bytearray()
+        self._chunk = bytearray(buf_size)
+        self._chunk_view = memoryview(self._chunk)
+        sock.setblocking(False)
+        self._selector = Selector()
+        self._selector.register(sock, selectors.EVENT_READ)
+        # Responses to discard before the next read, the first of which may
+        # be part way through a text block.
+        self.pending_skips = 0
+        self.skip_in_text = False
+        self.instrumentation = instrumentation
+        # Time spent blocked waiting for data, when instrumented.
+        self.wait_time = 0.0
+
+    def limit_timeout(self, timeout):
+        """Return `timeout`, shortened if need be to end by the deadline."""
+        if self.deadline is None:
+            return timeout
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Client deadline exceeded.")
+        if timeout is None or remaining < timeout:
+            return remaining
+        return timeout
+
+    def _wait(self, events):
+        timeout = self.limit_timeout(self.timeout)
+        if events != selectors.EVENT_READ:
+            self._selector.modify(self.sock, events)
+        if self.instrumentation is not None:
+            wait_start = time.perf_counter()
+        try:
+            ready = self._selector.select(timeout)
+        finally:
+            if events != selectors.EVENT_READ:
+                self._selector.modify(self.sock, selectors.EVENT_READ)
+        if self.instrumentation is not None:
+            self.wait_time += time.perf_counter() - wait_start
+        if not ready:
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                raise TimeoutError("Client deadline exceeded.")
+            raise TimeoutError("Client timed out expecting server response.")
+
+    def _fill(self):
+        while True:
+            try:
+                size = self.sock.recv_into(self._chunk)
+                break
+            except BlockingIOError:
+                self._wait(selectors.EVENT_READ)
+        if not size:
+            raise ConnectionError("Server closed the connection.")
+        self.buffer += self._chunk_view[:size]
+        if self.instrumentation is not None:
+            self.instrumentation.on_bytes_received(size)
+
+    def sendall(self, data):
+        """Send all of `data` on the socket, subject to the same timeouts as
+        reading.
+        """
+        view = memoryview(data)
+        while view:
+            try:
+                sent = self.sock.send(view)
+            except BlockingIOError:
+                self._wait(selectors.EVENT_WRITE)
+                continue
+            view = view[sent:]
+
+    def _find_line_end(self, start):
+        scan_from = start
+        while True:
+            end = self.buffer.find(LINE_DELIMITER, scan_from)
+            if end != -1:
+                return end
+            # The delimiter may straddle the chunk boundary, so back up one
+            # byte, but never rescan anything before that.
+            scan_from = max(start, len(self.buffer) - 1)
+            self._fill()
+
+    def _scan_response(self, in_text=False, keep=True):
+        """Scan to the end of the current response and return its length.
+
+        If `keep` is false, lines are discarded from the buffer as they are
+        scanned, so skipping a response does not hold it in memory.
+        """
+        pos = 0
+        while True:
+            end = self._find_line_end(pos)
+            in_text, complete = next_state(self.buffer, pos, end, in_text)
+            pos = end + len(LINE_DELIMITER)
+            if complete:
+                return pos
+            if not keep:
+                del self.buffer[:pos]
+                pos = 0
+
+    def _skip_pending(self):
+        while self.pending_skips:
+            self.pending_skips -= 1
+            in_text, self.skip_in_text = self.skip_in_text, False
+            self._skip_response(in_text)
+
+    def read_line(self):
+        """Read a single line, without its line delimiter."""
+        if self.pending_skips:
+            self._skip_pending()
+        end = self._find_line_end(0)
+        # Slice a view, as slicing the bytearray would copy twice.
+        with memoryview(self.buffer) as view:
+            line = bytes(view[:end])
+        del self.buffer[: end + len(LINE_DELIMITER)]
+        return line
+
+    def read_response(self, in_text=False):
+        """Read a complete response, including line delimiters.
+
+        Pass `in_text=True` when continuing a response part way through a
+        text block.
+        """
+        if self.pending_skips:
+            self._skip_pending()
+        end = self._scan_response(in_text)
+        with memoryview(self.buffer) as view:
+            response = bytes(view[:end])
+        del self.buffer[:end]
+        return response
+
+    def _skip_response(self, in_text=False):
+        end = self._scan_response(in_text, keep=False)
+        del self.buffer[:end]
+
+    def skip_response(self, in_text=False):
+        """Discard the remainder of the current response."""
+        if self.pending_skips:
+            self._skip_pending()
+        self._skip_response(in_text)
+
+    def skip_later(self, count=1, in_text=False):
+        """Discard the remainder of the current response and the `count - 1`
+        responses after it, but only when the next read happens, so the
+        caller does not wait for them now.
+
+        Pass `in_text=True` if the current response is part way through a
+        text block.
+        """
+        self.pending_skips += count
+        if in_text:
+            self.skip_in_text = True
+
+    def reset(self, sock):
+        """Read from `sock`, a new connection, instead, forgetting anything
+        buffered or pending from the old one.
+        """
+        self._selector.unregister(self.sock)
+        self.sock = sock
+        sock.setblocking(False)
+        self._selector.register(sock, selectors.EVENT_READ)
+        self.buffer.clear()
+        self.pending_skips = 0
+        self.skip_in_text = False
@@ -1,52 +1,283 @@
 import re
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict
+from collections.abc import Mapping
+from typing import NamedTuple
 
 from .status_codes import PERMANENT_NEGATIVE_COMPLETION_CODES, DictStatusCode
 
+DEFINITION_HEADER_RE = re.compile(
+    r"""
+    ^151\s+
+    ("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|\S+)  # word
+    \s+(\S+)                                    # database name
+    \s*(.*)$                                    # database description
+    """,
+    re.VERBOSE,
+)
+
+
+def unquote(text):
+    if len(text) > 1 and text[0] == text[-1] and text[0] in "\"'":
+        return text[1:-1]
+    return text
+
+
+# The end of a text block: a line holding a single ".".
+TEXT_END = b"\r\n.\r\n"
+
+
+def text_start(data):
+    """Return the offset of the line after the status line of `data`."""
+    return data.index(b"\r\n") + 2
+
+
+def decode_text(data, start, view=None):
+    """Decode the text block beginning at offset `start` of the raw response
+    `data`, up to the line holding a single ".".
+
+    Returns the text, with its lines joined by "\n" and dot-stuffing undone,
+    and the offset of the line after the terminator. Only the text itself is
+    decoded, straight from `view`, a memoryview of `data` that callers
+    decoding several blocks can pass in to save creating one each time.
+    """
+    end = data.find(TEXT_END, start - 2)
+    if end == -1:
+        raise ValueError(f"Unterminated text block in response: {bytes(data)!r}")
+    if view is None:
+        view = memoryview(data)
+    text = str(view[start : max(start, end)], "utf-8")
+    if "\r\n" in text:
+        text = text.replace("\r\n", "\n")
+    if "\n." in text:
+        text = text.replace("\n.", "\n")
+    if text.startswith("."):
+        text = text[1:]
+    return text, end + len(TEXT_END)
+
+
+class Definition(Mapping):
+    """A definition from a response to DEFINE.
+
+    A Definition is a read-only mapping of its fields, so it can be used
+    where the dicts previously representing definitions were, e.g.
+    definition["db"] or definition.get("db"). Pass `default=dict` to
+    json.dumps to serialise one.
+    """
+
+    __slots__ = ("word", "db", "description", "definition")
+
+    def __init__(self, word, db, description, definition):
+        self.word = word
+        self.db = db
+        self.description = description
+        self.definition = definition
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def _fields(self):
+        return tuple(getattr(self, key) for key in self.__slots__)
+
+    def __eq__(self, other):
+        if isinstance(other, Definition):
+            return self._fields() == other._fields()
+        if isinstance(other, Mapping):
+            return self.as_dict() == dict(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._fields())
+
+    def __repr__(self):
+        return f"Definition(word={self.word!r}, db={self.db!r})"
+
+
+SERVER_STATS_RE = re.compile(
+    r"\[d/m/c = (\d+)/(\d+)/(\d+); ([\d.]+)r ([\d.]+)u ([\d.]+)s\]"
+)
+
+
+class ServerStats(NamedTuple):
+    """The timing statistics dictd appends to some status lines: the number
+    of definitions, matches and comparisons, and real, user and system time
+    in seconds.
+    """
+
+    defines: int
+    matches: int
+    comparisons: int
+    real: float
+    user: float
+    system: float
+
+
+def parse_server_stats(text):
+    match = SERVER_STATS_RE.search(text)
+    if not match:
+        return None
+    counts = (int(group) for group in match.groups()[:3])
+    times = (float(group) for group in match.groups()[3:])
+    return ServerStats(*counts, *times)
+
+
+class Match(NamedTuple):
+    """A single (database, word) pair from a response to MATCH."""
+
+    db: str
+    word: str
+
+
+def make_definition(header, text):
+    """Build a definition from its 151 status line and body text."""
+    match = DEFINITION_HEADER_RE.match(header)
+    if not match:
+        raise ValueError(f"Expected definition header but received: {header}")
+    word, db, description = match.groups()
+    return Definition(unquote(word), db, unquote(description), text)
+
+
+class DefinitionParser:
+    """Incremental parser for the definitions in a response to DEFINE.
+
+    Lines are fed in one at a time. A 151 status line opens a definition,
+    whose text runs until a line holding a single "."; text lines are
+    dot-unstuffed as described in RFC 2229 section 2.4.3. Other status lines
+    outside of a definition are ignored.
+    """
+
+    def __init__(self):
+        self.header = None
+        self.body = []
+
+    @property
+    def in_text(self):
+        return self.header is not None
+
+    def feed(self, line):
+        """Consume a line, returning a definition if it completes one."""
+        if self.header is None:
+            if line.startswith("151"):
+                self.header = line
+            return None
+        if line == BaseResponse.CONTENT_DELIMITER:
+            definition = make_definition(self.header, "\n".join(self.body))
+            self.header = None
+            self.body = []
+            return definition
+        self.body.append(line[1:] if line.startswith(".") else line)
+        return None
+
+
+class Unparsed:
+    """Marks response content that has not been parsed yet."""
+
 
 class BaseResponse(metaclass=ABCMeta):
-    STATUS_REGEXP = re.compile(r"^\d{3}")
+    """A response from the server.
+
+    Only the status code is parsed up front. The content is parsed from the
+    raw response bytes when it is first accessed, and `release` drops the
+    raw bytes once the content has been parsed.
+    """
+
+    __slots__ = ("response_bytes", "status_code", "_content")
+
     CONTENT_DELIMITER = "."
-    LINE_DELIMITER = "\r\n"
 
     def __init__(self, response_bytes):
-        self.response_text = response_bytes.decode()
+        self.response_bytes = response_bytes
         self.status_code = self.parse_status_code()
-        self.content = self.parse_content()
+        self._content = Unparsed
+
+    @classmethod
+    def from_content(cls, status_code, content):
+        """Build a response from already parsed content."""
+        response = cls.__new__(cls)
+        response.response_bytes = None
+        response.status_code = status_code
+        response._content = content
+        return response
+
+    def __reduce__(self):
+        if self.response_bytes is not None:
+            return (self.__class__, (self.response_bytes,))
+        return (self.from_content, (self.status_code, self._content))
+
+    @property
+    def response_text(self):
+        if self.response_bytes is None:
+            raise AttributeError("The raw response has been released.")
+        return self.response_bytes.decode()
+
+    @property
+    def content(self):
+        if self._content is Unparsed:
+            self._content = self.parse_content()
+        return self._content
+
+    @property
+    def server_stats(self):
+        """The ServerStats reported on the final status line, if any."""
+        if self.response_bytes is None:
+            return None
+        end = len(self.response_bytes.rstrip(b"\r\n"))
+        start = self.response_bytes.rfind(b"\r\n", 0, end)
+        start = 0 if start == -1 else start + 2
+        return parse_server_stats(self.response_bytes[start:end].decode())
+
+    def release(self):
+        """Parse the content if that has not happened yet, and drop the raw
+        response.
+        """
+        self.content
+        self.response_bytes = None
 
     def parse_status_code(self):
-        match = self.STATUS_REGEXP.match(self.response_text)
-        if not match:
+        code = self.response_bytes[:3]
+        if not code.isdigit():
             raise ValueError(
-                f"Expected status response but received: {self.response_text}"
+                f"Expected status response but received: {self.response_bytes!r}"
             )
-        return int(match.group(0))
+        return int(code)
 
     @abstractmethod
     def parse_content(self):
         pass
 
-    def get_multipart_content_lines(self):
-        return list(
-            filter(self.is_content_line, self.response_text.split(self.LINE_DELIMITER))
-        )
-
-    def is_content_line(self, line):
-        return self.STATUS_REGEXP.match(line) is None
+    def text_lines(self):
+        """Return the lines of the text block following the status line."""
+        text, _ = decode_text(self.response_bytes, text_start(self.response_bytes))
+        return text.split("\n") if text else []
 
 
 class ServerPropertiesResponse(BaseResponse):
     """Responses to a SHOW DB or SHOW STRAT command"""
 
+    __slots__ = ()
+
     def parse_content(self):
         if self.status_code in PERMANENT_NEGATIVE_COMPLETION_CODES:
             return None
-        response_lines = self.response_text.split(self.LINE_DELIMITER)
-        content_lines = list(filter(self.is_content_line, response_lines))
-        content_lines = content_lines[: content_lines.index(self.CONTENT_DELIMITER)]
-        lines_split = (line.split(maxsplit=1) for line in content_lines)
-        return {item: description.strip('"') for item, description in lines_split}
+        properties = {}
+        for line in self.text_lines():
+            item, _, description = line.partition(" ")
+            properties[item] = description.strip('"')
+        return properties
 
 
 class PreliminaryResponse(BaseResponse):
@@ -54,57 +285,68 @@ class PreliminaryResponse(BaseResponse):
     text).
     """
 
+    __slots__ = ()
+
     def parse_content(self):
-        return self.response_text.split(maxsplit=1)[1].strip()
+        return self.response_bytes[3:].strip().decode()
 
 
 class DefineWordResponse(BaseResponse):
+    __slots__ = ()
+
     def parse_content(self):
         if self.status_code == DictStatusCode.NO_MATCH:
             return None
-        definition_lines = self.get_multipart_content_lines()
+        data = self.response_bytes
         definitions = []
-        while "." in definition_lines:
-            delim_index = definition_lines.index(self.CONTENT_DELIMITER)
-            new_def = definition_lines[:delim_index]
-            definitions.append(
-                {"db": new_def[0].split()[2], "definition": "\n".join(new_def[1:])}
-            )
-            definition_lines = definition_lines[delim_index + 1 :]
+        start = text_start(data)
+        # Each definition is a 151 status line followed by a text block, and
+        # the definitions are followed by a 250 status line.
+        with memoryview(data) as view:
+            while data.startswith(b"151", start):
+                header_end = data.index(b"\r\n", start)
+                header = str(view[start:header_end], "utf-8")
+                text, start = decode_text(data, header_end + 2, view)
+                definitions.append(make_definition(header, text))
         return definitions
 
-    def is_content_line(self, line):
-        return not line.startswith("150") and not line.startswith("250")
-
 
 class MatchResponse(BaseResponse):
+    __slots__ = ()
+
     def parse_content(self):
-        if self.status_code == DictStatusCode.NO_MATCH:
+        if self.status_code != DictStatusCode.MATCHES_FOUND:
             return None
-        match_lines = self.get_multipart_content_lines()
-        match_lines = match_lines[: match_lines.index(self.CONTENT_DELIMITER)]
         matches = defaultdict(list)
-        for line in match_lines:
-            db_name, match = line.split(maxsplit=1)
+        for line in self.text_lines():
+            db_name, _, match = line.partition(" ")
             matches[db_name].append(match.strip('"'))
         return matches
 
+    def iter_matches(self):
+        """Yield each match as a Match pair."""
+        for db, words in (self.content or {}).items():
+            for word in words:
+                yield Match(db, word)
+
 
 class MultiLineResponse(BaseResponse):
+    __slots__ = ()
+
     def parse_content(self):
-        content_lines = self.get_multipart_content_lines()
-        content_lines = content_lines[: content_lines.index(self.CONTENT_DELIMITER)]
-        return "\n".join(content_lines)
+        if self.status_code in PERMANENT_NEGATIVE_COMPLETION_CODES:
+            return None
+        text, _ = decode_text(self.response_bytes, text_start(self.response_bytes))
+        return text
 
 
 class DatabaseInfoResponse(MultiLineResponse):
-    def parse_content(self):
-        if self.status_code == DictStatusCode.INVALID_DB:
-            return None
-        return super().parse_content()
+    __slots__ = ()
 
 
 class HandshakeResponse(PreliminaryResponse):
+    __slots__ = ()
+
     MSG_ATOM = r"[^\s<>.\\]"
     CAPABILITIES_RE = re.compile(
         fr"< ( {MSG_ATOM}* (\.{MSG_ATOM}+)* ) >",
@@ -124,13 +366,14 @@ class HandshakeResponse(PreliminaryResponse):
     BANNER_RE = re.compile(r"^220 ([^<]+)?")
 
     def parse_content(self):
-        capabilities_match = self.CAPABILITIES_RE.search(self.response_text)
-        msg_id_match = self.MSG_ID_RE.search(self.response_text)
-        banner_match = self.BANNER_RE.search(self.response_text)
+        response_text = self.response_text
+        capabilities_match = self.CAPABILITIES_RE.search(response_text)
+        msg_id_match = self.MSG_ID_RE.search(response_text)
+        banner_match = self.BANNER_RE.search(response_text)
         if not msg_id_match:
             raise ValueError(
                 "Client got unexpected banner in connection response: "
-                f"{self.response_text}"
+                f"{response_text}"
             )
         content = {
             "message_id": msg_id_match.group(1),
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key, in threads.
+
+    The first caller for a key runs the function, and callers arriving while
+    it is in flight wait for it and get the same result, or the same
+    exception. Nothing is remembered once the call returns, so this is not a
+    cache: a later call for the key runs the function again.
+
+    `calls` counts the functions run and `shared` the callers that waited on
+    another's call instead.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def stats(self):
+        return {"calls": self.calls, "shared": self.shared}
+
+    def do(self, key, func, *args):
+        """Return `func(*args)`, or the result of the call for `key` already
+        in flight.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """Coalesces concurrent calls with the same key on an event loop, as
+    SingleFlight does for threads.
+
+    The call runs in a task of its own, so cancelling one of the callers
+    waiting on it does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._tasks = {}
+
+    def stats(self):
+        return {"calls": self.calls, "shared": self.shared}
+
+    async def do(self, key, func, *args):
+        """Return `await func(*args)`, or the result of the call for `key`
+        already in flight.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(func(*args))
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self.calls += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
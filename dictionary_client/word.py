@@ -31,6 +31,7 @@ the grammar is specified as the following:
 '''
 """
 import re
+from functools import lru_cache
 
 # every utf-8 character except <SPC>, <">, <'>, or <\>
 ATOM = re.compile(
@@ -45,6 +46,41 @@ SQABLE = re.compile(f"^([{chr(32)}-{chr(38)}]|[{chr(40)}-{chr(1114111)}])+$")
 # SQABLE wrapped in single qoutes
 SQSTRING = re.compile(f"^'([{chr(32)}-{chr(38)}]|[{chr(40)}-{chr(1114111)}])+'$")
 
+# ASCII control characters, which cannot appear in any of the above
+CTL = re.compile(f"[{chr(0)}-{chr(31)}]")
+FORMAT_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def format_word(word):
+    """Quote `word` if necessary, as a valid word for the dict server.
+
+    The result is the same as trying ATOM, DQSTRING, SQSTRING, DQABLE and
+    SQABLE in turn, but the word is classified with a few substring checks
+    instead, and words made only of letters and digits (in any script) take
+    a fast path. Recently formatted words are memoized.
+    """
+    if word.isalnum():
+        return word
+    # The patterns above end in "$", which also matches before a trailing
+    # newline, so that newline is not part of what they classify.
+    body = word[:-1] if word.endswith("\n") else word
+    if not body or CTL.search(body):
+        raise ValueError(f"Invalid word `{word}`")
+    has_dquote = '"' in body
+    has_squote = "'" in body
+    if not (has_dquote or has_squote or " " in body or "\\" in body):
+        return word
+    if len(body) > 2 and body[0] == body[-1] == '"' and body.count('"') == 2:
+        return word
+    if len(body) > 2 and body[0] == body[-1] == "'" and body.count("'") == 2:
+        return word
+    if not has_dquote:
+        return f'"{word}"'
+    if not has_squote:
+        return f"'{word}'"
+    raise ValueError(f"Invalid word `{word}`")
+
 
 class Word:
     def __init__(self, word_raw):
@@ -52,14 +88,7 @@ class Word:
         self.formatted = self._format_word(word_raw)
 
     def _format_word(self, word):
-        if ATOM.match(word) or DQSTRING.match(word) or SQSTRING.match(word):
-            return word
-        elif DQABLE.match(word):
-            return f'"{word}"'
-        elif SQABLE.match(word):
-            return f"'{word}'"
-        else:
-            raise ValueError(f"Invalid word `{word}`")
+        return format_word(word)
 
     def __str__(self):
         return self.formatted
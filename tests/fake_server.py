@@ -0,0 +1,114 @@
+"""A scripted DICT server for exercising DictionaryClient over real sockets."""
+import socket
+import socketserver
+import threading
+import time
+import unittest
+
+from dictionary_client.metadata import shared_metadata
+
+BANNER = b"220 fake.test dictd <auth.mime> <1.2.3@fake.test>\r\n"
+DEFAULT_REPLIES = {
+    "STATUS": b"210 status [d/m/c = 0/0/0; 0.000r 0.000u 0.000s]\r\n",
+    "SHOW DB": (
+        b"110 2 databases present\r\n"
+        b'wn "WordNet (r) 3.1 (2011)"\r\n'
+        b'foldoc "The Free On-line Dictionary of Computing"\r\n'
+        b".\r\n250 ok\r\n"
+    ),
+    "SHOW STRAT": (
+        b"111 2 strategies present\r\n"
+        b'exact "Match headwords exactly"\r\n'
+        b'prefix "Match prefixes"\r\n'
+        b".\r\n250 ok\r\n"
+    ),
+}
+NO_MATCH = b"552 No match\r\n"
+TABLE_DEFINITIONS = (
+    b"150 2 definitions retrieved\r\n"
+    b'151 "table" wn "WordNet (r) 3.1 (2011)"\r\ntable\r\n    n 1: a set of data\r\n'
+    b'.\r\n151 "table" foldoc "The Free On-line Dictionary of Computing"\r\n'
+    b"table\r\n    A collection of records.\r\n.\r\n250 ok\r\n"
+)
+
+
+class FakeDictServer(socketserver.ThreadingTCPServer):
+    """Replies to each command line with the bytes registered for it in
+    `replies`, and with 552 for anything else, after `delay` seconds. Every
+    command received is recorded in `commands`.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, replies=None):
+        super().__init__(("127.0.0.1", 0), FakeDictHandler)
+        self.replies = {**DEFAULT_REPLIES, **(replies or {})}
+        self.commands = []
+        self.delay = 0
+        self.connections = 0
+        self.thread = threading.Thread(
+            target=self.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def __enter__(self):
+        # Forget metadata cached for an earlier server on the same port.
+        shared_metadata.clear()
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+class FakeDictHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.connections += 1
+        self.wfile.write(BANNER)
+        for raw_line in self.rfile:
+            command = raw_line.decode().rstrip("\r\n")
+            self.server.commands.append(command)
+            if command.startswith("CLIENT "):
+                self.wfile.write(b"250 ok\r\n")
+            elif command == "QUIT":
+                self.wfile.write(b"221 bye\r\n")
+                return
+            else:
+                time.sleep(self.server.delay)
+                self.wfile.write(self.server.replies.get(command, NO_MATCH))
+
+
+def unused_port():
+    """Return a local port that nothing is listening on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class FakeServerMixin:
+    """Runs a FakeDictServer with `replies` as `self.server` for each test."""
+
+    replies = {}
+
+    def setUp(self):
+        super().setUp()
+        self.server = self.start_server(self.replies)
+
+    def start_server(self, replies=None):
+        server = FakeDictServer(replies)
+        server.__enter__()
+        self.addCleanup(server.__exit__, None, None, None)
+        return server
+
+
+class ServerTestCase(FakeServerMixin, unittest.TestCase):
+    pass
+
+
+class AsyncServerTestCase(FakeServerMixin, unittest.IsolatedAsyncioTestCase):
+    pass
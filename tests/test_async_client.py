@@ -0,0 +1,75 @@
+import asyncio
+
+from fake_server import TABLE_DEFINITIONS, AsyncServerTestCase
+
+from dictionary_client import AsyncDictionaryClient
+
+
+class TestAsyncDictionaryClient(AsyncServerTestCase):
+    replies = {"DEFINE wn table": TABLE_DEFINITIONS}
+
+    async def test_connects_and_identifies(self):
+        async with AsyncDictionaryClient(port=self.server.port) as client:
+            self.assertEqual("<1.2.3@fake.test>", client.server_info["message_id"])
+            status = await client.get_server_status()
+            self.assertEqual(210, status.status_code)
+        self.assertTrue(self.server.commands[0].startswith("CLIENT "))
+        self.assertEqual("QUIT", self.server.commands[-1])
+
+    async def test_databases_and_strategies(self):
+        async with AsyncDictionaryClient(port=self.server.port) as client:
+            self.assertEqual({"wn", "foldoc"}, set(await client.databases))
+            self.assertEqual({"exact", "prefix"}, set(await client.strategies))
+            await client.databases
+        self.assertEqual(1, self.server.commands.count("SHOW DB"))
+
+    async def test_concurrent_defines(self):
+        async with AsyncDictionaryClient(port=self.server.port) as client:
+            responses = await asyncio.gather(
+                *(client.define(word, db="wn") for word in ["table", "chair"] * 20)
+            )
+        self.assertEqual([150, 552] * 20, [r.status_code for r in responses])
+        self.assertEqual("wn", responses[0].content[0]["db"])
+
+    async def test_coalesce(self):
+        client = AsyncDictionaryClient(port=self.server.port, coalesce=True)
+        async with client:
+            await client.databases
+            responses = await asyncio.gather(
+                *(client.define(word, db="wn") for word in ["table", "chair"] * 20)
+            )
+        self.assertEqual([150, 552] * 20, [r.status_code for r in responses])
+        self.assertIs(responses[0], responses[2])
+        self.assertEqual(1, self.server.commands.count("DEFINE wn table"))
+        self.assertEqual(1, self.server.commands.count("DEFINE wn chair"))
+
+    async def test_invalid_database(self):
+        async with AsyncDictionaryClient(port=self.server.port) as client:
+            with self.assertRaises(ValueError):
+                await client.define("table", db="jargon")
+
+    async def test_timeout_closes_connection(self):
+        client = AsyncDictionaryClient(port=self.server.port, timeout=0.1)
+        await client.connect()
+        await client.databases
+        self.server.delay = 0.3
+        with self.assertRaises(TimeoutError):
+            await client.define("table", db="wn")
+        self.assertIsNone(client.writer)
+        with self.assertRaises(ConnectionError):
+            await client.define("chair", db="wn")
+        await client.disconnect()
+        self.server.delay = 0
+        async with client:
+            self.assertEqual(552, (await client.define("chair", db="wn")).status_code)
+
+    async def test_cancellation_closes_connection(self):
+        async with AsyncDictionaryClient(port=self.server.port) as client:
+            await client.databases
+            self.server.delay = 0.3
+            task = asyncio.ensure_future(client.define("table", db="wn"))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertIsNone(client.writer)
@@ -0,0 +1,88 @@
+import time
+import unittest
+
+from fake_server import TABLE_DEFINITIONS, ServerTestCase
+
+from dictionary_client import DictionaryClient, LRUCacheBackend, ResultCache
+from dictionary_client.response import DefineWordResponse
+from dictionary_client.word import Word
+
+NO_MATCH = DefineWordResponse(b"552 No match\r\n")
+DEFINITION = DefineWordResponse(TABLE_DEFINITIONS)
+
+
+class TestLRUCacheBackend(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        backend = LRUCacheBackend(max_size=2)
+        backend.set("a", 1)
+        backend.set("b", 2)
+        backend.get("a")
+        backend.set("c", 3)
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(1, backend.get("a"))
+        self.assertEqual(3, backend.get("c"))
+        self.assertEqual(1, backend.evictions)
+
+
+class TestResultCache(unittest.TestCase):
+    def test_make_key_uses_formatted_word(self):
+        self.assertEqual(
+            ("MATCH", '"ice cream"', "wn", "prefix"),
+            ResultCache.make_key("MATCH", Word("ice cream"), "wn", "prefix"),
+        )
+
+    def test_hits_and_misses(self):
+        cache = ResultCache()
+        self.assertIsNone(cache.get("key"))
+        cache.set("key", DEFINITION)
+        self.assertIs(DEFINITION, cache.get("key"))
+        self.assertEqual({"hits": 1, "misses": 1, "evictions": 0}, cache.stats())
+
+    def test_entries_expire(self):
+        cache = ResultCache(ttl=0.01)
+        cache.set("key", DEFINITION)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("key"))
+
+    def test_negative_ttl(self):
+        cache = ResultCache(ttl=None, negative_ttl=0.01)
+        cache.set("positive", DEFINITION)
+        cache.set("negative", NO_MATCH)
+        self.assertIs(NO_MATCH, cache.get("negative"))
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("negative"))
+        self.assertIs(DEFINITION, cache.get("positive"))
+
+    def test_negative_caching_disabled(self):
+        cache = ResultCache(negative_ttl=0)
+        cache.set("key", NO_MATCH)
+        self.assertIsNone(cache.get("key"))
+
+    def test_errors_not_cached(self):
+        cache = ResultCache()
+        cache.set("key", DefineWordResponse(b"550 Invalid database\r\n"))
+        self.assertIsNone(cache.get("key"))
+
+
+class TestClientCache(ServerTestCase):
+    replies = {"DEFINE wn table": TABLE_DEFINITIONS}
+
+    def setUp(self):
+        super().setUp()
+        self.cache = ResultCache()
+        self.client = DictionaryClient(port=self.server.port, cache=self.cache)
+
+    def test_define_uses_cache(self):
+        first = self.client.define("table", db="wn")
+        self.assertIs(first, self.client.define("table", db="wn"))
+        self.client.define("chair", db="wn")
+        self.client.define("chair", db="wn")
+        self.assertEqual(1, self.server.commands.count("DEFINE wn table"))
+        self.assertEqual(1, self.server.commands.count("DEFINE wn chair"))
+        self.assertEqual(2, self.cache.hits)
+
+    def test_define_many_only_sends_misses(self):
+        self.client.define("table", db="wn")
+        responses = self.client.define_many(["table", "chair", "table"], db="wn")
+        self.assertEqual([150, 552, 150], [r.status_code for r in responses])
+        self.assertEqual(1, self.server.commands.count("DEFINE wn table"))
@@ -0,0 +1,114 @@
+import time
+
+from fake_server import TABLE_DEFINITIONS, ServerTestCase, unused_port
+
+from dictionary_client.cluster import ClusterDictionaryClient, parse_endpoint
+
+
+class TestClusterDictionaryClient(ServerTestCase):
+    replies = {"DEFINE wn table": TABLE_DEFINITIONS}
+
+    def start_server(self, replies=None):
+        return super().start_server({**self.replies, **(replies or {})})
+
+    def make_cluster(self, ports, **kwargs):
+        cluster = ClusterDictionaryClient(
+            [("127.0.0.1", port) for port in ports], **kwargs
+        )
+        self.addCleanup(cluster.close)
+        return cluster
+
+    def test_parse_endpoint(self):
+        self.assertEqual(("dict.org", 2628), parse_endpoint("dict.org"))
+        self.assertEqual(("dict.org", 2629), parse_endpoint("dict.org:2629"))
+        self.assertEqual(("dict.org", 2629), parse_endpoint(("dict.org", 2629)))
+
+    def test_spreads_concurrent_load(self):
+        servers = [self.server, self.start_server()]
+        cluster = self.make_cluster([server.port for server in servers])
+        # As if another thread were waiting on the first node.
+        cluster.nodes[0].outstanding += 1
+        self.assertEqual(150, cluster.define("table", db="wn").status_code)
+        self.assertEqual(0, servers[0].commands.count("DEFINE wn table"))
+        self.assertEqual(1, servers[1].commands.count("DEFINE wn table"))
+
+    def test_fails_over_on_connection_error(self):
+        cluster = self.make_cluster([unused_port(), self.server.port])
+        for _ in range(3):
+            self.assertEqual(150, cluster.define("table", db="wn").status_code)
+        self.assertEqual(1, cluster.nodes[0].failures)
+        self.assertGreater(cluster.nodes[0].ejected_until, 0)
+
+    def test_retries_on_server_shutdown(self):
+        shutting_down = self.start_server(
+            {"DEFINE wn table": b"421 Server shutting down\r\n"}
+        )
+        cluster = self.make_cluster([shutting_down.port, self.server.port])
+        self.assertEqual(150, cluster.define("table", db="wn").status_code)
+        self.assertEqual(1, shutting_down.commands.count("DEFINE wn table"))
+        self.assertEqual(0, cluster.nodes[0].pool.size)
+
+    def test_returns_last_response_when_all_nodes_fail(self):
+        servers = [
+            self.start_server({"STATUS": b"420 Server temporarily unavailable\r\n"})
+            for _ in range(2)
+        ]
+        cluster = self.make_cluster([server.port for server in servers])
+        self.assertEqual(420, cluster.get_server_status().status_code)
+
+    def test_raises_when_no_node_reachable(self):
+        cluster = self.make_cluster([unused_port(), unused_port()])
+        with self.assertRaises(ConnectionError):
+            cluster.define("table")
+
+    def test_probe_reinstates_recovered_node(self):
+        cluster = self.make_cluster([self.server.port], eject_time=60)
+        cluster.nodes[0].ejected_until = float("inf")
+        cluster.probe()
+        self.assertEqual(0.0, cluster.nodes[0].ejected_until)
+
+    def test_validation_error_keeps_client(self):
+        cluster = self.make_cluster([self.server.port])
+        cluster.define("table", db="wn")
+        node = cluster.nodes[0]
+        latency = node.latency
+        with self.assertRaises(ValueError):
+            cluster.define("", db="wn")
+        self.assertEqual(latency, node.latency)
+        self.assertEqual(0, node.failures)
+        self.assertEqual(1, node.pool.size)
+        cluster.define("table", db="wn")
+        self.assertEqual(1, self.server.connections)
+
+    def test_ejection_backs_off(self):
+        cluster = self.make_cluster([unused_port()], eject_time=60, max_eject_time=100)
+        node = cluster.nodes[0]
+        for backoff in [60, 100]:
+            with self.assertRaises(ConnectionError):
+                cluster.define("table")
+            self.assertAlmostEqual(
+                time.monotonic() + backoff, node.ejected_until, delta=1
+            )
+
+    def test_reprobes_ejected_node(self):
+        cluster = self.make_cluster([self.server.port], eject_time=0.01)
+        node = cluster.nodes[0]
+        node.outstanding += 1
+        cluster._release_node(node)
+        self.assertEqual(1, node.failures)
+        deadline = time.monotonic() + 5
+        while node.failures and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(0, node.failures)
+        self.assertEqual(0.0, node.ejected_until)
+        self.assertIn("STATUS", self.server.commands)
+
+    def test_latency_balancer(self):
+        servers = [self.server, self.start_server()]
+        cluster = self.make_cluster(
+            [server.port for server in servers], balancer="latency"
+        )
+        cluster.nodes[0].latency = 1.0
+        cluster.nodes[1].latency = 0.001
+        cluster.define("table", db="wn")
+        self.assertEqual(1, servers[1].commands.count("DEFINE wn table"))
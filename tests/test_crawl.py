@@ -0,0 +1,128 @@
+import gzip
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from fake_server import TABLE_DEFINITIONS, ServerTestCase
+
+from dictionary_client.crawl import RateLimiter, crawl, make_prefixes
+from dictionary_client.prefixes import remainder_pattern
+
+REPLIES = {
+    "MATCH foldoc prefix t": (
+        b'152 2 matches found\r\nfoldoc "table"\r\nfoldoc "table"\r\n.\r\n250 ok\r\n'
+    ),
+    "MATCH foldoc prefix u": (
+        b'152 1 matches found\r\nfoldoc "undefined"\r\n.\r\n250 ok\r\n'
+    ),
+    "MATCH foldoc prefix w": (
+        b'152 2 matches found\r\nfoldoc "bad\x01word"\r\nfoldoc "table"\r\n'
+        b".\r\n250 ok\r\n"
+    ),
+    "DEFINE foldoc table": TABLE_DEFINITIONS,
+}
+STRATEGIES_WITH_RE = (
+    b"111 2 strategies present\r\n"
+    b'prefix "Match prefixes"\r\n'
+    b're "POSIX 1003.2 (modern) regular expressions"\r\n'
+    b".\r\n250 ok\r\n"
+)
+
+
+class TestCrawl(ServerTestCase):
+    replies = REPLIES
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output = os.path.join(directory.name, "foldoc.jsonl")
+
+    def crawl(self, **kwargs):
+        return crawl("foldoc", self.output, port=self.server.port, **kwargs)
+
+    def read_output(self, opener=open):
+        with opener(self.output, "rt", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_crawl(self):
+        progress = []
+        written = self.crawl(
+            prefixes=["t", "u", "v"],
+            workers=2,
+            progress=lambda prefix, count: progress.append((prefix, count)),
+        )
+        self.assertEqual(2, written)
+        self.assertEqual([("t", 2), ("u", 0), ("v", 0)], sorted(progress))
+        records = self.read_output()
+        self.assertEqual(["wn", "foldoc"], [record["db"] for record in records])
+        self.assertEqual("table\n    n 1: a set of data", records[0]["definition"])
+        # Each distinct word is defined once.
+        self.assertEqual(1, self.server.commands.count("DEFINE foldoc table"))
+
+    def test_resumes_from_checkpoint(self):
+        with open(f"{self.output}.checkpoint", "w") as f:
+            f.write("t\n")
+        self.assertEqual(0, self.crawl(prefixes=["t", "u"]))
+        self.assertNotIn("MATCH foldoc prefix t", self.server.commands)
+        self.assertIn("MATCH foldoc prefix u", self.server.commands)
+        self.assertEqual(0, self.crawl(prefixes=["t", "u"]))
+        self.assertEqual(1, self.server.commands.count("MATCH foldoc prefix u"))
+
+    def read_checkpoint(self):
+        with open(f"{self.output}.checkpoint", encoding="utf-8") as f:
+            return f.read().split()
+
+    def test_matches_remaining_words_by_regex(self):
+        self.server.replies["SHOW STRAT"] = STRATEGIES_WITH_RE
+        pattern = remainder_pattern("tu")
+        self.server.replies[f"MATCH foldoc re {pattern}"] = REPLIES[
+            "MATCH foldoc prefix t"
+        ]
+        failures = []
+        self.assertEqual(4, self.crawl(alphabet="tu", failures=failures))
+        self.assertEqual([], failures)
+        self.assertCountEqual(["t", "u", pattern], self.read_checkpoint())
+
+    def test_reports_missing_regex_strategy(self):
+        failures = []
+        self.assertEqual(2, self.crawl(alphabet="tu", failures=failures))
+        pattern = remainder_pattern("tu")
+        self.assertEqual([(pattern, 'Unknown strategy: "re".')], failures)
+        self.assertCountEqual(["t", "u"], self.read_checkpoint())
+
+    def test_skips_invalid_words(self):
+        failures = []
+        self.assertEqual(2, self.crawl(prefixes=["w"], failures=failures))
+        self.assertEqual(["bad\x01word"], [word for word, _ in failures])
+        self.assertEqual(["w"], self.read_checkpoint())
+
+    def test_records_failed_prefixes(self):
+        self.server.replies["MATCH foldoc prefix u"] = b"garbage\r\n"
+        failures = []
+        self.assertEqual(2, self.crawl(prefixes=["t", "u"], failures=failures))
+        self.assertEqual(["u"], [prefix for prefix, _ in failures])
+        self.assertEqual(["t"], self.read_checkpoint())
+
+    def test_gzip_output(self):
+        self.output += ".gz"
+        self.crawl(prefixes=["t"])
+        self.assertEqual(2, len(self.read_output(gzip.open)))
+
+    def test_processes(self):
+        self.assertEqual(2, self.crawl(prefixes=["t", "u"], workers=2, processes=True))
+
+
+class TestHelpers(unittest.TestCase):
+    def test_make_prefixes(self):
+        self.assertEqual(["aa", "ab", "ba", "bb"], make_prefixes("ab", 2))
+
+    def test_rate_limiter(self):
+        limiter = RateLimiter(100)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire(2)
+        # The first acquisition is immediate; the next two wait 20 ms each.
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
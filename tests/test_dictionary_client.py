@@ -0,0 +1,280 @@
+import time
+from unittest import mock
+
+from fake_server import TABLE_DEFINITIONS, ServerTestCase
+
+from dictionary_client import DictionaryClient
+from dictionary_client.dictionary_client import default_client_id, default_client_name
+
+
+class ClientTestCase(ServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = DictionaryClient(port=self.server.port)
+        self.addCleanup(self.client.disconnect)
+
+
+class TestConnectOptions(ClientTestCase):
+    def make_client(self, **kwargs):
+        client = DictionaryClient(port=self.server.port, **kwargs)
+        self.addCleanup(client.disconnect)
+        return client
+
+    def test_sends_client_ident(self):
+        self.assertEqual(f"CLIENT {default_client_id()}", self.server.commands[0])
+
+    def test_client_id(self):
+        self.make_client(client_id="test-suite")
+        self.assertEqual("CLIENT test-suite", self.server.commands[-1])
+
+    def test_skip_client_ident(self):
+        client = self.make_client(send_client_ident=False)
+        self.assertEqual(210, client.get_server_status().status_code)
+        self.assertEqual(["STATUS"], self.server.commands[1:])
+
+    def test_lazy(self):
+        client = self.make_client(lazy=True)
+        self.assertFalse(client.connected)
+        self.assertEqual(1, self.server.connections)
+        self.assertEqual(552, client.define("table").status_code)
+        self.assertTrue(client.connected)
+        self.assertEqual(2, self.server.connections)
+        self.assertEqual("<1.2.3@fake.test>", client.server_info["message_id"])
+
+    def test_lazy_server_info_connects(self):
+        client = self.make_client(lazy=True)
+        self.assertEqual("<1.2.3@fake.test>", client.server_info["message_id"])
+        self.assertTrue(client.connected)
+
+    def test_client_name_without_user(self):
+        default_client_name.cache_clear()
+        self.addCleanup(default_client_name.cache_clear)
+        with mock.patch("getpass.getuser", side_effect=KeyError("uid not found")):
+            self.assertTrue(default_client_name().startswith("unknown@"))
+
+
+class TestDefineIter(ClientTestCase):
+    replies = {"DEFINE * table": TABLE_DEFINITIONS}
+
+    def test_yields_definitions(self):
+        definitions = list(self.client.define_iter("table"))
+        self.assertEqual(
+            [
+                {
+                    "word": "table",
+                    "db": "wn",
+                    "description": "WordNet (r) 3.1 (2011)",
+                    "definition": "table\n    n 1: a set of data",
+                },
+                {
+                    "word": "table",
+                    "db": "foldoc",
+                    "description": "The Free On-line Dictionary of Computing",
+                    "definition": "table\n    A collection of records.",
+                },
+            ],
+            definitions,
+        )
+        self.assertEqual(210, self.client.get_server_status().status_code)
+
+    def test_no_match(self):
+        self.assertEqual([], list(self.client.define_iter("chair")))
+        self.assertEqual(210, self.client.get_server_status().status_code)
+
+    def test_close_discards_remaining_definitions(self):
+        definitions = self.client.define_iter("table")
+        self.assertEqual("wn", next(definitions)["db"])
+        definitions.close()
+        self.assertEqual(210, self.client.get_server_status().status_code)
+
+    def test_close_unstarted(self):
+        self.client.define_iter("table").close()
+        self.assertEqual(210, self.client.get_server_status().status_code)
+        self.assertNotIn("DEFINE * table", self.server.commands)
+
+    def test_invalid_word(self):
+        with self.assertRaises(ValueError):
+            self.client.define_iter("")
+
+    def test_has_pending_reply(self):
+        self.assertFalse(self.client.has_pending_reply())
+        definitions = self.client.define_iter("table")
+        next(definitions)
+        self.assertTrue(self.client.has_pending_reply())
+        list(definitions)
+        self.assertFalse(self.client.has_pending_reply())
+
+
+MANY_MATCHES = (
+    b"152 5000 matches found\r\n"
+    + b"".join(b'wn "a%d"\r\n' % i for i in range(5000))
+    + b".\r\n250 ok\r\n"
+)
+
+
+class TestMatchIter(ClientTestCase):
+    replies = {"MATCH * prefix a": MANY_MATCHES}
+
+    def test_yields_matches(self):
+        matches = list(self.client.match_iter("a", strategy="prefix"))
+        self.assertEqual(5000, len(matches))
+        self.assertEqual(("wn", "a0"), matches[0])
+        self.assertEqual(210, self.client.get_server_status().status_code)
+
+    def test_no_match(self):
+        self.assertEqual([], list(self.client.match_iter("b", strategy="prefix")))
+        self.assertEqual(210, self.client.get_server_status().status_code)
+
+    def test_limit_discards_remaining_matches(self):
+        matches = list(self.client.match_iter("a", strategy="prefix", limit=3))
+        self.assertEqual(["a0", "a1", "a2"], [match.word for match in matches])
+        self.assertEqual(1, self.client._reader.pending_skips)
+        self.assertEqual(210, self.client.get_server_status().status_code)
+
+    def test_close_discards_remaining_matches(self):
+        matches = self.client.match_iter("a", strategy="prefix")
+        self.assertEqual("a0", next(matches).word)
+        matches.close()
+        self.assertEqual(210, self.client.get_server_status().status_code)
+
+    def test_close_unstarted(self):
+        self.client.match_iter("a", strategy="prefix").close()
+        self.assertEqual(210, self.client.get_server_status().status_code)
+        self.assertNotIn("MATCH * prefix a", self.server.commands)
+
+    def test_limit_with_reconnect(self):
+        matches = self.client.match_iter(
+            "a", strategy="prefix", limit=2, reconnect=True
+        )
+        self.assertEqual(["a0", "a1"], [match.word for match in matches])
+        self.assertFalse(self.client.connected)
+        self.assertEqual(210, self.client.get_server_status().status_code)
+        self.assertEqual(2, self.server.connections)
+
+
+class TestPipelining(ClientTestCase):
+    replies = {
+        "DEFINE wn table": TABLE_DEFINITIONS,
+        "MATCH * prefix tab": (
+            b"152 2 matches found\r\nwn table\r\nwn tabular\r\n.\r\n250 ok\r\n"
+        ),
+    }
+
+    def test_define_many(self):
+        words = ["table", "chair"] * 100
+        responses = self.client.define_many(words, db="wn")
+        self.assertEqual(len(words), len(responses))
+        self.assertEqual([150, 552] * 100, [r.status_code for r in responses])
+        self.assertEqual("foldoc", responses[2].content[1]["db"])
+        self.assertIsNone(responses[3].content)
+        self.assertEqual(
+            [f"DEFINE wn {word}" for word in words],
+            self.server.commands[-len(words) :],
+        )
+
+    def test_match_many(self):
+        responses = self.client.match_many(["tab", "xyz"], strategy="prefix")
+        self.assertEqual({"wn": ["table", "tabular"]}, responses[0].content)
+        self.assertIsNone(responses[1].content)
+
+    def test_invalid_database(self):
+        with self.assertRaises(ValueError):
+            self.client.define_many(["table"], db="jargon")
+
+
+class TestDefineMulti(ClientTestCase):
+    replies = {
+        "DEFINE wn table": TABLE_DEFINITIONS,
+        "DEFINE foldoc table": TABLE_DEFINITIONS,
+    }
+
+    def test_define_multi(self):
+        responses = self.client.define_multi("table", ["foldoc", "wn"])
+        self.assertEqual(["foldoc", "wn"], list(responses))
+        self.assertEqual(150, responses["wn"].status_code)
+        self.assertEqual(150, responses["foldoc"].status_code)
+
+    def test_first_hit(self):
+        responses = self.client.define_multi("tables", ["wn", "foldoc"])
+        self.assertEqual([552, 552], [r.status_code for r in responses.values()])
+        responses = self.client.define_multi("table", ["wn", "foldoc"], first_hit=True)
+        self.assertEqual(["wn"], list(responses))
+        self.assertEqual(150, responses["wn"].status_code)
+        self.assertEqual(210, self.client.get_server_status().status_code)
+
+
+class TestTimeouts(ClientTestCase):
+    # The reply never completes.
+    replies = {"DEFINE * slow": b"150 1 definitions retrieved\r\n"}
+
+    def setUp(self):
+        super().setUp()
+        # A client that timed out can not send QUIT, so drop its connection
+        # before it is disconnected.
+        self.addCleanup(self.client._reconnect_later)
+
+    def test_read_timeout(self):
+        self.client.read_timeout = 0.05
+        with self.assertRaises(TimeoutError):
+            self.client.define("slow")
+
+    def test_deadline(self):
+        start = time.monotonic()
+        with self.client.timeouts(deadline=0.05, read_timeout=10):
+            self.assertEqual(10, self.client.read_timeout)
+            with self.assertRaisesRegex(TimeoutError, "deadline"):
+                self.client.define("slow")
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(5, self.client.read_timeout)
+        self.assertIsNone(self.client._reader.deadline)
+
+    def test_nested_deadline_cannot_extend_outer_deadline(self):
+        with self.client.timeouts(deadline=1):
+            outer = self.client._reader.deadline
+            with self.client.timeouts(deadline=60):
+                self.assertEqual(outer, self.client._reader.deadline)
+            self.assertEqual(outer, self.client._reader.deadline)
+
+
+class TestLookup(ClientTestCase):
+    replies = {
+        "MATCH * prefix tab": (
+            b"152 3 matches found\r\n"
+            b'wn "table"\r\nwn "tabular"\r\nfoldoc "table"\r\n.\r\n250 ok\r\n'
+        ),
+        "MATCH * prefix ta": (
+            b"152 2 matches found\r\n"
+            b'wn "ta\x01ble"\r\nwn "table"\r\n.\r\n250 ok\r\n'
+        ),
+        "DEFINE * table": TABLE_DEFINITIONS,
+    }
+
+    def test_lookup(self):
+        results = list(self.client.lookup("tab", strategy="prefix"))
+        self.assertEqual(["table", "tabular"], [word for word, _ in results])
+        self.assertEqual([150, 552], [r.status_code for _, r in results])
+        self.assertEqual(
+            ["DEFINE * table", "DEFINE * tabular"], self.server.commands[-2:]
+        )
+        self.assertEqual(210, self.client.get_server_status().status_code)
+
+    def test_limit(self):
+        results = list(self.client.lookup("tab", strategy="prefix", limit=1))
+        self.assertEqual(["table"], [word for word, _ in results])
+
+    def test_no_match(self):
+        self.assertEqual([], list(self.client.lookup("xyz", strategy="prefix")))
+
+    def test_close_discards_remaining_definitions(self):
+        results = self.client.lookup("tab", strategy="prefix")
+        self.assertEqual("table", next(results)[0])
+        results.close()
+        self.assertEqual(210, self.client.get_server_status().status_code)
+
+    def test_skips_invalid_headwords(self):
+        results = list(self.client.lookup("ta", strategy="prefix", limit=1))
+        self.assertEqual(["table"], [word for word, _ in results])
+        self.assertEqual([150], [r.status_code for _, r in results])
+        self.assertEqual(
+            ["MATCH * prefix ta", "DEFINE * table"], self.server.commands[-2:]
+        )
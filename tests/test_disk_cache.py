@@ -0,0 +1,146 @@
+import os
+import tempfile
+import unittest
+
+from fake_server import TABLE_DEFINITIONS, ServerTestCase
+
+from dictionary_client import (
+    DictionaryClient,
+    DiskCacheBackend,
+    ResultCache,
+    server_fingerprint,
+    warm_cache,
+)
+from dictionary_client.disk_cache import RECORD_HEADER, fcntl
+from dictionary_client.response import DefineWordResponse
+
+
+class TestDiskCacheBackend(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "definitions.cache")
+
+    def open_backend(self, fingerprint=b""):
+        backend = DiskCacheBackend(self.path, fingerprint)
+        self.addCleanup(backend.close)
+        return backend
+
+    def test_round_trip(self):
+        backend = self.open_backend()
+        self.assertIsNone(backend.get(("DEFINE", "table", "wn", None)))
+        backend.set(("DEFINE", "table", "wn", None), (None, "value"))
+        self.assertEqual((None, "value"), backend.get(("DEFINE", "table", "wn", None)))
+
+    def test_persists_across_instances(self):
+        backend = self.open_backend()
+        backend.set("a", 1)
+        backend.set("b", 2)
+        backend.set("a", 3)
+        backend.delete("b")
+        backend.close()
+        backend = self.open_backend()
+        self.assertEqual(3, backend.get("a"))
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(1, len(backend))
+
+    def test_fingerprint_change_invalidates(self):
+        backend = self.open_backend(b"wn 3.0")
+        backend.set("a", 1)
+        backend.close()
+        self.assertEqual(1, self.open_backend(b"wn 3.0").get("a"))
+        self.assertIsNone(self.open_backend(b"wn 3.1").get("a"))
+
+    def test_truncated_record_discarded(self):
+        backend = self.open_backend()
+        backend.set("a", 1)
+        backend.set("b", 2)
+        backend.close()
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 1)
+        backend = self.open_backend()
+        self.assertEqual(1, backend.get("a"))
+        self.assertIsNone(backend.get("b"))
+        backend.set("c", 3)
+        self.assertEqual(3, backend.get("c"))
+
+    def test_corrupt_record_discarded(self):
+        backend = self.open_backend()
+        backend.set("a", 1)
+        backend.close()
+        size = os.path.getsize(self.path)
+        with open(self.path, "ab") as f:
+            f.write(RECORD_HEADER.pack(3, 1) + b"key" + b"v")
+        backend = self.open_backend()
+        self.assertEqual(1, backend.get("a"))
+        self.assertEqual(size, os.path.getsize(self.path))
+
+    def test_corrupt_value_is_a_miss(self):
+        backend = self.open_backend()
+        backend.set("a", 1)
+        backend.close()
+        with open(self.path, "r+b") as f:
+            f.seek(-2, os.SEEK_END)
+            f.write(b"\xff\xff")
+        backend = self.open_backend()
+        self.assertIsNone(backend.get("a"))
+        self.assertEqual(0, len(backend))
+
+    def test_compact(self):
+        backend = self.open_backend()
+        for i in range(100):
+            backend.set("a", i)
+        size = os.path.getsize(self.path)
+        backend.compact()
+        self.assertLess(os.path.getsize(self.path), size / 10)
+        self.assertEqual(99, backend.get("a"))
+
+    def test_compacts_automatically(self):
+        backend = DiskCacheBackend(self.path, compact_threshold=10)
+        self.addCleanup(backend.close)
+        backend.set("a", 0)
+        size = os.path.getsize(self.path)
+        for i in range(100):
+            backend.set("a", i)
+        self.assertLess(os.path.getsize(self.path), size * 12)
+        self.assertEqual(99, backend.get("a"))
+
+    @unittest.skipIf(fcntl is None, "requires flock")
+    def test_reopens_file_compacted_by_another_process(self):
+        first = self.open_backend()
+        second = self.open_backend()
+        first.set("a", 1)
+        first.set("a", 2)
+        first.compact()
+        second.set("b", 3)
+        self.assertEqual(2, second.get("a"))
+        third = self.open_backend()
+        self.assertEqual({2, 3}, {third.get("a"), third.get("b")})
+
+    def test_stores_responses(self):
+        cache = ResultCache(backend=self.open_backend())
+        cache.set("key", DefineWordResponse(TABLE_DEFINITIONS))
+        self.assertEqual("wn", cache.get("key").content[0]["db"])
+
+
+class TestWarmCache(ServerTestCase):
+    replies = {
+        "DEFINE wn table": TABLE_DEFINITIONS,
+        "SHOW INFO wn": b"112 information for wn\r\nWordNet 3.1\r\n.\r\n250 ok\r\n",
+    }
+
+    def test_warms_from_word_list(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        client = DictionaryClient(port=self.server.port)
+        self.addCleanup(client.disconnect)
+        backend = DiskCacheBackend(
+            os.path.join(directory.name, "definitions.cache"),
+            server_fingerprint(client, ["wn"]),
+        )
+        self.addCleanup(backend.close)
+        client.cache = ResultCache(backend=backend)
+        warm_cache(client, ["table", "chair"], db="wn")
+        self.assertEqual(2, len(backend))
+        client.define("table", db="wn")
+        self.assertEqual(1, self.server.commands.count("DEFINE wn table"))
@@ -0,0 +1,212 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from fake_server import ServerTestCase
+from test_local import ENTRIES, write_database
+
+from dictionary_client import DictionaryClient, HeadwordIndex, LocalDictionary
+from dictionary_client.headwords import DatabaseHeadwords, soundex
+from dictionary_client.prefixes import remainder_pattern
+from dictionary_client.status_codes import DictStatusCode
+
+WORDS = ["apple", "Apple Pie", "applet", "ample", "maple", "grapple", "Robert"]
+REPLIES = {
+    "MATCH foldoc prefix a": (
+        b'152 2 matches found\r\nfoldoc "apple"\r\nfoldoc "applet"\r\n.\r\n250 ok\r\n'
+    ),
+    "MATCH foldoc prefix m": (
+        b'152 1 matches found\r\nfoldoc "maple"\r\n.\r\n250 ok\r\n'
+    ),
+    f"MATCH foldoc re {remainder_pattern()}": (
+        b'152 1 matches found\r\nfoldoc "\xc3\xa9clair"\r\n.\r\n250 ok\r\n'
+    ),
+}
+STRATEGIES_WITH_RE = (
+    b"111 2 strategies present\r\n"
+    b'prefix "Match prefixes"\r\n'
+    b're "POSIX 1003.2 (modern) regular expressions"\r\n'
+    b".\r\n250 ok\r\n"
+)
+
+
+class TestSoundex(unittest.TestCase):
+    def test_soundex(self):
+        for word, code in [
+            ("Robert", "R163"),
+            ("Rupert", "R163"),
+            ("Tymczak", "T522"),
+            ("Pfister", "P236"),
+            ("Ashcraft", "A261"),
+            ("Lee", "L000"),
+            ("42", ""),
+        ]:
+            with self.subTest(word=word):
+                self.assertEqual(code, soundex(word))
+
+
+class TestDatabaseHeadwords(unittest.TestCase):
+    def setUp(self):
+        self.headwords = DatabaseHeadwords(WORDS)
+
+    def assertMatches(self, expected, word, strategy):
+        self.assertCountEqual(expected, self.headwords.match(word, strategy))
+
+    def test_exact(self):
+        self.assertMatches(["apple"], "APPLE", "exact")
+        self.assertMatches(["Apple Pie"], "APPLE PIE!", "exact")
+        self.assertMatches([], "appl", "exact")
+
+    def test_prefix(self):
+        self.assertMatches(["apple", "Apple Pie", "applet"], "app", "prefix")
+        self.assertMatches([], "zz", "prefix")
+
+    def test_suffix(self):
+        self.assertMatches(["apple", "grapple", "maple", "ample"], "ple", "suffix")
+
+    def test_substring(self):
+        self.assertMatches(
+            ["apple", "Apple Pie", "applet", "grapple"], "ppl", "substring"
+        )
+        self.assertMatches(["Apple Pie"], "e p", "substring")
+        self.assertMatches([], "xyz", "substring")
+
+    def test_lev(self):
+        self.assertMatches(["apple", "applet", "ample"], "apple", "lev")
+        self.assertMatches(["apple", "maple"], "mapple", "lev")
+        self.assertCountEqual(
+            ["apple", "applet", "ample", "maple", "grapple"],
+            [self.headwords.words[i] for i in self.headwords.lev("apple", 2)],
+        )
+
+    def test_soundex(self):
+        self.assertMatches(["Robert"], "Rupert", "soundex")
+
+
+class TestHeadwordIndex(unittest.TestCase):
+    def test_match(self):
+        index = HeadwordIndex({"a": WORDS, "b": ["apple", "pear"]})
+        response = index.match("apple", strategy="exact")
+        self.assertEqual(DictStatusCode.MATCHES_FOUND, response.status_code)
+        self.assertEqual({"a": ["apple"], "b": ["apple"]}, response.content)
+        response = index.match("pea", db="b", strategy="prefix")
+        self.assertEqual({"b": ["pear"]}, response.content)
+        self.assertEqual(
+            DictStatusCode.NO_MATCH, index.match("kiwi", db="b").status_code
+        )
+
+    def test_invalid_arguments(self):
+        index = HeadwordIndex({"a": WORDS})
+        with self.assertRaises(ValueError):
+            index.match("apple", db="b")
+        with self.assertRaises(ValueError):
+            index.match("apple", strategy="regexp")
+
+    def test_from_local(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test")
+            write_database(path, ENTRIES)
+            local = LocalDictionary({"test": path})
+            self.addCleanup(local.close)
+            index = HeadwordIndex.from_local(local)
+        self.assertEqual(["test"], index.databases)
+        self.assertEqual(
+            {"test": ["café"]}, index.match("cafe", strategy="lev").content
+        )
+        self.assertEqual(
+            DictStatusCode.NO_MATCH,
+            index.match("00-database", strategy="prefix").status_code,
+        )
+
+    def test_from_crawl(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "crawl.jsonl.gz")
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                for db, word in [("wn", "table"), ("wn", "tablet"), ("foldoc", "tab")]:
+                    f.write(json.dumps({"db": db, "word": word}) + "\n")
+            index = HeadwordIndex.from_crawl(path)
+            partial = HeadwordIndex.from_crawl(path, complete=False)
+        self.assertCountEqual(["wn", "foldoc"], index.databases)
+        self.assertEqual(
+            {"wn": ["table", "tablet"]},
+            index.match("tab", db="wn", strategy="prefix").content,
+        )
+        self.assertIn("wn", index)
+        self.assertNotIn("wn", partial)
+
+
+class TestPopulate(ServerTestCase):
+    replies = REPLIES
+
+    def setUp(self):
+        super().setUp()
+        self.client = DictionaryClient(port=self.server.port)
+        self.addCleanup(self.client.disconnect)
+
+    def test_populate(self):
+        self.server.replies["SHOW STRAT"] = STRATEGIES_WITH_RE
+        index = HeadwordIndex()
+        index.populate(self.client, "foldoc")
+        self.assertIn("foldoc", index)
+        self.assertEqual(
+            {"foldoc": ["apple", "applet"]},
+            index.match("apple", strategy="lev").content,
+        )
+        self.assertEqual(
+            {"foldoc": ["éclair"]}, index.match("Éclair", strategy="exact").content
+        )
+
+    def test_populate_without_regex_is_incomplete(self):
+        index = HeadwordIndex()
+        index.populate(self.client, "foldoc")
+        self.assertNotIn("foldoc", index)
+        self.assertEqual(["foldoc"], index.databases)
+        self.assertFalse(
+            [command for command in self.server.commands if " re " in command]
+        )
+
+    def test_populate_with_prefixes_is_incomplete(self):
+        self.server.replies["SHOW STRAT"] = STRATEGIES_WITH_RE
+        index = HeadwordIndex()
+        index.populate(self.client, "foldoc", prefixes=["a", "m"])
+        self.assertNotIn("foldoc", index)
+        self.assertEqual(
+            {"foldoc": ["maple"]}, index.match("maple", strategy="exact").content
+        )
+
+
+class TestClientIndex(ServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.index = HeadwordIndex({"foldoc": WORDS})
+        self.client = DictionaryClient(port=self.server.port, headword_index=self.index)
+        self.addCleanup(self.client.disconnect)
+
+    def match_commands(self):
+        return [command for command in self.server.commands if "MATCH" in command]
+
+    def test_match_uses_index(self):
+        response = self.client.match("app", db="foldoc", strategy="prefix")
+        self.assertEqual({"foldoc": ["apple", "Apple Pie", "applet"]}, response.content)
+        responses = self.client.match_many(["maple", "zz"], db="foldoc", strategy="lev")
+        self.assertEqual(
+            [DictStatusCode.MATCHES_FOUND, DictStatusCode.NO_MATCH],
+            [response.status_code for response in responses],
+        )
+        self.assertFalse(self.match_commands())
+
+    def test_incomplete_database_uses_server(self):
+        self.index.add("foldoc", WORDS, complete=False)
+        self.client.match("app", db="foldoc", strategy="prefix")
+        self.assertEqual(["MATCH foldoc prefix app"], self.match_commands())
+
+    def test_other_databases_use_server(self):
+        self.client.match("app", db="wn", strategy="prefix")
+        self.client.match("app", db="*", strategy="prefix")
+        self.client.match("app", db="foldoc", strategy=".")
+        self.assertEqual(
+            ["MATCH wn prefix app", "MATCH * prefix app", "MATCH foldoc . app"],
+            self.match_commands(),
+        )
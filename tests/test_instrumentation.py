@@ -0,0 +1,152 @@
+import unittest
+
+from fake_server import BANNER, TABLE_DEFINITIONS, ServerTestCase
+
+from dictionary_client import DictionaryClient
+from dictionary_client.instrumentation import (
+    Instrumentation,
+    MetricsInstrumentation,
+    command_name,
+)
+from dictionary_client.response import ServerStats, parse_server_stats
+
+
+class RecordingInstrumentation(Instrumentation):
+    def __init__(self):
+        self.events = []
+
+    def on_connect(self, host, port, elapsed):
+        self.events.append(("connect", port))
+
+    def on_command_start(self, command):
+        self.events.append(("start", command))
+
+    def on_bytes_received(self, n_bytes):
+        self.events.append(("bytes", n_bytes))
+
+    def on_response_parsed(self, command, response, timings):
+        self.events.append(("parsed", command, response.status_code, set(timings)))
+
+
+class TestServerStats(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(
+            ServerStats(3, 0, 40, 0.012, 0.001, 0.0),
+            parse_server_stats("250 ok [d/m/c = 3/0/40; 0.012r 0.001u 0.000s]"),
+        )
+        self.assertIsNone(parse_server_stats("250 ok"))
+
+
+class TestInstrumentation(ServerTestCase):
+    replies = {
+        "DEFINE wn table": TABLE_DEFINITIONS,
+        "MATCH wn prefix tab": (
+            b"152 2 matches found\r\nwn table\r\nwn tabular\r\n.\r\n"
+            b"250 ok [d/m/c = 0/2/40; 0.002r 0.000u 0.000s]\r\n"
+        ),
+    }
+
+    def make_client(self, instrumentation):
+        client = DictionaryClient(
+            port=self.server.port, instrumentation=instrumentation
+        )
+        self.addCleanup(client.disconnect)
+        return client
+
+    def test_command_name(self):
+        self.assertEqual("DEFINE", command_name(b"DEFINE * table\r\n"))
+        self.assertEqual("SHOW DB", command_name(b"SHOW DB\r\n"))
+        self.assertEqual("STATUS", command_name(b"STATUS\r\n"))
+
+    def test_hooks(self):
+        instrumentation = RecordingInstrumentation()
+        client = DictionaryClient(
+            port=self.server.port, instrumentation=instrumentation
+        )
+        client.define("chair", db="*")
+        phases = {"send", "wait", "receive", "parse", "total"}
+        self.assertEqual(
+            [
+                ("bytes", len(BANNER)),
+                ("connect", self.server.port),
+                ("start", "CLIENT"),
+                ("bytes", 8),
+                ("parsed", "CLIENT", 250, phases),
+                ("start", "DEFINE"),
+                ("bytes", 14),
+                ("parsed", "DEFINE", 552, phases),
+            ],
+            instrumentation.events,
+        )
+
+    def test_pipelined_hooks(self):
+        instrumentation = RecordingInstrumentation()
+        client = DictionaryClient(
+            port=self.server.port, instrumentation=instrumentation
+        )
+        client.define_many(["table", "chair"], db="wn")
+        parsed = [event for event in instrumentation.events if event[0] == "parsed"]
+        self.assertEqual(
+            [
+                ("parsed", "DEFINE", 150, {"total"}),
+                ("parsed", "DEFINE", 552, {"total"}),
+            ],
+            parsed[-2:],
+        )
+
+    def test_define_iter_hooks(self):
+        instrumentation = RecordingInstrumentation()
+        client = self.make_client(instrumentation)
+        self.assertEqual(2, len(list(client.define_iter("table", db="wn"))))
+        events = [event for event in instrumentation.events if event[0] != "bytes"]
+        self.assertEqual(
+            [("start", "DEFINE"), ("parsed", "DEFINE", 150, {"total"})], events[-2:]
+        )
+
+    def test_match_iter_hooks(self):
+        metrics = MetricsInstrumentation()
+        client = self.make_client(metrics)
+        self.assertEqual(2, len(list(client.match_iter("tab", "wn", "prefix"))))
+        self.assertEqual(1, metrics.responses[("MATCH", 152)])
+        self.assertEqual(40, metrics.server_counts["comparisons"])
+        # A response abandoned part way through is reported too.
+        self.assertEqual(1, len(list(client.match_iter("tab", "wn", "prefix", 1))))
+        self.assertEqual(2, metrics.responses[("MATCH", 152)])
+
+    def test_define_multi_first_hit_hooks(self):
+        instrumentation = RecordingInstrumentation()
+        client = self.make_client(instrumentation)
+        client.define_multi("table", ["foldoc", "wn"], first_hit=True)
+        events = [event for event in instrumentation.events if event[0] != "bytes"]
+        self.assertEqual(
+            [
+                ("start", "DEFINE"),
+                ("start", "DEFINE"),
+                ("parsed", "DEFINE", 552, {"total"}),
+                ("parsed", "DEFINE", 150, {"total"}),
+            ],
+            events[-4:],
+        )
+
+    def test_metrics(self):
+        metrics = MetricsInstrumentation()
+        client = DictionaryClient(port=self.server.port, instrumentation=metrics)
+        client.get_server_status()
+        client.define("chair")
+        text = metrics.openmetrics()
+        self.assertIn(
+            'dict_client_command_seconds_count{command="DEFINE",phase="total"} 1',
+            text,
+        )
+        self.assertIn(
+            'dict_client_command_seconds_bucket{command="STATUS",phase="server",'
+            'le="+Inf"} 1',
+            text,
+        )
+        self.assertIn(
+            'dict_client_responses_total{command="DEFINE",status="552"} 1', text
+        )
+        self.assertIn(
+            f"dict_client_received_bytes_total {metrics.bytes_received}", text
+        )
+        self.assertTrue(text.endswith("# EOF\n"))
@@ -0,0 +1,172 @@
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+
+from fake_server import ServerTestCase
+
+from dictionary_client import DictionaryClient, LocalDatabase, LocalDictionary
+from dictionary_client.local import B64_DIGITS, decode_number, fold
+
+ENTRIES = {
+    "00-database-short": "00-database-short\n     Test Dictionary\n",
+    "00-database-utf8": "\n",
+    "apple": "apple\n  A fruit.\n",
+    "Apple Pie": "Apple Pie\n  A dessert made with apples.\n",
+    "applet": "applet\n  A small application.\n",
+    "banana": "banana\n  A yellow fruit.\n" + "  It is long.\n" * 200,
+    "café": "café\n  A coffee house.\n",
+    "cherry": "cherry\n  A red fruit.\n",
+}
+
+
+def encode_number(value):
+    digits = ""
+    while True:
+        digits = B64_DIGITS[value % 64] + digits
+        value //= 64
+        if not value:
+            return digits
+
+
+def dictzip(data, chunk_length):
+    """Compress `data` into the dictzip format."""
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    chunks = []
+    for start in range(0, len(data), chunk_length):
+        chunk = compressor.compress(data[start : start + chunk_length])
+        chunks.append(chunk + compressor.flush(zlib.Z_FULL_FLUSH))
+    chunks[-1] += compressor.flush()
+    ra = struct.pack(
+        f"<HHH{len(chunks)}H",
+        1,
+        chunk_length,
+        len(chunks),
+        *(len(chunk) for chunk in chunks),
+    )
+    extra = b"RA" + struct.pack("<H", len(ra)) + ra
+    header = b"\x1f\x8b\x08\x0c\0\0\0\0\x02\x03" + struct.pack("<H", len(extra))
+    return header + extra + b"test.dict\0" + b"".join(chunks)
+
+
+def write_database(path, entries, compress=True, chunk_length=64):
+    parts = []
+    index = []
+    offset = 0
+    for headword, text in entries.items():
+        encoded = text.encode()
+        index.append((fold(headword), headword, offset, len(encoded)))
+        parts.append(encoded)
+        offset += len(encoded)
+    data = b"".join(parts)
+    with open(f"{path}.index", "w", encoding="utf-8") as f:
+        for _, headword, offset, length in sorted(index):
+            f.write(f"{headword}\t{encode_number(offset)}\t{encode_number(length)}\n")
+    if compress:
+        with open(f"{path}.dict.dz", "wb") as f:
+            f.write(dictzip(data, chunk_length))
+    else:
+        with open(f"{path}.dict", "wb") as f:
+            f.write(data)
+
+
+class LocalTestCase(unittest.TestCase):
+    compress = True
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "test")
+        write_database(self.path, ENTRIES, self.compress)
+        self.local = LocalDictionary({"test": self.path})
+        self.addCleanup(self.local.close)
+
+
+class TestLocalDictionary(LocalTestCase):
+    def test_databases(self):
+        self.assertEqual({"test": "Test Dictionary"}, self.local.databases)
+        self.assertIn("prefix", self.local.strategies)
+
+    def test_define(self):
+        response = self.local.define("APPLE")
+        self.assertEqual(150, response.status_code)
+        self.assertEqual(
+            [
+                {
+                    "word": "apple",
+                    "db": "test",
+                    "description": "Test Dictionary",
+                    "definition": "apple\n  A fruit.",
+                }
+            ],
+            response.content,
+        )
+
+    def test_define_across_chunks(self):
+        (definition,) = self.local.define("banana", db="test").content
+        self.assertEqual(ENTRIES["banana"][:-1], definition.definition)
+
+    def test_define_utf8(self):
+        (definition,) = self.local.define("café").content
+        self.assertEqual("café\n  A coffee house.", definition.definition)
+
+    def test_no_match(self):
+        for word in ("apples", "aardvark", "zebra", "00-database-short"):
+            with self.subTest(word=word):
+                response = self.local.define(word)
+                self.assertEqual(552, response.status_code)
+                self.assertIsNone(response.content)
+
+    def test_match(self):
+        response = self.local.match("apple", strategy="prefix")
+        self.assertEqual(152, response.status_code)
+        self.assertEqual({"test": ["apple", "Apple Pie", "applet"]}, response.content)
+        self.assertEqual({"test": ["Apple Pie"]}, self.local.match("APPLE PIE").content)
+        self.assertIsNone(self.local.match("dog", strategy="prefix").content)
+
+    def test_invalid_database(self):
+        with self.assertRaises(ValueError):
+            self.local.define("apple", db="wn")
+
+    def test_lookup_every_headword(self):
+        database = LocalDatabase(self.path)
+        self.addCleanup(database.close)
+        for headword, text in ENTRIES.items():
+            if not headword.startswith("00"):
+                with self.subTest(headword=headword):
+                    (definition,) = database.define(headword)
+                    self.assertEqual(text[:-1], definition.definition)
+
+
+class TestPlainDictFile(TestLocalDictionary):
+    compress = False
+
+
+class TestDecodeNumber(unittest.TestCase):
+    def test_decode_number(self):
+        self.assertEqual(0, decode_number("A"))
+        self.assertEqual(63, decode_number("/"))
+        self.assertEqual(64, decode_number("BA"))
+        for value in (1, 4096, 123456789):
+            self.assertEqual(value, decode_number(encode_number(value)))
+
+
+class TestClientWithLocalDictionary(ServerTestCase, LocalTestCase):
+    def test_local_databases_do_not_use_server(self):
+        client = DictionaryClient(port=self.server.port, lazy=True, local=self.local)
+        self.assertEqual(150, client.define("apple", db="test").status_code)
+        self.assertEqual(
+            ["apple", "Apple Pie", "applet"],
+            [word for word, _ in client.lookup("app", db="test", strategy="prefix")],
+        )
+        self.assertFalse(client.connected)
+
+    def test_define_multi(self):
+        client = DictionaryClient(port=self.server.port, local=self.local)
+        responses = client.define_multi("apple", ["wn", "test", "foldoc"])
+        self.assertEqual([552, 150, 552], [r.status_code for r in responses.values()])
+        responses = client.define_multi("apple", ["wn", "test", "foldoc"], True)
+        self.assertEqual(["wn", "test"], list(responses))
+        self.assertEqual(1, self.server.commands.count("DEFINE foldoc apple"))
+        self.assertEqual(210, client.get_server_status().status_code)
@@ -0,0 +1,110 @@
+import time
+import unittest
+
+from fake_server import ServerTestCase
+
+from dictionary_client import DictionaryClient, ServerMetadataCache
+from dictionary_client.response import ServerPropertiesResponse
+
+DATABASES = ServerPropertiesResponse(
+    b'110 1 databases present\r\nwn "WordNet"\r\n.\r\n250 ok\r\n'
+)
+STRATEGIES = ServerPropertiesResponse(
+    b'111 1 strategies present\r\nexact "Exact"\r\n.\r\n250 ok\r\n'
+)
+
+
+class TestServerMetadataCache(unittest.TestCase):
+    def test_get_and_set(self):
+        cache = ServerMetadataCache()
+        self.assertIsNone(cache.get("localhost", 2628, "databases"))
+        value = cache.set("localhost", 2628, "databases", DATABASES)
+        self.assertEqual({"wn": "WordNet"}, value)
+        self.assertIs(value, cache.get("localhost", 2628, "databases"))
+        self.assertIsNone(cache.get("localhost", 2629, "databases"))
+        with self.assertRaises(TypeError):
+            value["foldoc"] = "FOLDOC"
+
+    def test_negative_answer_is_empty_mapping(self):
+        cache = ServerMetadataCache()
+        response = ServerPropertiesResponse(b"554 No databases present\r\n")
+        self.assertEqual({}, cache.set("localhost", 2628, "databases", response))
+        self.assertEqual({}, cache.get("localhost", 2628, "databases"))
+
+    def test_failure_is_not_cached(self):
+        cache = ServerMetadataCache()
+        for status_line in [
+            b"530 Access denied",
+            b"420 Server temporarily unavailable",
+        ]:
+            with self.subTest(status_line=status_line):
+                response = ServerPropertiesResponse(status_line + b"\r\n")
+                with self.assertRaises(ValueError):
+                    cache.set("localhost", 2628, "databases", response)
+                self.assertIsNone(cache.get("localhost", 2628, "databases"))
+
+    def test_expiry(self):
+        cache = ServerMetadataCache(ttl=0.01)
+        cache.set("localhost", 2628, "databases", DATABASES)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("localhost", 2628, "databases"))
+
+    def test_invalidate(self):
+        cache = ServerMetadataCache()
+        cache.set("localhost", 2628, "databases", DATABASES)
+        cache.set("localhost", 2628, "strategies", STRATEGIES)
+        cache.set("localhost", 2629, "databases", DATABASES)
+        cache.invalidate("localhost", 2628)
+        self.assertIsNone(cache.get("localhost", 2628, "databases"))
+        self.assertIsNone(cache.get("localhost", 2628, "strategies"))
+        self.assertIsNotNone(cache.get("localhost", 2629, "databases"))
+
+
+class MetadataTestCase(ServerTestCase):
+    def make_client(self, **kwargs):
+        return DictionaryClient(port=self.server.port, **kwargs)
+
+
+class TestSharedMetadata(MetadataTestCase):
+    def test_clients_share_metadata(self):
+        for _ in range(3):
+            client = self.make_client()
+            self.assertIn("wn", client.databases)
+            self.assertIn("prefix", client.strategies)
+        self.assertEqual(1, self.server.commands.count("SHOW DB"))
+        self.assertEqual(1, self.server.commands.count("SHOW STRAT"))
+
+    def test_refresh_metadata(self):
+        client = self.make_client()
+        client.databases
+        client.refresh_metadata()
+        client.databases
+        self.assertEqual(2, self.server.commands.count("SHOW DB"))
+
+    def test_private_cache(self):
+        self.make_client().databases
+        self.make_client(metadata_cache=ServerMetadataCache()).databases
+        self.assertEqual(2, self.server.commands.count("SHOW DB"))
+
+
+class TestNoDatabases(MetadataTestCase):
+    replies = {"SHOW DB": b"554 No databases present\r\n"}
+
+    def test_negative_answer_is_cached(self):
+        client = self.make_client()
+        self.assertEqual({}, client.databases)
+        with self.assertRaises(ValueError):
+            client.define("table", db="wn")
+        self.assertEqual({}, client.databases)
+        self.assertEqual(1, self.server.commands.count("SHOW DB"))
+
+
+class TestAccessDenied(MetadataTestCase):
+    replies = {"SHOW DB": b"530 Access denied\r\n"}
+
+    def test_failure_is_not_cached(self):
+        client = self.make_client()
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                client.databases
+        self.assertEqual(2, self.server.commands.count("SHOW DB"))
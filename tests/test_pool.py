@@ -0,0 +1,128 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_server import TABLE_DEFINITIONS, ServerTestCase
+
+from dictionary_client import DictionaryClientPool
+
+
+class TestDictionaryClientPool(ServerTestCase):
+    replies = {"DEFINE wn table": TABLE_DEFINITIONS}
+
+    def make_pool(self, **kwargs):
+        pool = DictionaryClientPool(port=self.server.port, **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_reuses_connections(self):
+        pool = self.make_pool()
+        for _ in range(3):
+            with pool.connection() as client:
+                self.assertEqual(150, client.define("table", db="wn").status_code)
+        self.assertEqual(1, self.server.connections)
+        self.assertEqual(1, pool.size)
+
+    def test_define_multi(self):
+        pool = self.make_pool()
+        responses = pool.define_multi("table", ["foldoc", "wn"])
+        self.assertEqual(["foldoc", "wn"], list(responses))
+        self.assertEqual([552, 150], [r.status_code for r in responses.values()])
+        responses = pool.define_multi("table", ["wn", "foldoc"], first_hit=True)
+        self.assertEqual(["wn"], list(responses))
+
+    def test_coalesce(self):
+        pool = self.make_pool(coalesce=True)
+        pool.define("table", db="wn")
+        self.server.delay = 0.2
+        with ThreadPoolExecutor(8) as executor:
+            responses = list(
+                executor.map(lambda _: pool.define("table", db="wn"), range(8))
+            )
+        self.assertEqual(2, self.server.commands.count("DEFINE wn table"))
+        self.assertEqual([150] * 8, [r.status_code for r in responses])
+        self.assertEqual(7, pool.single_flight.shared)
+        response = pool.match("table", db="wn", strategy="exact")
+        self.assertEqual(552, response.status_code)
+
+    def test_min_size(self):
+        pool = self.make_pool(min_size=2)
+        self.assertEqual(2, pool.size)
+        self.assertEqual(2, self.server.connections)
+
+    def test_checkout_times_out_at_max_size(self):
+        pool = self.make_pool(max_size=1)
+        client = pool.checkout()
+        with self.assertRaises(TimeoutError):
+            pool.checkout(timeout=0.01)
+        pool.checkin(client)
+        self.assertIs(client, pool.checkout(timeout=0.01))
+
+    def test_reconnects_after_failed_health_check(self):
+        pool = self.make_pool(health_check_interval=0)
+        with pool.connection():
+            pass
+        self.server.replies["STATUS"] = b"421 Server shutting down\r\n"
+        with pool.connection() as client:
+            self.assertEqual(150, client.define("table", db="wn").status_code)
+        self.assertEqual(2, self.server.connections)
+        self.assertEqual(1, pool.size)
+
+    def test_skips_health_check_for_recently_used_client(self):
+        pool = self.make_pool()
+        for _ in range(2):
+            with pool.connection():
+                pass
+        self.assertNotIn("STATUS", self.server.commands)
+
+    def test_discards_client_after_unavailable_reply(self):
+        pool = self.make_pool()
+        pool.define("table", db="wn")
+        self.server.replies["DEFINE wn chair"] = b"421 Server shutting down\r\n"
+        self.assertEqual(421, pool.define("chair", db="wn").status_code)
+        self.assertEqual(2, self.server.commands.count("DEFINE wn chair"))
+        self.assertEqual(2, self.server.connections)
+        self.assertEqual(0, pool.size)
+        self.assertEqual(150, pool.define("table", db="wn").status_code)
+        self.assertEqual(3, self.server.connections)
+
+    def test_reaps_idle_clients(self):
+        pool = self.make_pool(idle_timeout=0.01)
+        with pool.connection():
+            pass
+        time.sleep(0.02)
+        pool.reap()
+        self.assertEqual(0, pool.size)
+
+    def test_discards_client_after_exception(self):
+        pool = self.make_pool()
+        with self.assertRaises(RuntimeError):
+            with pool.connection():
+                raise RuntimeError
+        self.assertEqual(0, pool.size)
+
+    def test_invalid_word_keeps_client(self):
+        pool = self.make_pool()
+        pool.define("table", db="wn")
+        with self.assertRaises(ValueError):
+            pool.define("", db="wn")
+        self.assertEqual(1, pool.size)
+        self.assertEqual(150, pool.define("table", db="wn").status_code)
+        self.assertEqual(1, self.server.connections)
+
+    def test_threads_share_pool(self):
+        pool = self.make_pool(max_size=3)
+        results = []
+
+        def define():
+            for _ in range(10):
+                with pool.connection(timeout=5) as client:
+                    results.append(client.define("table", db="wn").content[0]["db"])
+
+        threads = [threading.Thread(target=define) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(["wn"] * 60, results)
+        self.assertLessEqual(self.server.connections, 3)
@@ -0,0 +1,22 @@
+import re
+import unittest
+
+from dictionary_client.prefixes import make_prefixes, remainder_pattern
+
+
+class TestPrefixes(unittest.TestCase):
+    def test_make_prefixes(self):
+        self.assertEqual(["a", "b"], make_prefixes("ab"))
+        self.assertEqual(["aa", "ab", "ba", "bb"], make_prefixes("ab", 2))
+
+    def test_remainder_pattern(self):
+        for alphabet, length, words, remainder in [
+            ("ab", 1, ["apple", "Banana", "-ab", "é"], ["-ab", "é"]),
+            ("ab", 2, ["ab", "a", "aX", "ac", "Ba"], ["a", "aX", "ac"]),
+            ("a-]^", 1, ["-a", "]a", "^a", "b"], ["b"]),
+        ]:
+            with self.subTest(alphabet=alphabet, length=length):
+                pattern = re.compile(remainder_pattern(alphabet, length))
+                self.assertEqual(
+                    remainder, [word for word in words if pattern.search(word)]
+                )
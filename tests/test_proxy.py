@@ -0,0 +1,118 @@
+import asyncio
+import unittest
+
+from fake_server import TABLE_DEFINITIONS, AsyncServerTestCase, unused_port
+
+from dictionary_client import AsyncDictionaryClient
+from dictionary_client.proxy import DictProxy, split_command
+from dictionary_client.reader import next_state
+
+
+class TestSplitCommand(unittest.TestCase):
+    def test_split_command(self):
+        for line, args in [
+            ("DEFINE wn table", ["DEFINE", "wn", "table"]),
+            ('DEFINE  wn\t"apple pie"', ["DEFINE", "wn", "apple pie"]),
+            ("MATCH * prefix 'it''s'", ["MATCH", "*", "prefix", "its"]),
+            ('DEFINE wn "say \\"hi\\""', ["DEFINE", "wn", 'say "hi"']),
+            ("DEFINE wn don\\'t", ["DEFINE", "wn", "don't"]),
+            ('DEFINE wn ""', ["DEFINE", "wn", ""]),
+            ("", []),
+        ]:
+            with self.subTest(line=line):
+                self.assertEqual(args, split_command(line))
+        with self.assertRaises(ValueError):
+            split_command('DEFINE wn "table')
+
+
+class TestDictProxy(AsyncServerTestCase):
+    replies = {"DEFINE wn table": TABLE_DEFINITIONS}
+
+    async def asyncSetUp(self):
+        self.proxy = DictProxy("127.0.0.1", self.server.port, connections=2)
+        self.listener = await self.proxy.start("127.0.0.1", 0)
+        self.port = self.listener.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.listener.close()
+        await self.listener.wait_closed()
+        await self.proxy.close()
+
+    def client(self):
+        return AsyncDictionaryClient("127.0.0.1", self.port)
+
+    async def send_lines(self, *lines):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        await reader.readline()
+        replies = []
+        for line in lines:
+            writer.write(f"{line}\r\n".encode())
+            reply = b""
+            in_text = complete = False
+            while not complete:
+                reply_line = await reader.readline()
+                reply += reply_line
+                in_text, complete = next_state(
+                    reply_line, 0, len(reply_line) - 2, in_text
+                )
+            replies.append(reply)
+        writer.close()
+        return replies
+
+    async def test_caches_replies(self):
+        async with self.client() as client:
+            first = await client.define("table", db="wn")
+            second = await client.define("table", db="wn")
+            await client.databases
+        async with self.client() as client:
+            await client.define("table", db="wn")
+            self.assertEqual({"wn", "foldoc"}, set(await client.databases))
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(150, second.status_code)
+        self.assertEqual(1, self.server.commands.count("DEFINE wn table"))
+        self.assertEqual(1, self.server.commands.count("SHOW DB"))
+        stats = self.proxy.stats()
+        self.assertEqual(2, stats["hits"])
+        self.assertEqual(2, stats["misses"])
+        self.assertEqual(0.5, stats["hit_rate"])
+        self.assertEqual(2, stats["sessions"])
+
+    async def test_coalesces_concurrent_misses(self):
+        self.server.delay = 0.05
+        async with self.client() as first, self.client() as second:
+            responses = await asyncio.gather(
+                first.match("tab", db="wn", strategy="prefix"),
+                second.match("tab", db="wn", strategy="prefix"),
+            )
+        self.assertEqual([552, 552], [r.status_code for r in responses])
+        self.assertEqual(1, self.server.commands.count("MATCH wn prefix tab"))
+
+    async def test_normalises_quoting(self):
+        replies = await self.send_lines('DEFINE wn "table"', "define wn table")
+        self.assertEqual([b"150", b"150"], [reply[:3] for reply in replies])
+        self.assertEqual(1, self.server.commands.count("DEFINE wn table"))
+
+    async def test_status_is_not_cached(self):
+        replies = await self.send_lines("STATUS", "STATUS")
+        self.assertEqual([b"210", b"210"], [reply[:3] for reply in replies])
+        self.assertEqual(2, self.server.commands.count("STATUS"))
+
+    async def test_local_replies(self):
+        replies = await self.send_lines(
+            "CLIENT test",
+            "OPTION MIME",
+            "FOO",
+            "DEFINE wn",
+            'DEFINE wn "table',
+            "QUIT",
+        )
+        self.assertEqual(
+            [b"250", b"502", b"500", b"501", b"501", b"221"],
+            [reply[:3] for reply in replies],
+        )
+        self.assertFalse(self.server.commands)
+
+    async def test_upstream_unavailable(self):
+        proxy = DictProxy("127.0.0.1", unused_port())
+        self.assertEqual(b"420", (await proxy.reply(b"DEFINE wn table\r\n"))[:3])
+        await proxy.close()
@@ -0,0 +1,143 @@
+import socket
+import threading
+import time
+import unittest
+
+from dictionary_client.reader import ResponseReader
+
+
+class ReaderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.client_sock, self.server_sock = socket.socketpair()
+        self.reader = ResponseReader(self.client_sock, timeout=1)
+
+    def tearDown(self):
+        self.client_sock.close()
+        self.server_sock.close()
+
+    def send_chunks(self, *chunks, delay=0.0):
+        def send():
+            for chunk in chunks:
+                self.server_sock.sendall(chunk)
+                time.sleep(delay)
+
+        thread = threading.Thread(target=send)
+        thread.start()
+        self.addCleanup(thread.join)
+
+
+class TestResponseReader(ReaderTestCase):
+    def test_reads_single_line_response(self):
+        self.send_chunks(b"250 ok\r\n")
+        self.assertEqual(b"250 ok\r\n", self.reader.read_response())
+
+    def test_reads_response_split_across_chunks(self):
+        response = (
+            b"150 1 definition retrieved\r\n"
+            b'151 "table" wn "WordNet"\r\ntable\r\n.\r\n'
+            b"250 ok\r\n"
+        )
+        chunks = [response[i : i + 3] for i in range(0, len(response), 3)]
+        self.send_chunks(*chunks, delay=0.001)
+        self.assertEqual(response, self.reader.read_response())
+
+    def test_status_in_text_does_not_end_response(self):
+        response = (
+            b"150 1 definition retrieved\r\n"
+            b'151 "x" wn "WordNet"\r\n250 is not a status line here\r\n.\r\n'
+            b"250 ok\r\n"
+        )
+        self.send_chunks(response[:60], response[60:], delay=0.01)
+        self.assertEqual(response, self.reader.read_response())
+
+    def test_keeps_bytes_of_following_response(self):
+        self.send_chunks(b"250 ok\r\n552 No match\r\n")
+        self.assertEqual(b"250 ok\r\n", self.reader.read_response())
+        self.assertEqual(b"552 No match\r\n", self.reader.read_response())
+
+    def test_skip_response(self):
+        self.send_chunks(
+            b"152 2 matches found\r\nwn a\r\nwn b\r\n.\r\n250 ok\r\n",
+            b"221 bye\r\n",
+        )
+        self.reader.skip_response()
+        self.assertEqual(b"221 bye\r\n", self.reader.read_response())
+
+    def test_skip_later(self):
+        self.send_chunks(b"250 ok\r\n552 No match\r\n221 bye\r\n")
+        self.reader.skip_later(2)
+        self.assertEqual(2, self.reader.pending_skips)
+        self.assertEqual(b"221 bye\r\n", self.reader.read_response())
+        self.assertEqual(0, self.reader.pending_skips)
+
+    def test_skip_later_in_text(self):
+        self.send_chunks(
+            b'152 2 matches\r\nwn "a"\r\nwn "b"\r\n.\r\n250 ok\r\n221 bye\r\n'
+        )
+        self.assertEqual(b"152 2 matches", self.reader.read_line())
+        self.assertEqual(b'wn "a"', self.reader.read_line())
+        self.reader.skip_later(in_text=True)
+        self.assertEqual(b"221 bye\r\n", self.reader.read_response())
+        self.assertFalse(self.reader.skip_in_text)
+
+    def test_reset(self):
+        self.send_chunks(b"250 ok\r\n552 No match\r\n")
+        self.reader.read_line()
+        self.reader.skip_later()
+        new_sock, server_sock = socket.socketpair()
+        self.addCleanup(new_sock.close)
+        self.addCleanup(server_sock.close)
+        self.reader.reset(new_sock)
+        server_sock.sendall(b"221 bye\r\n")
+        self.assertEqual(b"221 bye\r\n", self.reader.read_response())
+
+    def test_read_line(self):
+        self.send_chunks(b"220 banner <1@x>\r\n250 ok\r\n")
+        self.assertEqual(b"220 banner <1@x>", self.reader.read_line())
+        self.assertEqual(b"250 ok", self.reader.read_line())
+
+    def test_large_response(self):
+        lines = [b"wn word%d" % i for i in range(200000)]
+        response = (
+            b"152 200000 matches found\r\n"
+            + b"\r\n".join(lines)
+            + b"\r\n.\r\n250 ok\r\n"
+        )
+        self.send_chunks(response)
+        self.assertEqual(response, self.reader.read_response())
+
+    def test_times_out(self):
+        self.reader.timeout = 0.01
+        with self.assertRaises(TimeoutError):
+            self.reader.read_response()
+
+    def test_deadline(self):
+        self.reader.deadline = time.monotonic() + 0.05
+        self.send_chunks(b"250 ")
+        with self.assertRaisesRegex(TimeoutError, "deadline"):
+            self.reader.read_response()
+
+    def test_sendall_waits_for_writable_socket(self):
+        data = b"x" * (4 * 1024 * 1024)
+        received = bytearray()
+
+        def receive():
+            while len(received) < len(data):
+                received.extend(self.server_sock.recv(65536))
+
+        thread = threading.Thread(target=receive)
+        thread.start()
+        self.reader.sendall(data)
+        thread.join()
+        self.assertEqual(data, received)
+
+    def test_connection_closed(self):
+        self.server_sock.sendall(b"150 1 definition")
+        self.server_sock.shutdown(socket.SHUT_WR)
+        with self.assertRaises(ConnectionError):
+            self.reader.read_response()
+
+    def test_invalid_status_line(self):
+        self.send_chunks(b"hello\r\n")
+        with self.assertRaises(ValueError):
+            self.reader.read_response()
@@ -1,13 +1,19 @@
+import json
+import pickle
 import unittest
 
 from dictionary_client.response import (
     DatabaseInfoResponse,
     DefineWordResponse,
+    Definition,
     HandshakeResponse,
+    Match,
     MatchResponse,
     MultiLineResponse,
     PreliminaryResponse,
     ServerPropertiesResponse,
+    decode_text,
+    text_start,
 )
 
 
@@ -141,7 +147,14 @@ class TestDefineWordResponse(unittest.TestCase):
         )
         response = DefineWordResponse(dict_response)
         self.assertEqual(
-            [{"db": "fra-eng", "definition": "table /tabl/ <n, fem>\ntable"}],
+            [
+                {
+                    "word": "table",
+                    "db": "fra-eng",
+                    "description": "French-English FreeDict Dictionary ver. 0.4.1",
+                    "definition": "table /tabl/ <n, fem>\ntable",
+                }
+            ],
             response.content,
         )
 
@@ -175,13 +188,22 @@ class TestDefineWordResponse(unittest.TestCase):
         response = DefineWordResponse(dict_response)
         self.assertEqual(
             [
-                {"db": "fra-eng", "definition": "table /tabl/ <n, fem>\ntable"},
                 {
+                    "word": "table",
+                    "db": "fra-eng",
+                    "description": "French-English FreeDict Dictionary ver. 0.4.1",
+                    "definition": "table /tabl/ <n, fem>\ntable",
+                },
+                {
+                    "word": "table",
                     "db": "eng-fra",
+                    "description": "English-French FreeDict Dictionary ver. 0.1.6",
                     "definition": ("table /teibl/\n1. liste, tableau\n2. table"),
                 },
                 {
+                    "word": "table",
                     "db": "wn",
+                    "description": "WordNet (r) 3.1 (2011)",
                     "definition": (
                         "table\n    n 1: a set of "
                         'data arranged in rows and columns; "see table 1"\n         [syn: '
@@ -207,6 +229,35 @@ class TestDefineWordResponse(unittest.TestCase):
             response.content,
         )
 
+    def test_dot_stuffed_lines(self):
+        dict_response = (
+            b"150 1 definition retrieved\r\n"
+            b'151 "..." foldoc "The Free On-line Dictionary of Computing"\r\n'
+            b"...\r\n\r\n..\r\n.. Ellipsis.\r\n.\r\n250 ok\r\n"
+        )
+        response = DefineWordResponse(dict_response)
+        self.assertEqual("..\n\n.\n. Ellipsis.", response.content[0]["definition"])
+        self.assertEqual("...", response.content[0]["word"])
+
+    def test_status_codes_in_definition_text(self):
+        dict_response = (
+            b"150 1 definition retrieved\r\n"
+            b'151 "ice cream" wn "WordNet (r) 3.1 (2011)"\r\n'
+            b"250 grams of ice cream\r\n150 more\r\n.\r\n250 ok\r\n"
+        )
+        response = DefineWordResponse(dict_response)
+        self.assertEqual(
+            [
+                {
+                    "word": "ice cream",
+                    "db": "wn",
+                    "description": "WordNet (r) 3.1 (2011)",
+                    "definition": "250 grams of ice cream\n150 more",
+                }
+            ],
+            response.content,
+        )
+
 
 class TestMultiLineResponse(unittest.TestCase):
     def test_parses_content(self):
@@ -236,6 +287,27 @@ class TestMultiLineResponse(unittest.TestCase):
         self.assertEqual(expected, response.content)
 
 
+class TestDecodeText(unittest.TestCase):
+    def test_decodes_text_block(self):
+        data = b"113 help\r\nline one\r\n..dotted\r\n.\r\n250 ok\r\n"
+        text, end = decode_text(data, text_start(data))
+        self.assertEqual("line one\n.dotted", text)
+        self.assertEqual(b"250 ok\r\n", data[end:])
+
+    def test_empty_text_block(self):
+        data = b"113 help\r\n.\r\n250 ok\r\n"
+        self.assertEqual(("", 13), decode_text(data, text_start(data)))
+
+    def test_leading_dot(self):
+        data = b"113 help\r\n..\r\n.\r\n250 ok\r\n"
+        self.assertEqual(".", decode_text(data, text_start(data))[0])
+
+    def test_unterminated(self):
+        data = b"113 help\r\nline one\r\n"
+        with self.assertRaises(ValueError):
+            decode_text(data, text_start(data))
+
+
 class TestDatabaseInfoResponse(unittest.TestCase):
     def test_invalid_db_returns_none(self):
         response = DatabaseInfoResponse(
@@ -322,3 +394,95 @@ class TestMatchResponse(unittest.TestCase):
         response = MatchResponse(dict_response)
         self.assertIsNone(response.content)
         self.assertEqual(552, response.status_code)
+
+    def test_invalid_strategy(self):
+        response = MatchResponse(b'551 Invalid strategy, use "SHOW STRAT"\r\n')
+        self.assertIsNone(response.content)
+
+    def test_empty_list(self):
+        response = MatchResponse(b"152 0 matches found\r\n.\r\n250 ok\r\n")
+        self.assertEqual({}, response.content)
+
+
+class TestLazyResponses(unittest.TestCase):
+    dict_response = (
+        b"150 1 definition retrieved\r\n"
+        b'151 "table" wn "WordNet (r) 3.1 (2011)"\r\ntable\r\n.\r\n250 ok\r\n'
+    )
+
+    def test_content_parsed_on_first_access(self):
+        response = DefineWordResponse(
+            b"150 1 definition retrieved\r\n151\r\ntable\r\n.\r\n250 ok\r\n"
+        )
+        self.assertEqual(150, response.status_code)
+        with self.assertRaises(ValueError):
+            response.content
+
+    def test_release_drops_raw_response(self):
+        response = DefineWordResponse(self.dict_response)
+        response.release()
+        self.assertIsNone(response.response_bytes)
+        self.assertEqual("wn", response.content[0].db)
+        with self.assertRaises(AttributeError):
+            response.response_text
+
+    def test_responses_have_no_instance_dict(self):
+        response = DefineWordResponse(self.dict_response)
+        self.assertFalse(hasattr(response, "__dict__"))
+        self.assertFalse(hasattr(response.content[0], "__dict__"))
+
+    def test_pickle(self):
+        response = DefineWordResponse(self.dict_response)
+        self.assertEqual(response.content, pickle.loads(pickle.dumps(response)).content)
+        response.release()
+        self.assertEqual(response.content, pickle.loads(pickle.dumps(response)).content)
+
+    def test_from_content(self):
+        response = MatchResponse.from_content(552, None)
+        self.assertEqual(552, response.status_code)
+        self.assertIsNone(response.content)
+
+
+class TestDefinition(unittest.TestCase):
+    def test_mapping_compatibility(self):
+        definition = Definition("table", "wn", "WordNet", "table\n  n 1: a set")
+        self.assertEqual("wn", definition["db"])
+        self.assertEqual(
+            {
+                "word": "table",
+                "db": "wn",
+                "description": "WordNet",
+                "definition": "table\n  n 1: a set",
+            },
+            dict(definition),
+        )
+        self.assertEqual(dict(definition), definition)
+        with self.assertRaises(KeyError):
+            definition["text"]
+
+    def test_mapping_methods(self):
+        definition = Definition("table", "wn", "WordNet", "table\n  n 1: a set")
+        self.assertIn("db", definition)
+        self.assertNotIn(0, definition)
+        self.assertNotIn("text", definition)
+        self.assertEqual(4, len(definition))
+        self.assertEqual("wn", definition.get("db"))
+        self.assertIsNone(definition.get("text"))
+        self.assertEqual(["word", "db", "description", "definition"], list(definition))
+        self.assertIn(("db", "wn"), definition.items())
+        self.assertEqual(
+            definition.as_dict(), json.loads(json.dumps(definition, default=dict))
+        )
+        self.assertEqual("Definition(word='table', db='wn')", repr(definition))
+
+
+class TestMatch(unittest.TestCase):
+    def test_iter_matches(self):
+        response = MatchResponse(
+            b"152 3 matches found\r\nwn table\r\nwn tabular\r\n"
+            b"foldoc table\r\n.\r\n250 ok\r\n"
+        )
+        self.assertEqual(
+            [Match("wn", "table"), Match("wn", "tabular"), Match("foldoc", "table")],
+            list(response.iter_matches()),
+        )
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from dictionary_client import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.calls = []
+
+    def slow(self, value):
+        self.calls.append(value)
+        self.started.set()
+        self.release.wait(5)
+        if isinstance(value, Exception):
+            raise value
+        return [value]
+
+    def run_concurrently(self, key, value, count=5):
+        executor = ThreadPoolExecutor(count)
+        self.addCleanup(executor.shutdown)
+        first = executor.submit(self.flight.do, key, self.slow, value)
+        self.started.wait(5)
+        others = [
+            executor.submit(self.flight.do, key, self.slow, value)
+            for _ in range(count - 1)
+        ]
+        # Wait for the others to join the call in flight.
+        while self.flight.shared < count - 1:
+            time.sleep(0.001)
+        self.release.set()
+        return [first] + others
+
+    def test_coalesces_concurrent_calls(self):
+        futures = self.run_concurrently("key", "table")
+        results = [future.result() for future in futures]
+        self.assertEqual(["table"], self.calls)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual({"calls": 1, "shared": 4}, self.flight.stats())
+
+    def test_shares_exceptions(self):
+        error = ValueError("failed")
+        for future in self.run_concurrently("key", error):
+            self.assertIs(error, future.exception())
+        self.assertEqual(1, len(self.calls))
+
+    def test_does_not_cache(self):
+        self.release.set()
+        self.flight.do("key", self.slow, "a")
+        self.flight.do("key", self.slow, "b")
+        self.flight.do("other", self.slow, "c")
+        self.assertEqual(["a", "b", "c"], self.calls)
+
+
+class TestAsyncSingleFlight(unittest.IsolatedAsyncioTestCase):
+    async def test_coalesces_concurrent_calls(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def slow(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return [value]
+
+        results = await asyncio.gather(
+            *(flight.do(key, slow, key) for key in ["a", "b", "a", "a"])
+        )
+        self.assertEqual(["a", "b"], calls)
+        self.assertIs(results[0], results[2])
+        self.assertEqual({"calls": 2, "shared": 2}, flight.stats())
+        await flight.do("a", slow, "a")
+        self.assertEqual(["a", "b", "a"], calls)
+
+    async def test_cancelling_a_caller_does_not_cancel_the_call(self):
+        flight = AsyncSingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.01)
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", slow))
+        second = asyncio.ensure_future(flight.do("key", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertEqual("done", await second)
@@ -7,9 +7,21 @@ from dictionary_client.word import (
     SQABLE,
     SQSTRING,
     Word,
+    format_word,
 )
 
 
+def regex_format_word(word):
+    """The regex based formatting that format_word must agree with."""
+    if ATOM.match(word) or DQSTRING.match(word) or SQSTRING.match(word):
+        return word
+    elif DQABLE.match(word):
+        return f'"{word}"'
+    elif SQABLE.match(word):
+        return f"'{word}'"
+    raise ValueError(f"Invalid word `{word}`")
+
+
 class TestUtils(unittest.TestCase):
     def test_regexes(self):
         self.assertIsNotNone(ATOM.match("word"))
@@ -50,3 +62,52 @@ class TestUtils(unittest.TestCase):
 
         with self.assertRaises(ValueError):
             Word("""\\"'""")
+
+    def test_format_matches_regexes(self):
+        words = [
+            "word",
+            "ワード",
+            "کلمه ها",
+            "o'clock",
+            "ice cream",
+            'say "cheese"',
+            "back\\slash",
+            "a-b",
+            "x.y",
+            "'",
+            '"',
+            "''",
+            '""',
+            "'a'",
+            '"a"',
+            "'a'b'",
+            '"a"b"',
+            "'a\"",
+            "\"a'",
+            "word\n",
+            "a b\n",
+            "\n",
+            "",
+            "a\tb",
+            "a\x7fb",
+            "\x00",
+            "é",
+            "1.5",
+            " ",
+            '"\'"',
+            "'\"'",
+            "'a''",
+            '"a""',
+            "word\n\n",
+            "mixed 'quote\" marks",
+            "🙂",
+        ]
+        for word in words:
+            with self.subTest(word=word):
+                try:
+                    expected = regex_format_word(word)
+                except ValueError:
+                    with self.assertRaises(ValueError):
+                        format_word(word)
+                else:
+                    self.assertEqual(expected, format_word(word))